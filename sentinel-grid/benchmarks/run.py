@@ -0,0 +1,141 @@
+# benchmarks/run.py
+# Usage (from the project root):
+#   python -m benchmarks.run                    # run all, compare against baselines.json
+#   python -m benchmarks.run grunts_5000_level1 # run selected scenarios
+#   python -m benchmarks.run --update-baseline  # store this machine's results as the baseline
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import contextlib
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy") # Render offscreen; no window needed
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from main import Game
+from src.clock import FIXED_DT
+from .scenarios import SCENARIOS
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+DEFAULT_THRESHOLD_PCT = 10.0 # Fail when throughput drops more than this vs. the baseline
+WARMUP_TICKS = 60
+MEMORY_TICKS = 120           # Ticks run under tracemalloc for the peak-memory figure
+THROUGHPUT_METRICS = ("sim_ticks_per_second", "render_fps")
+
+def _time_ticks(sim, ticks):
+    """Wall-clock simulation ticks per second over ticks fixed steps."""
+    start = time.perf_counter()
+    for _ in range(ticks):
+        sim.update(FIXED_DT)
+    return ticks / (time.perf_counter() - start)
+
+def _time_frames(game, frames):
+    """Rendered frames per second (full _draw including UI and flip)."""
+    start = time.perf_counter()
+    for _ in range(frames):
+        game._draw(1.0)
+    return frames / (time.perf_counter() - start)
+
+def run_scenario(game, name):
+    """Runs one scenario: throughput pass, then a separate traced pass for memory."""
+    setup, ticks, frames = SCENARIOS[name]
+
+    setup(game)
+    sim = game.sim
+    for _ in range(WARMUP_TICKS):
+        sim.update(FIXED_DT)
+    sim_tps = _time_ticks(sim, ticks)
+    enemies = len(sim.enemy_group)
+    render_fps = _time_frames(game, frames)
+
+    # tracemalloc slows everything down, so memory gets its own (shorter) pass
+    tracemalloc.start()
+    setup(game)
+    for _ in range(MEMORY_TICKS):
+        sim.update(FIXED_DT)
+    game._draw(1.0)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "sim_ticks_per_second": round(sim_tps, 1),
+        "render_fps": round(render_fps, 1),
+        "peak_memory_kb": round(peak / 1024),
+        "enemies_after_run": enemies,
+        "towers": len(sim.tower_group),
+    }
+
+def load_baselines(path=BASELINE_PATH):
+    """Reads the baseline file, or returns an empty one."""
+    if not os.path.exists(path):
+        return {"threshold_pct": DEFAULT_THRESHOLD_PCT, "machine": None, "scenarios": {}}
+    with open(path, "r") as f:
+        return json.load(f)
+
+def compare(results, baselines, threshold_pct):
+    """Returns a list of regression messages (empty when everything passes)."""
+    failures = []
+    for name, result in results.items():
+        baseline = baselines["scenarios"].get(name)
+        if not baseline:
+            print(f"  {name}: no baseline stored, skipping comparison")
+            continue
+        for metric in THROUGHPUT_METRICS:
+            old, new = baseline[metric], result[metric]
+            change_pct = (new - old) / old * 100.0 if old else 0.0
+            status = "REGRESSION" if change_pct < -threshold_pct else "ok"
+            print(f"  {name:<28} {metric:<22} {old:>10.1f} -> {new:>10.1f} ({change_pct:+.1f}%) {status}")
+            if status == "REGRESSION":
+                failures.append(f"{name}.{metric} dropped {-change_pct:.1f}% (limit {threshold_pct}%)")
+    return failures
+
+def machine_id():
+    """Short description of this machine; baselines from another machine are only indicative."""
+    return f"{platform.node()} {platform.machine()} {platform.python_implementation()} {platform.python_version()}"
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Sentinel Grid benchmark scenarios")
+    parser.add_argument("scenarios", nargs="*", help=f"scenarios to run (default: all of {', '.join(SCENARIOS)})")
+    parser.add_argument("--update-baseline", action="store_true", help="write results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=None, help="allowed throughput drop in percent")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline JSON file")
+    args = parser.parse_args()
+
+    names = args.scenarios or list(SCENARIOS)
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(unknown)}")
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        game = Game(headless=True)
+    results = {}
+    for name in names:
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            result = run_scenario(game, name)
+        results[name] = result
+        print(f"{name}: {result}")
+
+    baselines = load_baselines(args.baseline)
+    threshold = args.threshold if args.threshold is not None else baselines.get("threshold_pct", DEFAULT_THRESHOLD_PCT)
+
+    if args.update_baseline:
+        baselines["machine"] = machine_id()
+        baselines["threshold_pct"] = threshold
+        baselines["scenarios"].update(results)
+        with open(args.baseline, "w") as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Baseline updated: {args.baseline}")
+        sys.exit(0)
+
+    if baselines.get("machine") not in (None, machine_id()):
+        print(f"Note: baseline was recorded on '{baselines['machine']}'")
+    failures = compare(results, baselines, threshold)
+    if failures:
+        print("FAILED:\n  " + "\n  ".join(failures))
+        sys.exit(1)
+    print("All benchmarks within threshold.")
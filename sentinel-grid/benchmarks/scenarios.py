@@ -0,0 +1,78 @@
+# benchmarks/scenarios.py
+from src.tower_platform import TowerPlatform
+
+# Each scenario prepares a freshly loaded level on a Game; the runner then times
+# simulation ticks and rendered frames on whatever the setup left behind.
+# The core is made effectively indestructible so the load never ends early.
+INVINCIBLE_CORE_HEALTH = 10 ** 9
+BENCH_RESOURCES = 10 ** 9
+
+def _prepare(game, level_id):
+    """Loads level_id and removes the limits that would end or block the scenario."""
+    game.load_level(level_id)
+    sim = game.sim
+    sim.core.max_health = sim.core.current_health = INVINCIBLE_CORE_HEALTH
+    sim.resource_manager.add_resources(BENCH_RESOURCES)
+    return sim
+
+def _add_platform_grid(sim, count, origin=(80, 110), spacing=(60, 60), columns=19):
+    """Adds count extra platforms in a grid (towers need a platform to stand on)."""
+    platforms = []
+    for i in range(count):
+        x = origin[0] + (i % columns) * spacing[0]
+        y = origin[1] + (i // columns) * spacing[1]
+        platform = TowerPlatform(x, y)
+        sim.platform_group.add(platform)
+        platforms.append(platform)
+    return platforms
+
+def _use_wave(sim, wave_id, events):
+    """Replaces the level's wave sequence with a single scripted wave.
+    The definitions dict is shared with the cached ContentRegistry, so the
+    wave goes into a copy rather than into the registry itself."""
+    sim.wave_manager.wave_definitions = {**sim.wave_manager.wave_definitions, wave_id: events}
+    sim.wave_manager.wave_sequence = [wave_id]
+
+
+def level2_all_mk2(game):
+    """level2 with every platform holding a gun_tower_mk2, normal waves."""
+    sim = _prepare(game, "level2")
+    tower_manager = sim.tower_manager
+    for platform in sim.platform_group.sprites():
+        sim.place_tower("gun_tower", platform.rect.center)
+    for tower in sim.tower_group.sprites():
+        tower_manager.select_placed_tower(tower)
+        tower_manager.attempt_upgrade()
+    tower_manager.deselect_tower()
+
+def grunts_5000_level1(game):
+    """5,000 grunts spread evenly along the level1 path, gun towers on every platform."""
+    sim = _prepare(game, "level1")
+    for platform in sim.platform_group.sprites():
+        sim.place_tower("gun_tower", platform.rect.center)
+    wave_manager = sim.wave_manager
+    _use_wave(sim, "bench_empty", []) # No regular spawns on top of the scripted ones
+    total = wave_manager.path_table.total_length
+    count = 5000
+    wave_manager.enemy_store.prewarm(count)
+    for i in range(count):
+        wave_manager.spawn_enemy("grunt", progress=total * i / count)
+
+def slow_towers_200_dense_wave(game):
+    """200 slow towers on a platform grid over a dense 600-enemy level1 wave."""
+    sim = _prepare(game, "level1")
+    for platform in _add_platform_grid(sim, 200):
+        sim.place_tower("slow_tower", platform.rect.center)
+    _use_wave(sim, "bench_dense", [
+        {"time": 0.0, "enemy_type": "grunt", "count": 400, "interval": 0.02},
+        {"time": 2.0, "enemy_type": "runner", "count": 150, "interval": 0.03},
+        {"time": 4.0, "enemy_type": "tank", "count": 50, "interval": 0.05},
+    ])
+    game.background.invalidate() # Extra platforms are part of the baked layer
+
+# name -> (setup, simulation ticks to time, frames to render)
+SCENARIOS = {
+    "level2_all_mk2": (level2_all_mk2, 1800, 300),
+    "grunts_5000_level1": (grunts_5000_level1, 300, 60),
+    "slow_towers_200_dense_wave": (slow_towers_200_dense_wave, 900, 120),
+}
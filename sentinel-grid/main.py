@@ -1,155 +1,123 @@
 # main.py
-import pygame
-import sys
+from time import perf_counter_ns
+PROCESS_START_NS = perf_counter_ns() # Before the heavy imports (--startup-profile)
 import os
-import json
+import sys
+import argparse
+import pygame
 
 # --- Imports ---
-from src.config import (SCREEN_WIDTH, SCREEN_HEIGHT, SCREEN_SIZE, FPS,
-                      LEVEL_PATHS, LEVEL_PLATFORMS, LEVEL_BACKGROUNDS,
-                      PLATFORM_LOCATIONS_L1, # Default fallback if needed
+from src.config import (SCREEN_WIDTH, SCREEN_HEIGHT, SCREEN_SIZE, FPS, IDLE_WAIT_MS,
                       STATE_PLAYING, STATE_PAUSED, STATE_GAME_OVER, STATE_VICTORY,
                       get_color) # Use palette helper
-from src.game_manager import GameManager
-from src.resource_manager import ResourceManager
-from src.ui_manager import UIManager
-from src.tower_platform import TowerPlatform
-from src.wave_manager import WaveManager
-from src.tower_manager import TowerManager
-from src.core import Core
+from src.clock import FixedStepClock, FIXED_DT
+from src.simulation import Simulation
+from src.ui_manager import UIManager, OVERLAY_STATES
+from src.background import BackgroundLayer
+from src.sprite_cache import ShapeSpriteCache
+from src.replay import ReplayRecorder, load_replay, play_replay
+from src.profiler import DEFAULT_CSV_PATH, StartupProfile
+from src.tower_manager import PROJECTILE_MODES
+from src.content import load_content_async
+from src.fonts import get_font, FONT_MEDIUM
+IMPORTS_DONE_NS = perf_counter_ns()
 
 class Game:
-    def __init__(self):
-        """Initializes Pygame and game components."""
-        pygame.init()
+    def __init__(self, headless=False, record_path=None, profile_path=None, projectile_mode="stepped",
+                 startup=None):
+        """Initializes Pygame, the window and the headless simulation it renders.
+        headless uses SDL's dummy video driver (replays); record_path logs every
+        state-changing command for later replay; profile_path starts with the
+        frame profiler on and names its CSV export; projectile_mode is passed
+        to the simulation's TowerManager; startup (a StartupProfile) gets a
+        mark after each init step."""
+        # Data files load on a worker thread while the window comes up
+        content_future = load_content_async()
+
+        if headless:
+            os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+            os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+        # Only the subsystems we use: pygame.init() would also open audio and joysticks
+        pygame.display.init()
         # pygame.mixer.init() # Defer audio init until AudioManager
-        pygame.font.init()
+        pygame.font.init() # Fonts themselves are created on first use (src/fonts.py)
 
         self.screen = pygame.display.set_mode(SCREEN_SIZE)
         pygame.display.set_caption("Project: Sentinel Grid - Retro Draw")
-        self.clock = pygame.time.Clock()
+        self.clock = pygame.time.Clock() # Frame pacing (render rate) only
+        self.sim_clock = FixedStepClock() # Game time: fixed steps fed by an accumulator
+        # Window status from window events (assumed active until told otherwise); feeds idle mode
+        self.window_focused = True
+        self.window_minimized = False
         self.mouse_pos = pygame.mouse.get_pos()
+        if not headless:
+            self._draw_loading() # Something on screen while the level loads
+        if startup:
+            startup.mark("window")
 
-        # --- Load All Level Data Once ---
+        # --- Simulation (all game logic; owns groups and managers) ---
         try:
-            script_dir = os.path.dirname(os.path.realpath(__file__))
-            data_dir = os.path.join(script_dir, 'data')
-            level_file = os.path.join(data_dir, 'levels.json')
-            with open(level_file, 'r') as f:
-                 self.all_levels_data = json.load(f)
+            content = content_future.result()
+            if startup:
+                startup.mark("content")
+                startup.note(f"data: {'binary cache' if content.from_cache else 'JSON parse'} "
+                             f"({content.load_time * 1000:.1f} ms on the loader thread)")
+            self.sim = Simulation(self.screen.get_rect(), self.sim_clock, projectile_mode, content)
         except Exception as e:
-             print(f"CRITICAL ERROR loading levels.json: {e}")
+             print(f"CRITICAL ERROR initializing simulation: {e}")
              pygame.quit(); sys.exit()
+        if startup:
+            startup.mark("simulation")
 
-        self.level_order = ["level1", "level2"]
+        self.level_order = list(self.sim.content.level_ids) # Campaign order is levels.json order
         self.current_level_index = 0
-        self.current_level_id = None # Will be set by load_level
-
-        # --- Initialize Sprite Groups ---
-        self.platform_group = pygame.sprite.Group()
-        self.enemy_group = pygame.sprite.Group()
-        self.tower_group = pygame.sprite.Group()
-        self.projectile_group = pygame.sprite.Group()
-        self.core_group = pygame.sprite.GroupSingle() # Still use GroupSingle for the Core logic
-
-        # --- Initialize Managers (order matters for dependencies) ---
-        self.wave_manager = WaveManager(self.enemy_group)
-        self.resource_manager = ResourceManager()
-        self.core = None # Created in load_level
-        # Pass core placeholder, will be updated in load_level
-        self.ui_manager = UIManager(self.resource_manager, self.wave_manager, self.core)
-        self.tower_manager = TowerManager(
-             resource_manager=self.resource_manager,
-             platform_group=self.platform_group,
-             tower_group=self.tower_group,
-             projectile_group=self.projectile_group
-        )
-        # Pass core placeholder, will be updated in load_level
-        self.game_manager = GameManager(
-             resource_manager=self.resource_manager,
-             ui_manager=self.ui_manager,
-             wave_manager=self.wave_manager,
-             core=self.core,
-             enemy_group=self.enemy_group
-        )
-        # Pass full tower data to UI Manager AFTER Tower Manager loads it
-        self.ui_manager.full_tower_data = self.tower_manager.tower_data
-
-
-        # --- Load the First Level ---
-        self.load_level(self.level_order[self.current_level_index])
-
-        print("Game Initialized and first level loaded.")
-
-    # load_level remains mostly the same, just ensure references are updated
-    def load_level(self, level_id):
-        """Loads and sets up all components for the specified level ID."""
-        print(f"\n--- LOADING LEVEL: {level_id} ---")
-        if level_id not in self.all_levels_data:
-             print(f"CRITICAL ERROR: Level ID '{level_id}' not found in levels.json data.")
-             self.game_manager.is_running = False
-             return
-        self.current_level_id = level_id
-
-        try:
-            self.wave_manager.load_level_data(level_id)
-        except ValueError as e:
-             print(f"Error loading level data via WaveManager: {e}. Cannot proceed.")
-             self.game_manager.is_running = False
-             return
-
-        level_config = self.all_levels_data[level_id]
-        new_starting_resources = level_config.get('starting_resources', 200)
-        new_core_health = self.wave_manager.core_starting_health
-        new_core_location = self.wave_manager.core_location
-
-        self.resource_manager.reset(new_start_amount=new_starting_resources)
-
-        if self.core: self.core.kill()
-        self.core = Core(new_core_location, new_core_health)
-        self.core_group.add(self.core) # Add the single sprite instance
+        self.sim_steps = 0 # Fixed steps run this session (never reset; stamps recorded commands)
+        self.recorder = ReplayRecorder(record_path, self.level_order[0]) if record_path else None
 
-        # IMPORTANT: Update references in managers that depend on the core
-        self.game_manager.core = self.core
-        self.ui_manager.core = self.core
+        # Frame profiler (shared with the simulation's phase laps); F3 toggles it
+        self.profiler = self.sim.profiler
+        self.profile_path = profile_path or DEFAULT_CSV_PATH
+        self.profiler.set_enabled(profile_path is not None)
 
-        self.enemy_group.empty()
-        self.tower_group.empty()
-        self.projectile_group.empty()
+        # Shortcuts to the simulation's long-lived managers
+        self.game_manager = self.sim.game_manager
+        self.tower_manager = self.sim.tower_manager
+        self.wave_manager = self.sim.wave_manager
 
-        self._create_platforms(level_id)
-        self.tower_manager.deselect_tower() # Reset selections
+        # --- Rendering caches ---
+        self.background = BackgroundLayer(SCREEN_SIZE)
+        self.sprites = ShapeSpriteCache() # Pre-rendered entity shapes
 
-        # Pass tower data to UI manager again in case it changed? (Probably not needed here, but safe)
-        self.ui_manager.full_tower_data = self.tower_manager.tower_data
+        # --- UI (rendering only, lives outside the simulation) ---
+        # The HUD reads resources, wave state, core health and the tower selection directly
+        self.ui_manager = UIManager(self.sim.resource_manager, self.wave_manager, self.sim.core, self.tower_manager)
+        self.game_manager.ui_manager = self.ui_manager
 
+        # --- Load the First Level ---
+        self.load_level(self.level_order[self.current_level_index])
+        if startup:
+            startup.mark("level")
 
-        self.game_manager.set_state(STATE_PLAYING)
-        print(f"--- LEVEL {level_id} LOAD COMPLETE ---")
-
-    # _create_platforms remains the same
-    def _create_platforms(self, level_id):
-        """Creates tower platforms based on the specified level ID."""
-        self.platform_group.empty() # Clear existing platforms first
-
-        level_config = self.all_levels_data.get(level_id)
-        if not level_config:
-             print(f"Warning: Cannot create platforms, level config not found for {level_id}")
-             return
+        print("Game Initialized and first level loaded.")
 
-        platform_key = level_config.get('platform_locations_key')
-        platform_locations = LEVEL_PLATFORMS.get(platform_key, []) # Use lookup map
+    def _draw_loading(self):
+        """Presents a plain loading frame right after the window opens."""
+        self.screen.fill(get_color(0, (0, 0, 0)))
+        loading_surf = get_font(FONT_MEDIUM).render("Loading...", True, get_color(1, (255, 255, 255)))
+        self.screen.blit(loading_surf, loading_surf.get_rect(center=self.screen.get_rect().center))
+        pygame.display.flip()
 
-        print(f"Creating {len(platform_locations)} platforms using key '{platform_key}'.")
-        for pos in platform_locations:
-            platform = TowerPlatform(pos[0], pos[1]) # TowerPlatform needs to be imported
-            self.platform_group.add(platform)
+    def load_level(self, level_id):
+        """Loads a level into the simulation and refreshes UI references."""
+        if self.sim.load_level(level_id):
+            self.ui_manager.core = self.sim.core # Core is recreated per level
+            self.background.invalidate() # New path/platforms to bake
 
     # restart_game and load_next_level remain the same
     def restart_game(self):
         """Resets the *current* level to its initial state."""
-        print(f"\n--- RESTARTING LEVEL: {self.current_level_id} ---")
-        self.load_level(self.current_level_id)
+        print(f"\n--- RESTARTING LEVEL: {self.sim.current_level_id} ---")
+        self.load_level(self.sim.current_level_id)
         print("--- LEVEL RESTART COMPLETE ---")
 
     def load_next_level(self):
@@ -169,188 +137,267 @@ class Game:
         """Processes Pygame events."""
         self.mouse_pos = pygame.mouse.get_pos()
 
-        # Update UI Manager with current selections for drawing info panel
-        self.ui_manager.selected_tower_type = self.tower_manager.selected_tower_type
-        self.ui_manager.selected_tower_data = self.tower_manager.tower_data.get(self.tower_manager.selected_tower_type) if self.tower_manager.selected_tower_type else None
-        if self.tower_manager.selected_placed_tower:
-             self.ui_manager.selected_placed_tower_id = self.tower_manager.selected_placed_tower.tower_id
-             self.ui_manager.selected_placed_tower_data = self.tower_manager.selected_placed_tower.data
-        else:
-             self.ui_manager.selected_placed_tower_id = None
-             self.ui_manager.selected_placed_tower_data = None
-
-
         for event in pygame.event.get():
             if event.type == pygame.QUIT: self.game_manager.is_running = False; return
 
+            # --- Window Status (idle mode) ---
+            if event.type == pygame.WINDOWFOCUSLOST: self.window_focused = False
+            elif event.type == pygame.WINDOWFOCUSGAINED: self.window_focused = True
+            elif event.type == pygame.WINDOWMINIMIZED: self.window_minimized = True
+            elif event.type in (pygame.WINDOWRESTORED, pygame.WINDOWMAXIMIZED, pygame.WINDOWSHOWN):
+                self.window_minimized = False
+
             # --- Keyboard Input ---
             if event.type == pygame.KEYDOWN:
                 # Global Keys
-                if event.key == pygame.K_p: self.game_manager.handle_input(event) # Toggle pause
-                elif event.key == pygame.K_ESCAPE: self.tower_manager.deselect_tower()
+                if event.key == pygame.K_p: self._command("pause")
+                elif event.key == pygame.K_ESCAPE: self._command("deselect")
+                elif event.key == pygame.K_F3: self.profiler.toggle() # Not recorded: no game state
 
                 # State-Specific Keys
                 if self.game_manager.game_state == STATE_PLAYING:
-                    if event.key == pygame.K_1: self.tower_manager.select_tower_type("gun_tower")
-                    elif event.key == pygame.K_2: self.tower_manager.select_tower_type("cannon_tower")
-                    elif event.key == pygame.K_3: self.tower_manager.select_tower_type("slow_tower")
+                    if event.key == pygame.K_1: self._command("select_type", "gun_tower")
+                    elif event.key == pygame.K_2: self._command("select_type", "cannon_tower")
+                    elif event.key == pygame.K_3: self._command("select_type", "slow_tower")
                     elif event.key == pygame.K_u and self.tower_manager.selected_placed_tower:
-                        self.tower_manager.attempt_upgrade()
+                        self._command("upgrade")
                     # Add Sell key later? e.g., K_x
                 elif self.game_manager.game_state == STATE_GAME_OVER:
-                    if event.key == pygame.K_r: self.restart_game()
+                    if event.key == pygame.K_r: self._command("restart")
                 elif self.game_manager.game_state == STATE_VICTORY:
-                    if event.key == pygame.K_n: self.load_next_level()
+                    if event.key == pygame.K_n: self._command("next_level")
 
             # --- Mouse Input ---
             if event.type == pygame.MOUSEBUTTONDOWN:
                  # Handle clicks based on state (add UI button clicks later)
                  if self.game_manager.game_state == STATE_PLAYING:
                       if event.button == 1: # Left Click
-                           self._handle_left_click()
+                           self._command("click", *self.mouse_pos)
                       # Add right click deselect?
                       # elif event.button == 3: # Right Click
                       #     self.tower_manager.deselect_tower()
 
-    # _handle_left_click remains the same
-    def _handle_left_click(self):
+    # --- Command path: every state-changing input goes through execute() ---
+    def _command(self, command, *args):
+        """Records a player command (when recording) and executes it."""
+        if self.recorder:
+            self.recorder.record(self.sim_steps, command, *args)
+        self.execute(command, *args)
+
+    def execute(self, command, *args):
+        """Applies one player command. Live input and replays share this path."""
+        if command == "select_type": self.tower_manager.select_tower_type(args[0], self.mouse_pos)
+        elif command == "click": self._handle_left_click(args)
+        elif command == "deselect": self.tower_manager.deselect_tower()
+        elif command == "upgrade": self.tower_manager.attempt_upgrade()
+        elif command == "pause": self.game_manager.toggle_pause()
+        elif command == "restart": self.restart_game()
+        elif command == "next_level": self.load_next_level()
+        else: print(f"Warning: unknown command '{command}' ignored.")
+
+    def _handle_left_click(self, click_pos):
          """Handles left mouse click logic during the PLAYING state."""
          clicked_on_tower = False
-         for tower in self.tower_group:
-             if tower.rect.collidepoint(self.mouse_pos):
+         for tower in self.sim.tower_group:
+             if tower.rect.collidepoint(click_pos):
                  self.tower_manager.select_placed_tower(tower)
                  clicked_on_tower = True
                  break
 
          if not clicked_on_tower:
              target_platform = None
-             for platform in self.platform_group:
-                  if platform.rect.collidepoint(self.mouse_pos):
+             for platform in self.sim.platform_group:
+                  if platform.rect.collidepoint(click_pos):
                        target_platform = platform
                        break
              if target_platform:
                   if self.tower_manager.selected_tower_type:
-                       self.tower_manager.attempt_placement(self.mouse_pos)
+                       self.tower_manager.attempt_placement(click_pos)
                   else: # Clicked platform, nothing to build or select
                        self.tower_manager.deselect_tower()
              else: # Clicked empty space
                   self.tower_manager.deselect_tower()
 
 
-    # _handle_collisions remains the same
-    def _handle_collisions(self):
-        """Handles collisions between projectiles and enemies."""
-        collisions = pygame.sprite.groupcollide(
-             self.projectile_group, self.enemy_group, False, False # Check collision first
-         )
-
-        for projectile, enemies_hit in collisions.items():
-            # Check if projectile is still active before processing
-            if projectile.is_active:
-                 # Usually hit only one enemy unless AoE later
-                 for enemy in enemies_hit:
-                     if enemy.is_active:
-                         projectile.handle_hit(enemy) # Let projectile destroy itself
-                         enemy.take_damage(projectile.damage)
-                         if not enemy.is_active: # Enemy died
-                             self.resource_manager.add_resources(enemy.reward)
-                         break # Projectile hits one target and is done
-
-
-    # _handle_enemy_at_end remains the same
-    def _handle_enemy_at_end(self):
-        """Checks for enemies that reached the end, damages core, and removes them."""
-        for enemy in list(self.enemy_group): # Iterate over a copy
-             if enemy.reached_end:
-                  # print(f"Processing {enemy.name} that reached end - damaging core.") # Quieter
-                  self.core.take_damage(1)
-                  enemy.kill()
-
-    # _update remains the same
     def _update(self, dt):
-        """Updates game state and components."""
-        self.game_manager.update(dt) # Checks win/loss first
-        if self.game_manager.game_state == STATE_PLAYING:
-            self.resource_manager.update(dt)
-            self.wave_manager.update(dt)
-            # Pass mouse pos to tower manager for preview updates
-            self.tower_manager.update(dt, self.enemy_group, self.mouse_pos)
-            self.enemy_group.update(dt)
-            self.projectile_group.update(dt)
-            if self.core: # Ensure core exists before updating
-                 self.core_group.update(dt) # Update core (for animations etc)
-            self._handle_enemy_at_end()
-            self._handle_collisions()
-        # No updates needed for paused/end states usually, handled by state manager
-
-    def _draw_path(self):
-        """Draws the path for the current level."""
-        current_path = self.wave_manager.path
-        if current_path and len(current_path) >= 2:
-            path_color = get_color(3, (0, 255, 0)) # Palette index 3 (Green)
-            pygame.draw.lines(self.screen, path_color, False, current_path, 3)
-
-    def _draw(self):
-        """Draws everything to the screen using draw_shape."""
-        # --- Background ---
-        bg_color_idx = self.all_levels_data.get(self.current_level_id, {}).get('map_background_idx', 0)
-        background_color = get_color(bg_color_idx, (0,0,0))
-        self.screen.fill(background_color)
-
-        # --- Static Elements ---
-        self._draw_path()
-        self.platform_group.draw(self.screen) # Platforms still use their pre-rendered image via Group.draw
-
-        # --- Dynamic Elements (Manual Draw) ---
-        # Draw in desired order (e.g., towers below enemies?)
+        """Advances the simulation; the mouse only feeds the placement preview."""
+        self.sim.update(dt, self.mouse_pos)
+
+    def step(self, dt):
+        """Runs one fixed simulation step and counts it for command stamps."""
+        self._update(dt)
+        self.sim_steps += 1
+
+    def _draw_world(self, alpha):
+        """Draws the level and its entities from cached layers and sprites.
+        Moving entities are drawn alpha of the way from their previous to
+        their current simulated position. Returns the number of draw calls."""
+        # --- Background + Static Elements (map fill, path, platforms: one cached blit) ---
+        bg_color_idx = self.sim.all_levels_data.get(self.sim.current_level_id, {}).get('map_background_idx', 0)
+        background = self.background.get(self.sim.current_level_id, bg_color_idx,
+                                          self.wave_manager.path, self.sim.platform_group)
+        self.screen.blit(background, (0, 0))
+
+        draw_calls = 1
+
+        # --- Dynamic Elements (cached sprites, batched blits) ---
+        # Draw order: core, towers, range, enemies (+ bars), projectiles, preview
         if self.game_manager.game_state in [STATE_PLAYING, STATE_PAUSED]:
-             # Draw Core
-             if self.core: # Ensure core exists
-                 self.core.draw_shape(self.screen) # Use draw_shape
+             sprites = self.sprites
+             sprites.begin_frame() # Drops cached sprites if the palette changed
+
+             batch = []
+             if self.sim.core: # Ensure core exists
+                 batch.append(sprites.core(self.sim.core))
+             batch.extend([sprites.tower(tower) for tower in self.sim.tower_group])
+             self.screen.blits(batch, False)
+             draw_calls += len(batch)
 
-             # Draw Towers & Ranges
-             for tower in self.tower_group:
-                  tower.draw_shape(self.screen) # Use draw_shape
              # Draw selected tower range AFTER all towers are drawn
              if self.tower_manager.selected_placed_tower:
                   self.tower_manager.selected_placed_tower.draw_range(self.screen)
 
-             # Draw Enemies
-             for enemy in self.enemy_group:
-                  enemy.draw_shape(self.screen) # Use draw_shape
-
-             # Draw Projectiles
-             for proj in self.projectile_group:
-                  proj.draw_shape(self.screen) # Use draw_shape
+             # Enemy bodies in one batch, then their (dynamic) health bars / slow indicators
+             enemies = [enemy for enemy in self.sim.enemy_group if enemy.is_active]
+             render_positions = self.wave_manager.enemy_store.interpolated_positions(alpha)
+             self.screen.blits([sprites.enemy(enemy, render_positions[enemy.slot]) for enemy in enemies], False)
+             draw_calls += len(enemies)
+             for enemy in enemies:
+                  render_rect = enemy.render_rect(render_positions[enemy.slot])
+                  draw_calls += enemy.draw_health_bar(self.screen, render_rect)
+                  draw_calls += enemy.draw_slow_indicator(self.screen, render_rect)
+
+             projectile_blits = [sprites.projectile(proj.archetype, proj.render_pos(alpha))
+                                 for proj in self.sim.projectile_group if proj.is_active]
+             projectile_blits += [sprites.projectile(archetype, pos)
+                                  for archetype, pos in self.tower_manager.shots.render_positions(alpha)]
+             self.screen.blits(projectile_blits, False)
+             draw_calls += len(projectile_blits)
+
+             profiler = self.profiler
+             profiler.count("enemies", len(enemies))
+             profiler.count("towers", len(self.sim.tower_group))
+             profiler.count("projectiles", len(projectile_blits))
 
              # Draw Tower Placement Preview (if active)
              # Note: TowerManager.draw_preview uses its own sprite with image, keep for now
-             # Or refactor draw_preview to use draw calls too later.
              self.tower_manager.draw_preview(self.screen)
+        return draw_calls
 
+    def _draw(self, alpha=1.0):
+        """Draws everything to the screen. Overlay states (pause, game over,
+        victory) skip the world: the UI presents the frame that was on screen
+        when the state was entered, with the state's overlay composited once."""
+        draw_calls = 0
+        if self.game_manager.game_state not in OVERLAY_STATES:
+            draw_calls = self._draw_world(alpha)
 
         # --- UI ---
         # UIManager draw handles overlays based on state
         self.game_manager.draw(self.screen)
+        if self.profiler.enabled:
+            self.ui_manager.draw_profiler(self.screen, self.profiler.summary_lines())
+        self.profiler.count("draw_calls", draw_calls)
+        self.profiler.lap("draw")
 
         # --- Display Update ---
         pygame.display.flip()
+        self.profiler.lap("flip")
 
 
     def run(self):
         """The main game loop."""
         while self.game_manager.is_running:
-            dt = self.clock.tick(FPS) / 1000.0
+            if self._is_idle():
+                self._idle_wait()
+                continue
+            frame_dt = self.clock.tick(FPS) / 1000.0
+            self.profiler.begin_frame()
             self._handle_events()
-            self._update(dt)
-            self._draw()
-
+            self.profiler.lap("events")
+            # Fixed-step simulation: deterministic and bounded per frame regardless of frame rate
+            dropped_time = self.sim_clock.dropped_time
+            steps = self.sim_clock.accumulate(frame_dt)
+            for _ in range(steps):
+                self.step(FIXED_DT)
+            self.profiler.count("steps", steps)
+            self.profiler.count("dropped_steps", round((self.sim_clock.dropped_time - dropped_time) / FIXED_DT))
+            # Interpolate only while the simulation is running (a paused frame stays still)
+            alpha = self.sim_clock.alpha if self.game_manager.game_state == STATE_PLAYING else 1.0
+            self._draw(alpha)
+            self.profiler.end_frame()
+
+        if self.recorder:
+            self.recorder.close(self.sim_steps)
+        if self.profiler.rows:
+            self.profiler.export_csv(self.profile_path)
         pygame.quit()
         sys.exit()
 
+    def _is_idle(self):
+        """True when there is nothing to simulate or redraw: the window is
+        minimized or unfocused, or an overlay state's frozen frame is already
+        on screen."""
+        if self.window_minimized or not self.window_focused:
+            return True
+        state = self.game_manager.game_state
+        return state in OVERLAY_STATES and self.ui_manager.is_frozen(state)
+
+    def _idle_wait(self):
+        """Idle mode: blocks in pygame.event.wait (up to IDLE_WAIT_MS) instead
+        of ticking at FPS. Nothing is simulated or drawn; the last presented
+        frame stays up. Any event is handled as usual, so input or regaining
+        focus brings back normal frames on the next loop iteration."""
+        event = pygame.event.wait(IDLE_WAIT_MS)
+        if event.type != pygame.NOEVENT:
+            pygame.event.post(event) # Put it back for the normal event pass
+            self._handle_events()
+            if event.type in (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE):
+                pygame.display.flip() # Window uncovered: present the last frame again
+        self.clock.tick() # Restart frame timing: the idle time is not game time
+
+    def replay(self, path):
+        """Plays a recorded command log at max speed without rendering and
+        prints frame-time statistics plus the final state hash."""
+        first_level, commands = load_replay(path)
+        if first_level != self.level_order[0]:
+            print(f"Warning: replay was recorded from '{first_level}', game starts at '{self.level_order[0]}'.")
+        report = play_replay(self, commands, FIXED_DT)
+        print("\n--- REPLAY REPORT ---")
+        for key, value in report.items():
+            print(f"  {key}: {value:.4f}" if isinstance(value, float) else f"  {key}: {value}")
+        return report
+
 # --- Main Execution ---
 if __name__ == '__main__':
-    print("Starting Game...")
-    game = Game()
-    game.run()
-    print("Game Exited.")
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Project: Sentinel Grid")
+    parser.add_argument("--record", metavar="PATH", help="record every player command to a replay log")
+    parser.add_argument("--replay", metavar="PATH", help="play a replay log headless at max speed and report")
+    parser.add_argument("--profile", metavar="CSV", nargs="?", const=DEFAULT_CSV_PATH,
+                        help=f"start with the frame profiler on (F3 toggles) and export to CSV on exit (default {DEFAULT_CSV_PATH})")
+    parser.add_argument("--startup-profile", action="store_true",
+                        help="time imports, init and the first frame against budgets, then exit "
+                             "(exit status 1 if over budget)")
+    parser.add_argument("--projectiles", choices=PROJECTILE_MODES, default="stepped",
+                        help="stepped: move and collide projectiles every tick; analytic: solve impacts when fired "
+                             "(use the same mode to record and replay)")
+    args = parser.parse_args()
+
+    if args.startup_profile:
+        startup = StartupProfile(PROCESS_START_NS)
+        startup.mark("imports", IMPORTS_DONE_NS)
+        game = Game(projectile_mode=args.projectiles, startup=startup)
+        game._draw(1.0)
+        startup.mark("first_frame")
+        over_budget = startup.report()
+        pygame.quit()
+        sys.exit(1 if over_budget else 0)
+    elif args.replay:
+        game = Game(headless=True, projectile_mode=args.projectiles)
+        game.replay(args.replay)
+        pygame.quit()
+    else:
+        print("Starting Game...")
+        game = Game(record_path=args.record, profile_path=args.profile, projectile_mode=args.projectiles)
+        game.run()
+        print("Game Exited.")
\ No newline at end of file
@@ -0,0 +1,196 @@
+# src/archetypes.py
+from types import MappingProxyType
+from .config import get_palette
+from .clock import stepped_duration
+from .path_index import TARGETING_STRATEGIES, DEFAULT_TARGETING
+
+# Shape types draw_shape knows how to rasterize
+SHAPE_TYPES = ("rect", "circle", "polygon")
+
+class Archetype:
+    """Immutable per-type record compiled once from a JSON entry. Every field
+    is resolved (defaults filled in, derived values precomputed) and checked
+    when the data is loaded, so spawning or firing only copies a reference.
+    Use the compile_* functions below rather than building one directly."""
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is read-only (recompile the data instead)")
+
+    def __getstate__(self):
+        """Slot values for pickling (the content cache); the read-only raw
+        entry is stored as a plain dict, since mapping proxies don't pickle."""
+        fields = {name: getattr(self, name) for name in self.__slots__}
+        if "data" in fields:
+            fields["data"] = dict(fields["data"])
+        return None, fields
+
+    def __setstate__(self, state):
+        """Unpickling (the content cache) restores the slots directly."""
+        _, fields = state
+        self._init(**fields)
+
+    def _init(self, **fields):
+        for name, value in fields.items():
+            if name == "data": # The raw JSON entry: shared by every user, so hand out a read-only view
+                value = MappingProxyType(dict(value))
+            object.__setattr__(self, name, value)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.type_id!r})"
+
+
+class EnemyArchetype(Archetype):
+    __slots__ = ("type_id", "data", "name", "health", "speed", "reward", "size",
+                 "shape_type", "shape_points", "fill_color_idx", "border_color_idx", "border_width")
+
+class ProjectileArchetype(Archetype):
+    """Look and ballistics of one tower type's projectiles. type_id (the firing
+    tower type) doubles as the pool/sprite-cache key."""
+    __slots__ = ("type_id", "pool_key", "shape_type", "radius", "size", "half",
+                 "fill_color_idx", "border_color_idx", "border_width", "speed", "damage")
+
+class TowerArchetype(Archetype):
+    __slots__ = ("type_id", "data", "name", "cost", "range", "fire_rate", "cooldown", "cooldown_span",
+                 "damage", "targeting", "size", "shape_type", "shape_points", "fill_color_idx",
+                 "border_color_idx", "border_width", "projectile", "effect_type", "slow_factor",
+                 "slow_duration", "upgrades_to", "upgrade_cost")
+
+
+# --- Field readers: raise ValueError naming the entry and field ---
+def _number(entry, type_id, field, default, minimum=None):
+    value = entry.get(field, default)
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"{type_id}: '{field}' must be a number, got {value!r}")
+    if minimum is not None and value < minimum:
+        raise ValueError(f"{type_id}: '{field}' must be >= {minimum}, got {value!r}")
+    return value
+
+def _color(entry, type_id, field, default):
+    index = entry.get(field, default)
+    # Colors stay palette indices (the palette can be switched at runtime); check them now
+    palette_size = len(get_palette())
+    if isinstance(index, bool) or not isinstance(index, int) or not 0 <= index < palette_size:
+        raise ValueError(f"{type_id}: '{field}' must be a palette index 0..{palette_size - 1}, got {index!r}")
+    return index
+
+def _size(entry, type_id, default):
+    size = entry.get('size', default)
+    if not isinstance(size, (list, tuple)) or len(size) != 2 or \
+            not all(isinstance(v, (int, float)) and v > 0 for v in size):
+        raise ValueError(f"{type_id}: 'size' must be two positive numbers, got {size!r}")
+    return tuple(size)
+
+def _shape(entry, type_id, field="shape_type", default="rect"):
+    shape_type = entry.get(field, default)
+    if shape_type not in SHAPE_TYPES:
+        raise ValueError(f"{type_id}: '{field}' must be one of {SHAPE_TYPES}, got {shape_type!r}")
+    return shape_type
+
+def _points(entry, type_id):
+    points = entry.get('shape_points', [])
+    try:
+        return tuple((float(x), float(y)) for x, y in points)
+    except (TypeError, ValueError):
+        raise ValueError(f"{type_id}: 'shape_points' must be a list of [x, y] pairs") from None
+
+
+# --- Compilers ---
+def compile_enemy(type_id, entry):
+    """EnemyArchetype for one enemies.json entry (defaults as Enemy always used)."""
+    archetype = object.__new__(EnemyArchetype)
+    archetype._init(
+        type_id=type_id,
+        data=entry, # Raw dict, for UI/tools that show the JSON fields
+        name=entry.get('name', 'Unknown Enemy'),
+        health=float(_number(entry, type_id, 'health', 10, minimum=0)),
+        speed=float(_number(entry, type_id, 'speed', 50, minimum=0)),
+        reward=_number(entry, type_id, 'reward', 0),
+        size=_size(entry, type_id, (20, 20)),
+        shape_type=_shape(entry, type_id),
+        shape_points=_points(entry, type_id),
+        fill_color_idx=_color(entry, type_id, 'fill_color_idx', 6),     # Default Red
+        border_color_idx=_color(entry, type_id, 'border_color_idx', 1), # Default White
+        border_width=_number(entry, type_id, 'border_width', 1, minimum=0),
+    )
+    return archetype
+
+def compile_projectile(tower_id, entry):
+    """ProjectileArchetype from a towers.json entry's projectile fields."""
+    shape = entry.get('projectile_shape', {})
+    if not isinstance(shape, dict):
+        raise ValueError(f"{tower_id}: 'projectile_shape' must be an object, got {shape!r}")
+    shape_type = _shape(shape, tower_id, "type", "circle")
+    radius = _number(shape, tower_id, 'radius', 3, minimum=0)
+    size = (radius * 2, radius * 2) if shape_type == "circle" else (5, 5) # Approximate size for rect
+    archetype = object.__new__(ProjectileArchetype)
+    archetype._init(
+        type_id=tower_id,
+        pool_key=tower_id,
+        shape_type=shape_type,
+        radius=radius,
+        size=size,
+        half=size[0] / 2, # Half extent of the (square) projectile box
+        fill_color_idx=_color(shape, tower_id, 'fill_color_idx', 7),     # Default Yellow
+        border_color_idx=_color(shape, tower_id, 'border_color_idx', 1), # Default White
+        border_width=_number(shape, tower_id, 'border_width', 0, minimum=0), # Default no border
+        speed=_number(entry, tower_id, 'projectile_speed', 300, minimum=0),
+        damage=_number(entry, tower_id, 'damage', 10),
+    )
+    return archetype
+
+def compile_tower(type_id, entry):
+    """TowerArchetype for one towers.json entry, including its projectile."""
+    name = entry.get('name', 'Unknown Tower')
+    targeting = entry.get('targeting', DEFAULT_TARGETING) # Which enemy in range to shoot
+    if targeting not in TARGETING_STRATEGIES:
+        raise ValueError(f"{type_id}: unknown targeting '{targeting}' (expected one of {TARGETING_STRATEGIES})")
+    fire_rate = _number(entry, type_id, 'fire_rate', 1.0, minimum=0)
+    cooldown = 1.0 / fire_rate if fire_rate > 0 else float('inf')
+    archetype = object.__new__(TowerArchetype)
+    archetype._init(
+        type_id=type_id,
+        data=entry,
+        name=name,
+        cost=_number(entry, type_id, 'cost', 100, minimum=0),
+        range=_number(entry, type_id, 'range', 100, minimum=0),
+        fire_rate=fire_rate,
+        cooldown=cooldown,
+        cooldown_span=stepped_duration(cooldown), # Cooldown rounded up to whole simulation steps
+        damage=_number(entry, type_id, 'damage', 10),
+        targeting=targeting,
+        size=_size(entry, type_id, (30, 30)),
+        shape_type=_shape(entry, type_id),
+        shape_points=_points(entry, type_id),
+        fill_color_idx=_color(entry, type_id, 'fill_color_idx', 10),    # Default Grey
+        border_color_idx=_color(entry, type_id, 'border_color_idx', 1), # Default White
+        border_width=_number(entry, type_id, 'border_width', 1, minimum=0),
+        projectile=compile_projectile(type_id, entry),
+        effect_type=entry.get('effect_type'),
+        slow_factor=_number(entry, type_id, 'slow_factor', 0.5, minimum=0),
+        slow_duration=_number(entry, type_id, 'slow_duration', 2.0, minimum=0),
+        upgrades_to=entry.get('upgrades_to'),
+        upgrade_cost=_number(entry, type_id, 'upgrade_cost', 0, minimum=0),
+    )
+    return archetype
+
+def _compile_all(table, compile_entry, kind):
+    archetypes = {}
+    for type_id, entry in table.items():
+        if not isinstance(entry, dict):
+            raise ValueError(f"{kind} '{type_id}' must be an object")
+        archetypes[type_id] = compile_entry(type_id, entry)
+    return archetypes
+
+def compile_enemies(enemy_data):
+    """{enemy_type_id: EnemyArchetype} for the whole enemies.json table."""
+    return _compile_all(enemy_data, compile_enemy, "Enemy")
+
+def compile_towers(tower_data):
+    """{tower_type_id: TowerArchetype} for the whole towers.json table. Also
+    checks that every upgrades_to names a known tower."""
+    archetypes = _compile_all(tower_data, compile_tower, "Tower")
+    for archetype in archetypes.values():
+        if archetype.upgrades_to is not None and archetype.upgrades_to not in archetypes:
+            raise ValueError(f"{archetype.type_id}: upgrades_to '{archetype.upgrades_to}' is not a tower in towers.json")
+    return archetypes
@@ -0,0 +1,45 @@
+# src/background.py
+import pygame
+from .config import get_color, get_palette_version
+
+PATH_COLOR_IDX = 3 # Palette index for the path polyline (Green)
+PATH_WIDTH = 3
+
+class BackgroundLayer:
+    """Static layer baked once per level: map fill, path and tower platforms.
+    Each frame starts with a single blit of it instead of fill + draw calls."""
+    def __init__(self, size):
+        self.size = size
+        self.surface = None
+        self._key = None   # (level_id, palette version, platform occupancy) of the baked surface
+        self.rebuilds = 0  # Number of bakes so far (for profiling)
+
+    def invalidate(self):
+        """Forces a rebake on the next get() (e.g. on level load)."""
+        self._key = None
+
+    def get(self, level_id, bg_color_idx, path, platforms):
+        """Returns the baked surface, rebaking if the level, palette or any
+        platform's occupancy changed since the last bake."""
+        key = (level_id, get_palette_version(), tuple(platform.occupied for platform in platforms))
+        if key != self._key:
+            self._bake(bg_color_idx, path, platforms)
+            self._key = key
+        return self.surface
+
+    def _bake(self, bg_color_idx, path, platforms):
+        """Renders the static layer into the cached surface."""
+        surface = pygame.Surface(self.size)
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert() # Match the display format for fast blits
+        surface.fill(get_color(bg_color_idx, (0, 0, 0)))
+
+        if path and len(path) >= 2:
+            pygame.draw.lines(surface, get_color(PATH_COLOR_IDX, (0, 255, 0)), False, path, PATH_WIDTH)
+
+        # Occupied platforms are still drawn; their tower is drawn on top each frame
+        for platform in platforms:
+            platform.draw(surface)
+
+        self.surface = surface
+        self.rebuilds += 1
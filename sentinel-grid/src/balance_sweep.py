@@ -0,0 +1,194 @@
+# src/balance_sweep.py
+import os
+import sys
+import csv
+import copy
+import json
+import time
+import itertools
+import argparse
+import multiprocessing
+import pygame
+from .config import SCREEN_SIZE, STATE_VICTORY
+from .simulation import Simulation, DEFAULT_DT, DEFAULT_MAX_SIM_TIME
+
+# Example sweep file (python -m src.balance_sweep sweep.json -o results.csv):
+# {
+#   "levels": ["level1", "level2"],
+#   "placements": {"level1": ["gun_tower:0", "slow_tower:3"],
+#                  "level2": ["gun_tower:0", "gun_tower:1", "cannon_tower:5"]},
+#   "grid": {
+#     "towers.gun_tower.damage": [10, 12, 14],
+#     "towers.gun_tower.fire_rate": [1.0, 1.25, 1.5],
+#     "towers.gun_tower.range": [160, 180],
+#     "waves.wave2_l1.0.count": [6, 8, 10],
+#     "waves.wave2_l1.0.interval": [0.5, 0.6]
+#   }
+# }
+# Parameter keys are "towers.<tower_id>.<field>", "enemies.<enemy_id>.<field>"
+# or "waves.<wave_id>.<entry index>.<field>". Every combination of the grid
+# values is run once per level.
+
+RESULT_FIELDS = ["config_id", "level_id", "outcome", "core_damage_taken", "leaks", "kills",
+                 "resources_left", "time_to_clear", "sim_time", "ticks", "wall_time"]
+
+# --- Parameter overrides ---
+def _data_sources(sim):
+    """The data tables a parameter key can address, by key prefix."""
+    return {
+        "towers": sim.tower_manager.tower_data,
+        "enemies": sim.wave_manager.enemy_data,
+        "waves": sim.wave_manager.wave_definitions,
+    }
+
+def _resolve(sources, key):
+    """Returns (container, field) for a dotted parameter key; raises KeyError if unknown."""
+    table_name, *path = key.split(".")
+    if table_name not in sources or len(path) < 2:
+        raise KeyError(f"Unknown parameter '{key}' (expected towers./enemies./waves. prefix)")
+    *path, field = path
+    container = sources[table_name]
+    try:
+        for part in path:
+            container = container[int(part)] if isinstance(container, list) else container[part]
+    except (KeyError, IndexError, ValueError):
+        raise KeyError(f"Unknown parameter '{key}': no entry '{part}'") from None
+    if field not in container:
+        raise KeyError(f"Unknown parameter '{key}': no field '{field}'")
+    return container, field
+
+def apply_overrides(sim, params):
+    """Writes each parameter value into the simulation's loaded data tables
+    and recompiles the tower/enemy archetypes from them."""
+    sources = _data_sources(sim)
+    for key, value in params.items():
+        container, field = _resolve(sources, key)
+        container[field] = value
+    sim.tower_manager.compile_tower_types()
+    sim.wave_manager.compile_enemy_types()
+
+def expand_grid(grid):
+    """Cartesian product of the grid axes, as a list of {key: value} dicts."""
+    keys = sorted(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[key] for key in keys))]
+
+def parse_placements(specs):
+    """["gun_tower:0", ...] -> [("gun_tower", 0), ...]"""
+    placements = []
+    for spec in specs:
+        tower_id, _, index = spec.partition(":")
+        placements.append((tower_id, int(index)))
+    return placements
+
+
+# --- Worker side: one Simulation per process, data loaded once ---
+_worker = {}
+
+def _init_worker(dt, max_sim_time):
+    """Pool initializer: loads the JSON data once and keeps pristine copies."""
+    sys.stdout = open(os.devnull, "w") # Manager logging dominates run time
+    sim = Simulation(pygame.Rect((0, 0), SCREEN_SIZE))
+    _worker["sim"] = sim
+    _worker["pristine"] = {name: copy.deepcopy(table) for name, table in _data_sources(sim).items()}
+    _worker["dt"] = dt
+    _worker["max_sim_time"] = max_sim_time
+
+def _restore_data(sim):
+    """Puts back untouched copies of the data tables before the next config."""
+    pristine = _worker["pristine"]
+    sim.tower_manager.tower_data = copy.deepcopy(pristine["towers"])
+    sim.wave_manager.enemy_data = copy.deepcopy(pristine["enemies"])
+    sim.wave_manager.wave_definitions = copy.deepcopy(pristine["waves"])
+
+def _run_job(job):
+    """Runs one (config, level) pair to completion and returns a result row."""
+    config_id, level_id, params, placements = job
+    sim = _worker["sim"]
+    _restore_data(sim)
+    apply_overrides(sim, params)
+    if not sim.load_level(level_id):
+        raise ValueError(f"Level ID '{level_id}' could not be loaded.")
+    for tower_type_id, platform in placements:
+        sim.place_tower(tower_type_id, platform)
+    wall_time = sim.run_until_finished(_worker["dt"], _worker["max_sim_time"])
+
+    result = sim.get_result()
+    row = {
+        "config_id": config_id,
+        "level_id": level_id,
+        "outcome": result["outcome"],
+        "core_damage_taken": result["core_damage_taken"],
+        "leaks": result["leaks"],
+        "kills": result["kills"],
+        "resources_left": result["resources"],
+        "time_to_clear": round(result["sim_time"], 4) if result["outcome"] == STATE_VICTORY else "",
+        "sim_time": round(result["sim_time"], 4),
+        "ticks": result["ticks"],
+        "wall_time": round(wall_time, 4),
+    }
+    row.update(params)
+    return row
+
+
+# --- Driver ---
+def build_jobs(spec):
+    """Expands a sweep spec into (config_id, level_id, params, placements) jobs."""
+    levels = spec.get("levels", ["level1"])
+    placements = {level: parse_placements(spec.get("placements", {}).get(level, [])) for level in levels}
+    configs = expand_grid(spec.get("grid", {}))
+    return [(config_id, level, params, placements[level])
+            for config_id, params in enumerate(configs)
+            for level in levels]
+
+def validate_spec(spec):
+    """Checks every grid key against freshly loaded data before fanning out."""
+    with open(os.devnull, "w") as devnull:
+        stdout, sys.stdout = sys.stdout, devnull
+        try:
+            sim = Simulation(pygame.Rect((0, 0), SCREEN_SIZE))
+        finally:
+            sys.stdout = stdout
+    sources = _data_sources(sim)
+    for key in spec.get("grid", {}):
+        _resolve(sources, key)
+    for level in spec.get("levels", ["level1"]):
+        if level not in sim.all_levels_data:
+            raise KeyError(f"Unknown level '{level}'")
+
+def run_sweep(spec, output_path, workers=None, dt=DEFAULT_DT, max_sim_time=DEFAULT_MAX_SIM_TIME):
+    """Fans the sweep out over a process pool and streams rows to a CSV file.
+    Returns the number of rows written."""
+    validate_spec(spec)
+    jobs = build_jobs(spec)
+    workers = workers or os.cpu_count() or 1
+    param_fields = sorted(spec.get("grid", {}))
+    chunksize = max(1, len(jobs) // (workers * 8)) # Few round-trips, still balanced
+
+    print(f"Balance sweep: {len(jobs)} runs on {workers} workers -> {output_path}")
+    start = time.perf_counter()
+    written = 0
+    with open(output_path, "w", newline="") as f, \
+         multiprocessing.Pool(workers, initializer=_init_worker, initargs=(dt, max_sim_time)) as pool:
+        writer = csv.DictWriter(f, fieldnames=RESULT_FIELDS + param_fields)
+        writer.writeheader()
+        for row in pool.imap(_run_job, jobs, chunksize):
+            writer.writerow(row)
+            written += 1
+            if written % 500 == 0:
+                print(f"  {written}/{len(jobs)} runs ({time.perf_counter() - start:.1f}s)")
+    print(f"Balance sweep done: {written} runs in {time.perf_counter() - start:.1f}s")
+    return written
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Headless balance sweep over tower/enemy/wave parameters.")
+    parser.add_argument("spec", help="sweep JSON file (levels, placements, grid)")
+    parser.add_argument("-o", "--output", default="balance_sweep.csv", help="CSV file to write")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="worker processes (default: one per core)")
+    parser.add_argument("--max-sim-time", type=float, default=DEFAULT_MAX_SIM_TIME,
+                        help="game seconds before a run is cut off")
+    args = parser.parse_args()
+
+    with open(args.spec, "r") as f:
+        sweep_spec = json.load(f)
+    run_sweep(sweep_spec, args.output, args.workers, max_sim_time=args.max_sim_time)
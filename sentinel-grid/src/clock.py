@@ -0,0 +1,78 @@
+# src/clock.py
+import math
+from functools import lru_cache
+
+FIXED_DT = 1.0 / 60.0       # Seconds of game time per simulation step
+MAX_STEPS_PER_FRAME = 5     # Catch-up cap; time beyond it is dropped (slow-motion instead of a death spiral)
+
+MAX_COUNTED_STEPS = 1 << 16 # ~18 min at 60 Hz; longer timers are rounded up directly
+
+@lru_cache(maxsize=None)
+def stepped_duration(duration, step_dt=FIXED_DT):
+    """How long a timer of `duration` really runs when it is counted up in
+    whole steps until the total reaches it (summed in float, exactly like a
+    per-step `timer += dt; if timer >= duration` loop). Past MAX_COUNTED_STEPS
+    the float drift of the running sum is irrelevant, so very long timers
+    (a tiny fire_rate) are just rounded up to whole steps."""
+    if duration == float('inf'):
+        return duration
+    if duration / step_dt > MAX_COUNTED_STEPS:
+        return math.ceil(duration / step_dt) * step_dt
+    elapsed = 0.0
+    steps = 0
+    while elapsed < duration:
+        elapsed += step_dt
+        steps += 1
+    return steps * step_dt
+
+class GameClock:
+    """Explicit simulation clock. Only advances when the simulation steps,
+    so game time is independent of wall time and the display."""
+    def __init__(self):
+        self.time = 0.0   # Seconds of simulated time since reset
+        self.ticks = 0    # Number of simulation steps since reset
+
+    def advance(self, dt):
+        """Moves the clock forward by one simulation step of dt seconds."""
+        self.time += dt
+        self.ticks += 1
+
+    def reset(self):
+        """Rewinds the clock to zero (called on level load/restart)."""
+        self.time = 0.0
+        self.ticks = 0
+
+
+class FixedStepClock(GameClock):
+    """GameClock driven by a wall-time accumulator. Each rendered frame adds
+    its real duration; the simulation then runs as many whole FIXED_DT steps
+    as fit (at most max_steps), and the leftover fraction is exposed as
+    alpha for interpolating between the previous and current state."""
+    def __init__(self, step_dt=FIXED_DT, max_steps=MAX_STEPS_PER_FRAME):
+        super().__init__()
+        self.step_dt = step_dt
+        self.max_steps = max_steps
+        self.accumulator = 0.0  # Wall time not yet simulated
+        self.dropped_time = 0.0 # Wall time discarded by the catch-up cap (the profiler reports it)
+
+    def accumulate(self, frame_dt):
+        """Adds one frame's wall time; returns the number of steps to run now."""
+        self.accumulator += max(0.0, frame_dt)
+        steps = int(self.accumulator / self.step_dt)
+        if steps > self.max_steps:
+            # Too far behind (hitch, window drag, breakpoint): drop the backlog
+            self.dropped_time += (steps - self.max_steps) * self.step_dt
+            steps = self.max_steps
+            self.accumulator = self.accumulator % self.step_dt + steps * self.step_dt
+        self.accumulator -= steps * self.step_dt
+        return steps
+
+    @property
+    def alpha(self):
+        """Fraction (0..1) of a step elapsed since the last simulated state."""
+        return min(1.0, self.accumulator / self.step_dt)
+
+    def reset(self):
+        """Rewinds the clock and clears any pending wall time."""
+        super().reset()
+        self.accumulator = 0.0
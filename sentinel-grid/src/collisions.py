@@ -0,0 +1,62 @@
+# src/collisions.py
+from bisect import bisect_left
+
+class CollisionSystem:
+    """Sort-and-sweep broad phase for projectile/enemy hits.
+
+    build() sorts the active enemies' boxes on their left edge once per tick;
+    each projectile then only tests the enemies whose x-extent can overlap its
+    own, found by bisecting that sorted list. Cost stays roughly linear in
+    projectiles + enemies instead of their product."""
+    def __init__(self):
+        self._lefts = []    # Sorted left edges, parallel to _boxes
+        self._boxes = []    # (left, right, top, bottom, spawn_id, enemy)
+        self._max_width = 0 # Widest enemy box; bounds the bisect window
+        self.pair_tests = 0 # Narrow-phase box tests in the last hits() pass
+
+    def build(self, enemies):
+        """Snapshots the boxes of all active enemies, sorted on x."""
+        boxes = []
+        max_width = 0
+        for enemy in enemies:
+            if not enemy.is_active:
+                continue
+            rect = enemy.rect
+            boxes.append((rect.left, rect.right, rect.top, rect.bottom, enemy.spawn_id, enemy))
+            if rect.width > max_width:
+                max_width = rect.width
+        boxes.sort(key=lambda box: (box[0], box[4])) # Left edge, then spawn order
+        self._boxes = boxes
+        self._lefts = [box[0] for box in boxes]
+        self._max_width = max_width
+
+    def hits(self, projectiles):
+        """Yields (projectile, enemy) hit pairs in a deterministic order:
+        projectiles in group (fire) order, each hitting the earliest-spawned
+        enemy it overlaps. Pairs are generated lazily, so an enemy killed by
+        an earlier pair is no longer offered to later projectiles."""
+        lefts = self._lefts
+        boxes = self._boxes
+        max_width = self._max_width
+        tests = 0
+        for projectile in projectiles.sprites(): # Copy: hits remove projectiles from the group
+            if not projectile.is_active or not boxes:
+                continue
+            rect = projectile.rect
+            p_left, p_right, p_top, p_bottom = rect.left, rect.right, rect.top, rect.bottom
+            if p_left >= p_right or p_top >= p_bottom:
+                continue # Zero-size rects never collide (matches Rect.colliderect)
+            # Only boxes starting in (p_left - max_width, p_right) can overlap on x
+            start = bisect_left(lefts, p_left - max_width + 1)
+            end = bisect_left(lefts, p_right, start)
+            best = None
+            for index in range(start, end):
+                left, right, top, bottom, spawn_id, enemy = boxes[index]
+                tests += 1
+                if (right > p_left and top < p_bottom and bottom > p_top
+                        and enemy.is_active
+                        and (best is None or spawn_id < best.spawn_id)):
+                    best = enemy
+            if best is not None:
+                yield projectile, best
+        self.pair_tests = tests
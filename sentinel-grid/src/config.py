@@ -6,6 +6,7 @@ SCREEN_WIDTH = 1280
 SCREEN_HEIGHT = 720
 SCREEN_SIZE = (SCREEN_WIDTH, SCREEN_HEIGHT)
 FPS = 60
+IDLE_WAIT_MS = 250 # Idle mode (paused/end states, unfocused or minimized): longest block per event wait
 
 # --- Color Palettes ---
 # Define palettes as lists/tuples of colors.
@@ -53,6 +54,7 @@ PALETTE_RETRO_1 = [
 # --- Select Active Palette ---
 # Change this to PALETTE_RETRO_1 etc. to switch themes
 ACTIVE_PALETTE = PALETTE_RETRO_1
+_palette_version = 0 # Bumped by set_active_palette so cached renders can rebuild
 
 # --- Helper Function to Get Palette Color ---
 def get_color(index, default_color=(255, 0, 255)): # Default to bright pink for errors
@@ -63,6 +65,20 @@ def get_color(index, default_color=(255, 0, 255)): # Default to bright pink for
         print(f"Warning: Color index {index} out of range for current palette.")
         return default_color
 
+def set_active_palette(palette):
+    """Switches the active palette at runtime and invalidates palette-keyed caches."""
+    global ACTIVE_PALETTE, _palette_version
+    ACTIVE_PALETTE = palette
+    _palette_version += 1
+
+def get_palette():
+    """The palette currently in use (read at call time; set_active_palette rebinds it)."""
+    return ACTIVE_PALETTE
+
+def get_palette_version():
+    """Counter that changes whenever the active palette does (cache key helper)."""
+    return _palette_version
+
 # --- Old Color definitions (keep for reference or remove later) ---
 # BLACK = (0, 0, 0)
 # WHITE = (255, 255, 255)
@@ -82,52 +98,10 @@ STATE_MAIN_MENU = "main_menu" # Add later
 STATE_LEVEL_SELECT = "level_select" # Add later
 STATE_OPTIONS = "options" # Add later
 
-# --- Level 1 Data ---
-PATH_WAYPOINTS_L1 = [
-    (0, SCREEN_HEIGHT // 2),
-    (SCREEN_WIDTH // 4, SCREEN_HEIGHT // 2),
-    (SCREEN_WIDTH // 4, SCREEN_HEIGHT * 3 // 4),
-    (SCREEN_WIDTH * 3 // 4, SCREEN_HEIGHT * 3 // 4),
-    (SCREEN_WIDTH * 3 // 4, SCREEN_HEIGHT // 4),
-    (SCREEN_WIDTH, SCREEN_HEIGHT // 4)
-]
-PLATFORM_LOCATIONS_L1 = [
-    (150, SCREEN_HEIGHT // 2 - 80),
-    (SCREEN_WIDTH // 4 + 80, SCREEN_HEIGHT // 2),
-    (SCREEN_WIDTH // 4 + 80, SCREEN_HEIGHT * 3 // 4 + 80),
-    (SCREEN_WIDTH * 3 // 4 - 80, SCREEN_HEIGHT * 3 // 4 + 80),
-    (SCREEN_WIDTH * 3 // 4 - 80, SCREEN_HEIGHT // 4 - 80),
-]
-
-# --- Level 2 Data ---
-PATH_WAYPOINTS_L2 = [
-    (0, 100),
-    (SCREEN_WIDTH // 3, 100),
-    (SCREEN_WIDTH // 3, SCREEN_HEIGHT // 2),
-    (SCREEN_WIDTH * 2 // 3, SCREEN_HEIGHT // 2),
-    (SCREEN_WIDTH * 2 // 3, SCREEN_HEIGHT - 100),
-    (SCREEN_WIDTH, SCREEN_HEIGHT - 100),
-]
-PLATFORM_LOCATIONS_L2 = [
-    (SCREEN_WIDTH // 3 - 80, 100),
-    (SCREEN_WIDTH // 3 + 80, 100),
-    (SCREEN_WIDTH // 3 + 80, SCREEN_HEIGHT // 2 - 80),
-    (SCREEN_WIDTH // 3 - 80, SCREEN_HEIGHT // 2 + 80),
-    (SCREEN_WIDTH * 2 // 3 + 80, SCREEN_HEIGHT // 2 + 80),
-    (SCREEN_WIDTH * 2 // 3 - 80, SCREEN_HEIGHT // 2),
-    (SCREEN_WIDTH * 2 // 3 - 80, SCREEN_HEIGHT - 100 - 80),
-    (SCREEN_WIDTH * 2 // 3 + 80, SCREEN_HEIGHT - 100),
-]
+# --- Level Data ---
+# Paths (path_waypoints) and tower platforms (platform_locations) are defined
+# per level in data/levels.json and loaded through src/content.py.
 
-# --- Data Lookup Maps ---
-LEVEL_PATHS = {
-    "level1_path": PATH_WAYPOINTS_L1,
-    "level2_path": PATH_WAYPOINTS_L2,
-}
-LEVEL_PLATFORMS = {
-    "level1_platforms": PLATFORM_LOCATIONS_L1,
-    "level2_platforms": PLATFORM_LOCATIONS_L2,
-}
 # Map background keys to palette indices
 LEVEL_BACKGROUNDS = {
     "bg_index_0": 0,
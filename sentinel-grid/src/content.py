@@ -0,0 +1,254 @@
+# src/content.py
+import os
+import sys
+import json
+import time
+import pickle
+import hashlib
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from .config import get_palette
+from .archetypes import compile_enemies, compile_towers
+
+# --- Get the absolute path to the project's root directory ---
+script_dir = os.path.dirname(os.path.realpath(__file__))
+project_root = os.path.dirname(script_dir) # Go up one level from 'src'
+DATA_DIR = os.path.join(project_root, 'data')
+CACHE_PATH = os.path.join(project_root, '.cache', 'content.pickle')
+
+DATA_FILES = ("towers.json", "enemies.json", "waves.json", "levels.json")
+# Modules whose code shapes the compiled content; editing one invalidates the cache too
+COMPILER_MODULES = ("content.py", "archetypes.py", "config.py", "clock.py", "path_index.py")
+CACHE_FORMAT = 1 # Bump when the cached layout changes
+
+
+class ContentRegistry:
+    """Every data file, loaded, validated and indexed once per process.
+
+    Managers read their tables from here instead of parsing JSON themselves:
+    the raw dicts (tower_data, enemy_data, wave_definitions, level_data; the
+    UI and the balance sweep use these) plus the compiled tower/enemy
+    archetypes. Level geometry (path_waypoints, platform_locations) lives in
+    levels.json. Use load_content() rather than constructing one directly."""
+    def __init__(self):
+        self.tower_data = {}
+        self.enemy_data = {}
+        self.wave_definitions = {}
+        self.level_data = {}
+        self.tower_types = {} # tower_id -> TowerArchetype
+        self.enemy_types = {} # enemy_type_id -> EnemyArchetype
+        self.level_ids = ()   # Level IDs in levels.json order (campaign order)
+        self.from_cache = False # True if this came from the binary cache
+        self.load_time = 0.0    # Seconds spent loading (cache hit or full parse)
+
+    @classmethod
+    def build(cls, data_dir=DATA_DIR):
+        """Parses and validates every data file. Raises RuntimeError naming the
+        file and entry on missing or malformed data."""
+        content = cls()
+        # Files are read and parsed concurrently; validation needs all of them
+        with ThreadPoolExecutor(max_workers=len(DATA_FILES), thread_name_prefix="content") as pool:
+            tables = dict(zip(DATA_FILES, pool.map(lambda name: _read_json(data_dir, name), DATA_FILES)))
+        content.tower_data = tables["towers.json"]
+        content.enemy_data = tables["enemies.json"]
+        content.wave_definitions = tables["waves.json"]
+        content.level_data = tables["levels.json"]
+        try:
+            content.tower_types = compile_towers(content.tower_data)
+        except ValueError as e:
+            raise RuntimeError(f"Invalid tower data in towers.json: {e}") from e
+        try:
+            content.enemy_types = compile_enemies(content.enemy_data)
+        except ValueError as e:
+            raise RuntimeError(f"Invalid enemy data in enemies.json: {e}") from e
+        try:
+            _validate_waves(content.wave_definitions, content.enemy_types)
+        except ValueError as e:
+            raise RuntimeError(f"Invalid wave data in waves.json: {e}") from e
+        try:
+            _validate_levels(content.level_data, content.wave_definitions)
+        except ValueError as e:
+            raise RuntimeError(f"Invalid level data in levels.json: {e}") from e
+        content.level_ids = tuple(content.level_data)
+        return content
+
+    def path_waypoints(self, level_id):
+        """The level's path as a list of (x, y) waypoints."""
+        return [tuple(p) for p in self.level_data[level_id]['path_waypoints']]
+
+    def platform_locations(self, level_id):
+        """The level's tower platform centres as (x, y) tuples."""
+        return [tuple(p) for p in self.level_data[level_id].get('platform_locations', [])]
+
+
+# --- Validation (raises ValueError; build() adds the file name) ---
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+def _is_point(value):
+    return isinstance(value, (list, tuple)) and len(value) == 2 and all(_is_number(v) for v in value)
+
+def _validate_waves(waves, enemy_types):
+    for wave_id, events in waves.items():
+        if not isinstance(events, list):
+            raise ValueError(f"{wave_id}: expected a list of spawn events")
+        for index, event in enumerate(events):
+            where = f"{wave_id}[{index}]"
+            if not isinstance(event, dict):
+                raise ValueError(f"{where}: spawn event must be an object")
+            if event.get('enemy_type') not in enemy_types:
+                raise ValueError(f"{where}: unknown enemy_type {event.get('enemy_type')!r}")
+            for field in ('time', 'count', 'interval'):
+                if not _is_number(event.get(field)) or event[field] < 0:
+                    raise ValueError(f"{where}: '{field}' must be a number >= 0, got {event.get(field)!r}")
+
+def _validate_levels(levels, waves):
+    for level_id, level in levels.items():
+        if not isinstance(level, dict):
+            raise ValueError(f"{level_id}: level must be an object")
+        path = level.get('path_waypoints')
+        if not isinstance(path, list) or len(path) < 2 or not all(_is_point(p) for p in path):
+            raise ValueError(f"{level_id}: 'path_waypoints' must be a list of at least two [x, y] points")
+        platforms = level.get('platform_locations', [])
+        if not isinstance(platforms, list) or not all(_is_point(p) for p in platforms):
+            raise ValueError(f"{level_id}: 'platform_locations' must be a list of [x, y] points")
+        if 'core_location' in level and not _is_point(level['core_location']):
+            raise ValueError(f"{level_id}: 'core_location' must be an [x, y] point")
+        for wave_id in level.get('wave_sequence', []):
+            if wave_id not in waves:
+                raise ValueError(f"{level_id}: wave_sequence names unknown wave '{wave_id}'")
+        background = level.get('map_background_idx', 0)
+        if not isinstance(background, int) or not 0 <= background < len(get_palette()):
+            raise ValueError(f"{level_id}: 'map_background_idx' must be a palette index, got {background!r}")
+
+def _read_json(data_dir, filename):
+    file_path = os.path.join(data_dir, filename)
+    try:
+        with open(file_path, 'r') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        raise RuntimeError(f"Data file not found: {file_path}") from None
+    except json.JSONDecodeError as e:
+        raise RuntimeError(f"Could not decode JSON from {file_path}: {e}") from None
+
+
+# --- Binary cache ---
+# Layout: pickle(header) followed by pickle(ContentRegistry). The header holds
+# CACHE_FORMAT and a manifest {file: (mtime_ns, size, sha256)} of every data
+# file and compiler module. A file whose mtime and size match is trusted
+# without reading it; otherwise it is hashed, so a touched-but-unchanged file
+# (git checkout, copy) still hits. Only the header is read on a miss.
+def _tracked_files(data_dir):
+    """{manifest key: path}; keys are relative so a moved checkout still hits."""
+    files = {f"data/{name}": os.path.join(data_dir, name) for name in DATA_FILES}
+    files.update((f"src/{name}", os.path.join(script_dir, name)) for name in COMPILER_MODULES)
+    return files
+
+def _hash_file(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def _manifest(files, known):
+    """Current (mtime_ns, size, sha256) per file, reusing known hashes for
+    files whose mtime and size have not changed."""
+    manifest = {}
+    for key, path in files.items():
+        stat = os.stat(path)
+        previous = known.get(key)
+        if previous and previous[0] == stat.st_mtime_ns and previous[1] == stat.st_size:
+            manifest[key] = previous
+        else:
+            manifest[key] = (stat.st_mtime_ns, stat.st_size, _hash_file(path))
+    return manifest
+
+def _read_cache(cache_path, files):
+    """(content or None, current manifest, cached manifest). content is None
+    on a miss or an unreadable cache."""
+    known = {}
+    try:
+        with open(cache_path, 'rb') as f:
+            header = pickle.load(f)
+            if header.get("format") == CACHE_FORMAT:
+                known = header["manifest"]
+                manifest = _manifest(files, known)
+                if all(key in known and known[key][2] == entry[2] for key, entry in manifest.items()):
+                    return pickle.load(f), manifest, known
+                return None, manifest, known
+    except FileNotFoundError:
+        pass
+    except Exception as e: # Truncated/corrupt/incompatible cache: rebuild it
+        print(f"Content cache unreadable ({e}); rebuilding.")
+        known = {}
+    return None, _manifest(files, known), known
+
+def _write_cache(cache_path, manifest, content):
+    """Writes the cache atomically; failure (read-only tree) only costs a rebuild next run."""
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        temp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(temp_path, 'wb') as f:
+            pickle.dump({"format": CACHE_FORMAT, "manifest": manifest}, f, pickle.HIGHEST_PROTOCOL)
+            pickle.dump(content, f, pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, cache_path)
+    except OSError as e:
+        print(f"Warning: could not write content cache {cache_path}: {e}")
+
+
+_loaded = {} # data_dir -> ContentRegistry, shared by every Simulation in the process
+_load_lock = threading.Lock() # A background load and a direct call never both build
+
+def load_content(data_dir=DATA_DIR, cache_path=CACHE_PATH, use_cache=True, reload=False):
+    """The process-wide ContentRegistry for data_dir. Comes from the binary
+    cache when no data file (or compiler module) changed since it was
+    written; otherwise the JSON is parsed and validated and the cache
+    refreshed. Pass use_cache=False to always parse (and not write)."""
+    with _load_lock:
+        if not reload and data_dir in _loaded:
+            return _loaded[data_dir]
+        content = _load(data_dir, cache_path, use_cache)
+        _loaded[data_dir] = content
+        return content
+
+def _load(data_dir, cache_path, use_cache):
+    """Cache lookup, else a full build (see load_content)."""
+    start = time.perf_counter()
+    content = None
+    if use_cache:
+        cached, manifest, known = _read_cache(cache_path, _tracked_files(data_dir))
+        if isinstance(cached, ContentRegistry):
+            content = cached
+            content.from_cache = True
+            if manifest != known:
+                _write_cache(cache_path, manifest, content) # Same content, new mtimes: refresh the fast path
+    if content is None:
+        content = ContentRegistry.build(data_dir)
+        if use_cache:
+            _write_cache(cache_path, manifest, content)
+    content.load_time = time.perf_counter() - start
+    return content
+
+def load_content_async(data_dir=DATA_DIR, cache_path=CACHE_PATH, use_cache=True):
+    """Starts load_content on a worker thread so the data loads while the
+    caller does other startup work (opening the window). Returns a
+    concurrent.futures.Future; its result() is the ContentRegistry (and
+    re-raises any data error)."""
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="content-load")
+    future = executor.submit(load_content, data_dir, cache_path, use_cache)
+    executor.shutdown(wait=False) # The worker exits once the load is done
+    return future
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Validate the game data files and refresh the content cache.")
+    parser.add_argument("--no-cache", action="store_true", help="parse the JSON even if the cache is fresh")
+    args = parser.parse_args()
+    try:
+        registry = load_content(use_cache=not args.no_cache)
+    except RuntimeError as e:
+        print(f"Data error: {e}")
+        sys.exit(1)
+    source = "cache" if registry.from_cache else "JSON"
+    print(f"Content OK ({source}, {registry.load_time * 1000:.1f} ms): {len(registry.tower_types)} towers, "
+          f"{len(registry.enemy_types)} enemies, {len(registry.wave_definitions)} waves, "
+          f"levels {', '.join(registry.level_ids)}")
@@ -1,7 +1,6 @@
 # src/core.py
 import pygame
 import math # For pulsing animation
-from .config import get_color # Use palette helper
 
 class Core(pygame.sprite.Sprite):
     def __init__(self, pos, health):
@@ -24,6 +23,7 @@ class Core(pygame.sprite.Sprite):
 
         self.pulse_speed = 2.0 # Radians per second for pulsing effect
         self.pulse_amplitude = 3 # Pixels variation in radius
+        self.anim_timer = 0.0 # Advanced by update(dt), so the pulse follows game time
 
         print(f"Core Initialized at {pos} with {self.max_health} HP.")
 
@@ -42,32 +42,21 @@ class Core(pygame.sprite.Sprite):
             self.current_health -= amount
             print(f"Core took {amount} damage. Current HP: {self.current_health}/{self.max_health}")
             if self.current_health <= 0:
-                self.current_health = 0
+                self.current_health = 0.0
                 print("Core destroyed!")
 
     def update(self, dt):
         """Core update for animations like pulsing."""
         # Keep rect updated in case position changes (it doesn't currently)
         self.rect.center = self.pos
-        # Add pulsing logic here if desired (calculated in draw_shape)
+        self.anim_timer += dt # Pulse radius is calculated from this in pulse_radius
 
-    def draw_shape(self, surface):
-        """Draws the Core's shape."""
-        fill_color = get_color(self.fill_color_idx)
-        border_color = get_color(self.border_color_idx)
-
-        # Calculate pulsing radius
-        time_sec = pygame.time.get_ticks() / 1000.0
-        pulse_offset = math.sin(time_sec * self.pulse_speed) * self.pulse_amplitude
-        current_radius = max(1, int(self.base_radius + pulse_offset)) # Ensure radius > 0
-
-        if self.shape_type == "circle":
-            pygame.draw.circle(surface, fill_color, self.rect.center, current_radius)
-            if self.border_width > 0:
-                pygame.draw.circle(surface, border_color, self.rect.center, current_radius, self.border_width)
-        # Add other shape types if needed
+    def pulse_radius(self):
+        """Current whole-pixel radius of the pulsing core (one cached sprite per radius)."""
+        pulse_offset = math.sin(self.anim_timer * self.pulse_speed) * self.pulse_amplitude
+        return max(1, int(self.base_radius + pulse_offset)) # Ensure radius > 0
 
     def draw(self, surface):
-        """Deprecated draw using image - use draw_shape now."""
+        """Deprecated draw using image - drawn through ShapeSpriteCache now."""
         # surface.blit(self.image, self.rect)
         pass # Do nothing here
\ No newline at end of file
@@ -7,115 +7,145 @@ from .config import get_color, RED, GREEN # Keep old colors for health bar for n
 # --- Add animation constant ---
 ENEMY_BOB_SPEED = 8.0 # Radians per second
 ENEMY_BOB_AMOUNT = 2  # Pixels up/down
+ENEMY_BOB_FRAMES = 16 # Discrete steps per bob cycle (offsets are whole pixels anyway)
+ENEMY_BOB_OFFSETS = [int(round(math.sin(2 * math.pi * i / ENEMY_BOB_FRAMES) * ENEMY_BOB_AMOUNT))
+                     for i in range(ENEMY_BOB_FRAMES)]
 
 class Enemy(pygame.sprite.Sprite):
-    def __init__(self, enemy_data, path):
-        """Initializes an enemy sprite."""
+    """Thin sprite view over one slot of the WaveManager's EnemyStore.
+    Simulation state (position, progress, speed, health, slow timer, flags)
+    lives in the store's arrays; per-type data is the shared EnemyArchetype."""
+    def __init__(self, store):
+        """Creates an idle view on store. WaveManager calls setup() before use."""
         super().__init__()
-        self.path = path # Path needed for initial position
-        self.setup(enemy_data, path) # Call setup to initialize fully
-
-        # --- Remove old image creation ---
-        # self.image = pygame.Surface(self._size).convert_alpha()
-        # self.image.fill(self._color)
-        # self.rect = self.image.get_rect(center=self.pos)
-        # Instead, create rect based on size data for collision
-        self._size = self.enemy_data.get('size', (20, 20))
-        self.rect = pygame.Rect(0, 0, self._size[0], self._size[1])
-        self.anim_timer = pygame.time.get_ticks() / 1000.0
-        if self.path:
-            self.rect.center = self.pos
-        else:
-            self.rect.center = (0, 0)
-
-
-    def setup(self, enemy_data, path):
-         """Re-initializes an enemy from the pool."""
-         self.enemy_data = enemy_data # Store the data dict
-         self.name = enemy_data.get('name', 'Unknown Enemy')
-         self.max_health = enemy_data.get('health', 10)
-         self.health = float(self.max_health)
-         self.base_speed = enemy_data.get('speed', 50)
-         self.speed = float(self.base_speed)
-         self.reward = enemy_data.get('reward', 0)
-         self.slow_timer = 0.0
-
-         # Store shape info from data
-         self.shape_type = enemy_data.get("shape_type", "rect")
-         self.shape_points = enemy_data.get("shape_points", []) # For polygons
-         self.fill_color_idx = enemy_data.get("fill_color_idx", 6) # Default Red index
-         self.border_color_idx = enemy_data.get("border_color_idx", 1) # Default White index
-         self.border_width = enemy_data.get("border_width", 1)
-         self._size = enemy_data.get('size', (20, 20)) # Keep size for health bar and rect
-
+        self.store = store
+        self.slot = None     # Store slot while alive, None once released
+        self.pool = None     # WaveManager that pools this view
+        self.pool_key = None # Enemy type id (the view's free-list)
+        self._pos = pygame.Vector2(0, 0)
+        self._rect = pygame.Rect(0, 0, 0, 0)
+        self._synced_generation = -1 # Store generation _pos/_rect were refreshed at
+        self.archetype = None # EnemyArchetype of the current type; set by setup()
+
+
+    def setup(self, slot, archetype, path, spawn_time=0.0):
+         """Re-initializes an enemy from the pool on a freshly allocated store slot.
+         archetype is the type's compiled EnemyArchetype (shared, never copied);
+         spawn_time is the game clock time, used to phase the bob animation."""
+         self.slot = slot
+         self.archetype = archetype
+         self._rect.size = archetype.size
+
+         # Position is derived from a single scalar: distance travelled along the path
          self.path = path
-         self.current_waypoint_index = 0
-         if self.path:
-             self.pos = pygame.Vector2(self.path[0])
-             if len(self.path) > 1:
-                  self.target_waypoint = self.path[self.current_waypoint_index + 1]
-             else:
-                  self.target_waypoint = self.path[0]
-             self.rect = pygame.Rect(0, 0, self._size[0], self._size[1]) # Recreate rect
-             self.rect.center = self.pos
-         else:
-             self.pos = pygame.Vector2(0, 0)
-             self.target_waypoint = self.pos
-             self.current_waypoint_index = -1
-             self.rect = pygame.Rect(0, 0, self._size[0], self._size[1])
-             self.rect.center = self.pos
-
-         self.anim_timer = pygame.time.get_ticks() / 1000.0 # Reset timer on setup
-         self.is_active = True
-         self.reached_end = False
-
-         # --- Remove old image creation ---
-         # self.image = pygame.Surface(self._size).convert_alpha()
-         # self.image.fill(self._color)
-         # self.rect = self.image.get_rect(center=self.pos)
+         self.spawn_id = 0 # Set by WaveManager; stable spawn order for tie-breaking
+         self.store.spawn(self.slot, path.start, archetype.health, archetype.speed, spawn_time)
+         self._synced_generation = -1
+
+    # --- Per-type data, read from the archetype ---
+    @property
+    def name(self):
+        return self.archetype.name
+
+    @property
+    def max_health(self):
+        return self.archetype.health
+
+    @property
+    def reward(self):
+        return self.archetype.reward
+
+    @property
+    def enemy_data(self):
+        return self.archetype.data
+
+    # --- Views onto the store arrays ---
+    def _sync(self):
+        """Refreshes the cached Vector2/Rect if the store has moved enemies since."""
+        store = self.store
+        if self._synced_generation != store.generation and self.slot is not None:
+            self._pos.update(store.positions[self.slot])
+            self._rect.center = self._pos
+            self._synced_generation = store.generation
+
+    @property
+    def pos(self):
+        self._sync()
+        return self._pos
+
+    @property
+    def rect(self):
+        self._sync()
+        return self._rect
+
+    @property
+    def progress(self):
+        return float(self.store.progress[self.slot])
+
+    @property
+    def health(self):
+        return float(self.store.health[self.slot])
+
+    @health.setter
+    def health(self, value):
+        self.store.set_health(self.slot, value)
+
+    @property
+    def speed(self):
+        return float(self.store.speed[self.slot])
+
+    @speed.setter
+    def speed(self, value):
+        self.store.speed[self.slot] = value
+
+    @property
+    def base_speed(self):
+        return float(self.store.base_speed[self.slot])
+
+    @property
+    def slow_timer(self):
+        return float(self.store.slow_timer[self.slot])
+
+    @slow_timer.setter
+    def slow_timer(self, value):
+        self.store.slow_timer[self.slot] = value
+
+    @property
+    def anim_timer(self):
+        return float(self.store.anim_timer[self.slot])
+
+    @property
+    def is_active(self):
+        return self.slot is not None and bool(self.store.active[self.slot])
+
+    @is_active.setter
+    def is_active(self, value):
+        self.store.active[self.slot] = value
+
+    @property
+    def reached_end(self):
+        return self.slot is not None and bool(self.store.reached_end[self.slot])
+
+    @reached_end.setter
+    def reached_end(self, value):
+        self.store.reached_end[self.slot] = value
 
     def apply_slow(self, factor, duration):
         """Applies a slow effect if not already slowed more."""
-        current_factor = self.speed / self.base_speed if self.base_speed > 0 else 1.0
+        base_speed = self.base_speed
+        current_factor = self.speed / base_speed if base_speed > 0 else 1.0
         if factor < current_factor or self.slow_timer <= 0:
-             self.speed = self.base_speed * factor
+             self.speed = base_speed * factor
              self.slow_timer = duration
 
-    def update(self, dt):
-        """Updates enemy position, state, and effects."""
-        if not self.is_active: return
+    def remaining_distance(self):
+        """Path distance left before this enemy reaches the core."""
+        return self.path.total_length - self.progress
 
-        # --- Update animation timer ---
-        self.anim_timer += dt # Update based on dt
-
-        if self.slow_timer > 0:
-            self.slow_timer -= dt
-            if self.slow_timer <= 0:
-                self.speed = self.base_speed
-                self.slow_timer = 0
-
-        if not self.path or self.current_waypoint_index >= len(self.path) -1:
-            # Update rect position even if not moving along path anymore
-            self.rect.center = self.pos
-            return
-
-        target_pos = pygame.Vector2(self.target_waypoint)
-        direction = target_pos - self.pos
-        distance = direction.length()
-        move_dist = self.speed * dt if self.speed > 0 else 0
-
-        if distance <= move_dist:
-            self.pos = target_pos
-            self.current_waypoint_index += 1
-            if self.current_waypoint_index >= len(self.path) - 1:
-                self.reach_end()
-            else:
-                self.target_waypoint = self.path[self.current_waypoint_index + 1]
-        elif distance > 0:
-            direction.normalize_ip()
-            self.pos += direction * move_dist
-
-        self.rect.center = self.pos # Keep rect updated
+    def time_to_end(self):
+        """Seconds until this enemy leaks at its current speed (inf if stopped)."""
+        speed = self.speed
+        return self.remaining_distance() / speed if speed > 0 else float('inf')
 
     def take_damage(self, amount):
         """Reduces health and checks for death."""
@@ -130,83 +160,57 @@ class Enemy(pygame.sprite.Sprite):
         self.reached_end = False
         self.kill()
 
-    def reach_end(self):
-        """Handles reaching the end of the path."""
-        if self.is_active:
-            # print(f"{self.name} reached the end flag set.") # Quieter
-            self.is_active = False
-            self.reached_end = True
-
-    def draw_shape(self, surface):
-        """Draws the enemy's shape using pygame.draw."""
-        if not self.is_active: return
-
-        fill_color = get_color(self.fill_color_idx)
-        border_color = get_color(self.border_color_idx)
-
-        # --- Calculate Bobbing Offset ---
-        # Use the anim_timer which increments based on dt
-        bob_offset = math.sin(self.anim_timer * ENEMY_BOB_SPEED) * ENEMY_BOB_AMOUNT
-        # Apply offset to the base position for drawing
-        draw_center_x = int(self.pos.x)
-        draw_center_y = int(self.pos.y + bob_offset) # Add bob to Y
-
-        # --- Draw shape at the offset position ---
-        if self.shape_type == "rect":
-            shape_rect = pygame.Rect(0, 0, self._size[0], self._size[1])
-            shape_rect.center = (draw_center_x, draw_center_y) # Use draw position
-            pygame.draw.rect(surface, fill_color, shape_rect)
-            if self.border_width > 0:
-                pygame.draw.rect(surface, border_color, shape_rect, self.border_width)
-        elif self.shape_type == "circle":
-             radius = self._size[0] // 2
-             draw_center = (draw_center_x, draw_center_y) # Use draw position
-             pygame.draw.circle(surface, fill_color, draw_center, radius)
-             if self.border_width > 0:
-                 pygame.draw.circle(surface, border_color, draw_center, radius, self.border_width)
-        elif self.shape_type == "polygon":
-            # Translate relative points to absolute *draw* coordinates
-            abs_points = [(draw_center_x + p[0], draw_center_y + p[1]) for p in self.shape_points]
-            if len(abs_points) > 2:
-                pygame.draw.polygon(surface, fill_color, abs_points)
-                if self.border_width > 0:
-                    pygame.draw.polygon(surface, border_color, abs_points, self.border_width)
-            else: # Fallback
-                 # Use a rect centered at the draw position for fallback
-                 fallback_rect = pygame.Rect(0,0, self._size[0], self._size[1])
-                 fallback_rect.center = (draw_center_x, draw_center_y)
-                 pygame.draw.rect(surface, fill_color, fallback_rect)
-                 if self.border_width > 0:
-                      pygame.draw.rect(surface, border_color, fallback_rect, self.border_width)
-
-        # --- Health bar / Slow indicator positioning ---
-        # Base these off the *logical* rect position, not the bobbing one,
-        # otherwise they'll bob too, which might look weird.
-        self.draw_health_bar(surface)
-        self.draw_slow_indicator(surface)
-
-
-    def draw_health_bar(self, surface):
-         """Draws a simple health bar above the enemy."""
+    def kill(self):
+        """Removes the sprite from all groups, frees its store slot and
+        returns the view to its pool (once)."""
+        super().kill()
+        if self.slot is None: return
+        self.store.release(self.slot)
+        self.slot = None
+        if self.pool is not None:
+            self.pool.return_enemy_to_pool(self)
+
+    def bob_offset(self):
+        """Vertical draw offset (whole pixels) for the current bob frame."""
+        frame = int(self.anim_timer * ENEMY_BOB_SPEED / (2 * math.pi) * ENEMY_BOB_FRAMES)
+        return ENEMY_BOB_OFFSETS[frame % ENEMY_BOB_FRAMES]
+
+    def render_rect(self, render_pos):
+        """Copy of rect centred on an interpolated render position."""
+        rect = self.rect.copy()
+        rect.center = render_pos
+        return rect
+
+    # Body drawing lives in ShapeSpriteCache.enemy; only the dynamic bars are drawn here.
+    def draw_health_bar(self, surface, rect=None):
+         """Draws a simple health bar above the enemy (or above rect, if given).
+         Returns the number of draw calls made."""
          if self.is_active and self.health < self.max_health:
-             bar_width = self._size[0]
+             rect = rect or self.rect
+             bar_width = self.archetype.size[0]
              bar_height = 5
              fill_width = int(bar_width * (self.health / self.max_health))
              # Position bar relative to the *current* rect top
              health_bar_bg_rect = pygame.Rect(0, 0, bar_width, bar_height)
-             health_bar_bg_rect.midbottom = self.rect.midtop - pygame.Vector2(0, 3)
+             health_bar_bg_rect.midbottom = rect.midtop - pygame.Vector2(0, 3)
 
              pygame.draw.rect(surface, RED, health_bar_bg_rect) # Use fixed RED for background
              if fill_width > 0:
                  fill_rect = pygame.Rect(health_bar_bg_rect.left, health_bar_bg_rect.top, fill_width, bar_height)
                  pygame.draw.rect(surface, GREEN, fill_rect) # Use fixed GREEN for fill
+                 return 2
+             return 1
+         return 0
 
 
-    def draw_slow_indicator(self, surface):
-        """Draws slow indicator if slowed."""
+    def draw_slow_indicator(self, surface, rect=None):
+        """Draws slow indicator if slowed (next to rect, if given). Returns draw calls made."""
         if self.is_active and self.slow_timer > 0:
+            rect = rect or self.rect
             indicator_rect = pygame.Rect(0, 0, 8, 8)
             # Position relative to the *current* rect topright
-            indicator_rect.topleft = self.rect.topright + pygame.Vector2(2, -10)
+            indicator_rect.topleft = rect.topright + pygame.Vector2(2, -10)
             # Use a fixed color or a palette color? Let's use palette index 4 (Blue)
-            pygame.draw.rect(surface, get_color(4, (0, 150, 255)), indicator_rect)
\ No newline at end of file
+            pygame.draw.rect(surface, get_color(4, (0, 150, 255)), indicator_rect)
+            return 1
+        return 0
\ No newline at end of file
@@ -0,0 +1,525 @@
+# src/event_sim.py
+import os
+import sys
+import math
+import time
+import heapq
+import contextlib
+import pygame
+from .config import SCREEN_SIZE, STATE_PLAYING, STATE_GAME_OVER, STATE_VICTORY
+from .simulation import Simulation, simulate, DEFAULT_DT, DEFAULT_MAX_SIM_TIME
+from .towers import SlowTower
+from .projectiles import flight_time
+from .tower_manager import TIE_SLACK
+
+# Event kinds. At equal times they run in the fixed-step engine's update order:
+# spawns (waves), tower actions, enemy movement (slow expiry, leaks), then impacts.
+# Event time t is the fixed engine's state after t / dt steps, which is what its
+# towers see while acting in the following step.
+EV_SPAWN, EV_SLOW_PULSE, EV_TOWER_READY, EV_SLOW_EXPIRE, EV_LEAK, EV_IMPACT = range(6)
+RANGE_EPSILON = 1e-6 # Slack for range tests at a predicted range-entry time
+TICK_EPSILON = 1e-6  # Fraction of a step treated as float noise when snapping to the step grid
+TIE_EPSILON = 1e-6   # Squared distances closer than this count as a targeting tie
+INF = float('inf')
+
+def _on_step(t, dt=DEFAULT_DT):
+    """First step boundary at or after t: the fixed engine only acts on those."""
+    return math.ceil(t / dt - TICK_EPSILON) * dt
+
+def _countdown_span(duration, dt=DEFAULT_DT):
+    """How long a slow really lasts in the fixed engine. Its timer counts down
+    by dt in float and restores speed before the move of the step where it
+    reaches <= 0, so the slow covers one step less than the countdown."""
+    timer, steps = duration, 0
+    while timer > 0:
+        timer -= dt
+        steps += 1
+    return max(0, steps - 1) * dt
+
+class _Enemy:
+    """Analytic enemy: progress is linear in time between speed changes."""
+    __slots__ = ("spawn_id", "health", "reward", "base_speed", "speed", "factor",
+                 "p0", "t0", "half_w", "half_h", "alive", "token", "slowed")
+    def __init__(self, spawn_id, archetype, now):
+        self.spawn_id = spawn_id
+        self.health = archetype.health
+        self.reward = archetype.reward
+        self.base_speed = self.speed = archetype.speed
+        self.factor = 1.0
+        self.p0, self.t0 = 0.0, now
+        self.half_w, self.half_h = archetype.size[0] / 2, archetype.size[1] / 2
+        self.alive = True
+        self.token = 0 # Bumped on trajectory change; stale leak/expiry events are skipped
+        self.slowed = False
+
+    def progress(self, t):
+        return self.p0 + max(self.speed, 0.0) * (t - self.t0)
+
+    def rebase(self, t, speed):
+        """Changes speed at time t, keeping progress continuous."""
+        self.p0 = self.progress(t)
+        self.t0 = t
+        self.speed = speed
+        self.token += 1
+
+
+class _Tower:
+    __slots__ = ("tower", "pos", "range", "cooldown", "slow_span", "intervals", "idle", "wake", "token", "target",
+                 "damage", "projectile_speed", "projectile_half", "is_slow")
+    def __init__(self, tower, path):
+        self.tower = tower
+        self.pos = (float(tower.rect.centerx), float(tower.rect.centery))
+        self.range = tower.range
+        self.is_slow = isinstance(tower, SlowTower)
+        self.cooldown = tower.pulse_span if self.is_slow else tower.cooldown_span # Whole fixed steps
+        self.slow_span = _countdown_span(tower.slow_duration) if self.is_slow else 0.0
+        self.intervals = path.circle_intervals(self.pos, self.range)
+        self.idle = False # Waiting for an enemy to enter range
+        self.wake = INF   # When an idle tower is due to look again
+        self.target = None # Locked target, kept while alive and in range
+        self.token = 0
+        projectile = tower.archetype.projectile
+        self.damage = projectile.damage
+        self.projectile_speed = projectile.speed
+        self.projectile_half = projectile.half
+
+
+class _Projectile:
+    __slots__ = ("origin", "velocity", "t_fire", "t_end", "half", "damage", "token", "alive",
+                 "hit_time", "target", "reach")
+
+
+class EventSimulation:
+    """Discrete-event engine for headless analysis. Loads the level, towers and
+    wave schedule through a regular Simulation, then jumps from event to event
+    (spawn, range entry, cooldown expiry, slow pulse/expiry, projectile impact,
+    leak) instead of stepping every 1/60 s. Enemy motion along the path and
+    projectile flight are solved in closed form; towers act on the fixed
+    engine's step grid, so outcomes track it closely (see
+    tests/test_event_parity.py for how closely, and why not exactly).
+    target_lock=False re-picks the target for every shot, as in TowerManager."""
+    def __init__(self, level_id, placements=(), world_rect=None, max_sim_time=DEFAULT_MAX_SIM_TIME,
+                 target_lock=True):
+        if world_rect is None:
+            world_rect = pygame.Rect((0, 0), SCREEN_SIZE)
+        self.world_rect = pygame.Rect(world_rect)
+        self.max_sim_time = max_sim_time
+        self.target_lock = target_lock
+
+        sim = Simulation(self.world_rect, target_lock=target_lock)
+        if not sim.load_level(level_id):
+            raise ValueError(f"Level ID '{level_id}' could not be loaded.")
+        for tower_type_id, platform in placements:
+            sim.place_tower(tower_type_id, platform)
+        self.sim = sim
+        self.level_id = level_id
+        self.path = sim.wave_manager.path_table
+        self.enemy_types = sim.wave_manager.enemy_types
+
+        self.now = 0.0
+        self.events = []
+        self._seq = 0
+        self.enemies = []     # Alive _Enemy objects
+        self.projectiles = [] # In-flight _Projectile objects
+        self.towers = [_Tower(tower, self.path) for tower in sim.tower_group]
+        # Furthest an enemy box reaches from its centre, plus a projectile's: bounds which
+        # enemies can cross a flight (see _schedule_impact)
+        self.hit_reach = max((math.hypot(*archetype.size) / 2 for archetype in self.enemy_types.values()),
+                             default=0.0)
+        self.core_health = float(sim.wave_manager.core_starting_health) # Float, as Core keeps it
+        self.core_max = self.core_health
+        self.start_resources = sim.resource_manager.resources
+        self.rewards = 0
+        self.leaks = 0
+        self.kills = 0
+        self.spawns_left = 0
+        self.spawn_count = 0
+        self.event_count = 0
+        self.outcome = STATE_PLAYING
+
+    # --- Queue ---
+    def _push(self, t, kind, *payload):
+        self._seq += 1
+        heapq.heappush(self.events, (t, kind, self._seq, payload))
+
+    def _schedule_waves(self, dt=DEFAULT_DT):
+        """Expands the level's wave sequence into spawn events. The schedule
+        does not depend on play, so it is worked out up front by replaying
+        WaveManager.update's timer arithmetic tick by tick (cheap: no enemies).
+        A spawn in tick k has already moved one step by the end of that tick,
+        so its continuous spawn time is (k - 1) * dt."""
+        wave_manager = self.sim.wave_manager
+        sequence = wave_manager.wave_sequence
+        definitions = wave_manager.wave_definitions
+        wave_index, wave_active = -1, False
+        since_last_wave = wave_timer = 0.0
+        events, next_event, group = [], 0, None
+        tick = 0
+        while True:
+            tick += 1
+            if not wave_active:
+                since_last_wave += dt
+                if wave_index == -1 or since_last_wave >= wave_manager.time_between_waves:
+                    wave_index += 1
+                    events = sorted(definitions.get(sequence[wave_index], []), key=lambda e: e['time'])
+                    wave_active, wave_timer, next_event, group, since_last_wave = True, 0.0, 0, None, 0.0
+                else:
+                    continue
+            wave_timer += dt
+            if group:
+                enemy_type, remaining, interval, timer = group
+                timer -= dt
+                if timer <= 0 and remaining > 0:
+                    self._push((tick - 1) * dt, EV_SPAWN, enemy_type)
+                    self.spawns_left += 1
+                    remaining -= 1
+                    timer = interval
+                group = (enemy_type, remaining, interval, timer) if remaining > 0 else None
+            if next_event < len(events) and not group and wave_timer >= events[next_event]['time']:
+                event = events[next_event]
+                group = (event['enemy_type'], event['count'], event['interval'], 0.0)
+                next_event += 1
+            if next_event >= len(events) and not group:
+                wave_active, since_last_wave = False, 0.0
+                if wave_index >= len(sequence) - 1:
+                    return
+
+    # --- Geometry ---
+    def _position(self, enemy, t):
+        progress = min(enemy.progress(t), self.path.total_length)
+        return self.path.position_at(progress, self.path.segment_at(progress))
+
+    def _nearest_in_range(self, tower, t):
+        """Nearest alive enemy centre within range (ties: lowest spawn_id)."""
+        tx, ty = tower.pos
+        best, best_dist = None, INF
+        for enemy in self.enemies:
+            if not self._covers(tower, enemy.progress(t)):
+                continue
+            x, y = self._position(enemy, t)
+            dist = (x - tx) ** 2 + (y - ty) ** 2
+            # Distances equal up to float noise tie-break on spawn order, like PathProgressIndex.nearest
+            if best is None or dist < best_dist - TIE_EPSILON or (
+                    dist <= best_dist + TIE_EPSILON and enemy.spawn_id < best.spawn_id):
+                best, best_dist = enemy, dist
+        return best
+
+    def _pick_target(self, tower, t):
+        """Target by the tower's targeting strategy (see PathProgressIndex.select)."""
+        strategy = tower.tower.targeting
+        if strategy == "closest":
+            return self._nearest_in_range(tower, t)
+        in_range = [(enemy.progress(t), index, enemy) for index, enemy in enumerate(self.enemies)
+                    if self._covers(tower, enemy.progress(t))]
+        if not in_range:
+            return None
+        if strategy == "first":
+            return max(in_range, key=lambda entry: (entry[0], -entry[1]))[2]
+        if strategy == "last":
+            return min(in_range, key=lambda entry: (entry[0], entry[1]))[2]
+        sign = 1.0 if strategy == "strongest" else -1.0
+        return max(in_range, key=lambda entry: (sign * entry[2].health, entry[0], -entry[1]))[2]
+
+    def _covers(self, tower, progress):
+        """Progress lies on the path inside the tower's range (with float slack,
+        so an enemy counts as in range at its predicted entry time)."""
+        return any(start - RANGE_EPSILON <= progress <= end + RANGE_EPSILON for start, end in tower.intervals)
+
+    def _in_range(self, tower, t):
+        """Alive enemies whose centre is within the tower's range at time t."""
+        return [enemy for enemy in self.enemies if self._covers(tower, enemy.progress(t))]
+
+    def _enemy_entry_time(self, tower, enemy, t):
+        """Earliest time >= t the enemy is inside the tower's range at its
+        current speed (INF if it never gets there)."""
+        progress = enemy.progress(t)
+        for start, end in tower.intervals:
+            if end < progress:
+                continue
+            if start <= progress:
+                return t
+            return t + (start - progress) / enemy.speed if enemy.speed > 0 else INF
+        return INF
+
+    def _entry_time(self, tower, t):
+        """Earliest time >= t any alive enemy is inside the tower's range."""
+        earliest = INF
+        for enemy in self.enemies:
+            earliest = min(earliest, self._enemy_entry_time(tower, enemy, t))
+            if earliest == t:
+                break
+        return earliest
+
+    def _first_hit(self, projectile, t):
+        """(time, enemy) of the projectile's first overlap with an enemy box
+        after t, or (t_end, None) if it leaves the field / expires first."""
+        best_t, best = projectile.t_end, None
+        ox, oy = projectile.origin
+        vx, vy = projectile.velocity
+        elapsed = t - projectile.t_fire
+        origin = (ox + vx * elapsed, oy + vy * elapsed) # Where the projectile is at t
+        path = self.path
+        for enemy in self.enemies: # Spawn order
+            half = (projectile.half + enemy.half_w, projectile.half + enemy.half_h)
+            hit = path.box_intercept(enemy.progress(t), enemy.speed, origin, projectile.velocity,
+                                     half, best_t - t)
+            # As in AnalyticProjectiles._solve, hits within TIE_SLACK tie and the earlier spawn keeps it
+            if hit is not None and (best is None or t + hit < best_t - TIE_SLACK):
+                best_t, best = t + hit, enemy
+        return best_t, best
+
+    # --- Scheduling on world changes ---
+    def _schedule_tower_wake(self, tower, wake=None):
+        """Queues an idle tower to look again when the first enemy can be in
+        range (on the step grid: the fixed engine only acts on whole steps)."""
+        tower.token += 1
+        if wake is None:
+            wake = self._entry_time(tower, self.now)
+        tower.wake = _on_step(wake) if wake < INF else INF
+        if tower.wake < INF:
+            self._push(tower.wake, EV_TOWER_READY, tower, tower.token)
+
+    def _schedule_impact(self, projectile):
+        """Predicts the projectile's first hit and remembers which stretch of
+        path its flight up to then sweeps: only enemies on it can change that."""
+        projectile.token += 1
+        hit_time, enemy = self._first_hit(projectile, self.now)
+        projectile.hit_time, projectile.target = hit_time, enemy
+        # A circle around the rest of the flight, widened by the box sizes, holds every
+        # enemy centre that can touch the projectile before hit_time
+        ox, oy = projectile.origin
+        vx, vy = projectile.velocity
+        mid = (hit_time + self.now) / 2 - projectile.t_fire
+        half_flight = math.hypot(vx, vy) * (hit_time - self.now) / 2
+        projectile.reach = self.path.circle_intervals(
+            (ox + vx * mid, oy + vy * mid), half_flight + projectile.half * math.sqrt(2) + self.hit_reach)
+        self._push(hit_time, EV_IMPACT, projectile, projectile.token, enemy)
+
+    def _can_cross(self, projectile, enemy):
+        """The enemy, at its current speed, passes through the stretch of path
+        the projectile sweeps before its predicted hit."""
+        start = enemy.progress(self.now)
+        end = start + max(enemy.speed, 0.0) * (projectile.hit_time - self.now)
+        return any(low <= end and start <= high for low, high in projectile.reach)
+
+    def _world_changed(self, enemy, removed=False):
+        """enemy appeared, changed speed or (removed) vanished: re-predict only
+        what it can affect. Idle towers whose coverage it can still reach may
+        wake earlier; projectiles aimed at it, or whose swept path it can now
+        cross, need a new first hit. A removal only matters to projectiles
+        that were going to hit it (an idle tower that wakes early for an
+        enemy that is gone just finds nothing and sleeps again)."""
+        now = self.now
+        if not removed:
+            for tower in self.towers:
+                if tower.idle and tower.intervals:
+                    wake = self._enemy_entry_time(tower, enemy, now)
+                    if wake < INF and _on_step(wake) < tower.wake:
+                        self._schedule_tower_wake(tower, wake)
+        for projectile in self.projectiles:
+            if projectile.target is enemy or (not removed and self._can_cross(projectile, enemy)):
+                self._schedule_impact(projectile)
+
+    def _schedule_enemy(self, enemy):
+        """(Re)schedules an enemy's leak and slow-expiry events."""
+        if enemy.speed > 0:
+            leak_time = enemy.t0 + (self.path.total_length - enemy.p0) / enemy.speed
+            self._push(leak_time, EV_LEAK, enemy, enemy.token)
+
+    def _remove_enemy(self, enemy):
+        enemy.alive = False
+        enemy.token += 1
+        self.enemies.remove(enemy)
+
+    # --- Event handlers ---
+    def _on_spawn(self, enemy_type):
+        self.spawns_left -= 1
+        archetype = self.enemy_types.get(enemy_type)
+        if archetype is None:
+            return
+        enemy = _Enemy(self.spawn_count, archetype, self.now)
+        self.spawn_count += 1
+        self.enemies.append(enemy)
+        self._schedule_enemy(enemy)
+        self._world_changed(enemy)
+
+    def _on_tower_ready(self, tower):
+        target = tower.target
+        if (not self.target_lock or target is None or not target.alive
+                or not self._covers(tower, target.progress(self.now))):
+            target = tower.target = self._pick_target(tower, self.now)
+        if target is None:
+            tower.idle = True
+            self._schedule_tower_wake(tower)
+            return
+        tower.idle = False
+        tower.token += 1
+        self._fire(tower, target)
+        self._push(self.now + tower.cooldown, EV_TOWER_READY, tower, tower.token)
+
+    def _fire(self, tower, target):
+        tx, ty = tower.pos
+        # Aim where the fixed engine aims: the target's Rect centre (rounded half up to whole pixels)
+        ex, ey = (math.floor(value + 0.5) for value in self._position(target, self.now))
+        length = math.hypot(ex - tx, ey - ty)
+        direction = ((ex - tx) / length, (ey - ty) / length) if length > 0 else (0.0, -1.0)
+        projectile = _Projectile()
+        projectile.origin = tower.pos
+        projectile.velocity = (direction[0] * tower.projectile_speed, direction[1] * tower.projectile_speed)
+        projectile.t_fire = self.now
+        projectile.t_end = self.now + flight_time(tower.pos, projectile.velocity, tower.projectile_half, self.world_rect)
+        projectile.half = tower.projectile_half
+        projectile.damage = tower.damage
+        projectile.token = 0
+        projectile.alive = True
+        self.projectiles.append(projectile)
+        self._schedule_impact(projectile)
+
+    def _on_slow_pulse(self, tower):
+        tower_obj = tower.tower
+        changed = []
+        for enemy in self._in_range(tower, self.now):
+            # Same rule as Enemy.apply_slow: only a stronger slow or an unslowed enemy is affected
+            if tower_obj.slow_factor < enemy.factor or not enemy.slowed:
+                enemy.rebase(self.now, enemy.base_speed * tower_obj.slow_factor)
+                enemy.factor = tower_obj.slow_factor
+                enemy.slowed = True
+                self._schedule_enemy(enemy)
+                self._push(self.now + tower.slow_span, EV_SLOW_EXPIRE, enemy, enemy.token)
+                changed.append(enemy)
+        self._push(self.now + tower.cooldown, EV_SLOW_PULSE, tower)
+        for enemy in changed:
+            self._world_changed(enemy)
+
+    def _on_slow_expire(self, enemy):
+        enemy.rebase(self.now, enemy.base_speed)
+        enemy.factor = 1.0
+        enemy.slowed = False
+        self._schedule_enemy(enemy)
+        self._world_changed(enemy)
+
+    def _on_leak(self, enemy):
+        self._remove_enemy(enemy)
+        self.leaks += 1
+        if self.core_health > 0:
+            self.core_health = max(0.0, self.core_health - 1)
+        self._world_changed(enemy, removed=True)
+
+    def _on_impact(self, projectile, enemy):
+        projectile.alive = False
+        self.projectiles.remove(projectile)
+        if enemy is None or not enemy.alive:
+            return
+        enemy.health -= projectile.damage
+        if enemy.health <= 0:
+            self._remove_enemy(enemy)
+            self.kills += 1
+            self.rewards += enemy.reward
+            self._world_changed(enemy, removed=True)
+
+    def _finish_step_leaks(self):
+        """The fixed engine removes every enemy that reaches the end during a
+        step together, so leaks due later in the step that ended the game
+        still count."""
+        step = _on_step(self.now)
+        events = self.events
+        while events and _on_step(events[0][0]) <= step:
+            _, kind, _, payload = heapq.heappop(events)
+            if kind == EV_LEAK and payload[0].alive and payload[1] == payload[0].token:
+                self._on_leak(payload[0])
+
+    # --- Main loop ---
+    def run(self):
+        """Processes events until the level is won or lost (or max_sim_time)."""
+        if self.sim.wave_manager.wave_sequence:
+            self._schedule_waves()
+        for tower in self.towers:
+            # Placed at time 0, a fixed-engine tower first acts on the step that ends at
+            # its cooldown, i.e. it sees the world as of one step earlier
+            first = tower.cooldown - DEFAULT_DT
+            if tower.is_slow:
+                self._push(first, EV_SLOW_PULSE, tower)
+            else:
+                self._push(first, EV_TOWER_READY, tower, tower.token)
+
+        events = self.events
+        while events:
+            t, kind, _, payload = heapq.heappop(events)
+            if t > self.max_sim_time:
+                self.now = self.max_sim_time
+                break
+            if kind == EV_TOWER_READY:
+                if payload[1] != payload[0].token:
+                    continue # Superseded by a newer prediction
+            elif kind in (EV_LEAK, EV_SLOW_EXPIRE):
+                enemy = payload[0]
+                if not enemy.alive or payload[1] != enemy.token:
+                    continue
+            elif kind == EV_IMPACT:
+                projectile = payload[0]
+                if not projectile.alive or payload[1] != projectile.token:
+                    continue
+
+            self.now = t
+            self.event_count += 1
+            if kind == EV_SPAWN: self._on_spawn(payload[0])
+            elif kind == EV_TOWER_READY: self._on_tower_ready(payload[0])
+            elif kind == EV_SLOW_PULSE: self._on_slow_pulse(payload[0])
+            elif kind == EV_SLOW_EXPIRE: self._on_slow_expire(payload[0])
+            elif kind == EV_LEAK: self._on_leak(payload[0])
+            elif kind == EV_IMPACT: self._on_impact(payload[0], payload[2])
+
+            if self.core_health <= 0:
+                self.outcome = STATE_GAME_OVER
+                self._finish_step_leaks()
+                break
+            if self.spawns_left == 0 and not self.enemies:
+                self.outcome = STATE_VICTORY
+                break
+        return self.get_result()
+
+    def get_result(self):
+        """Same keys as Simulation.get_result, plus the number of events processed."""
+        passive_income = int(self.now) * self.sim.resource_manager.passive_income_rate
+        return {
+            "level_id": self.level_id,
+            "outcome": self.outcome,
+            "ticks": int(round(self.now / DEFAULT_DT)), # Fixed-step equivalent
+            "sim_time": self.now,
+            "core_health": self.core_health,
+            "core_damage_taken": self.core_max - self.core_health,
+            "leaks": self.leaks,
+            "kills": self.kills,
+            "resources": self.start_resources + self.rewards + passive_income,
+            "towers": len(self.towers),
+            "events": self.event_count,
+        }
+
+
+def simulate_events(level_id, placements=(), max_sim_time=DEFAULT_MAX_SIM_TIME, world_rect=None, quiet=True,
+                    target_lock=True):
+    """Event-driven counterpart of simulation.simulate(); returns its result dict."""
+    with open(os.devnull, 'w') as devnull, \
+         (contextlib.redirect_stdout(devnull) if quiet else contextlib.nullcontext()):
+        start = time.perf_counter()
+        engine = EventSimulation(level_id, placements, world_rect, max_sim_time, target_lock)
+        result = engine.run()
+        result["wall_time"] = time.perf_counter() - start
+    return result
+
+
+if __name__ == '__main__':
+    # Example: python -m src.event_sim level2 gun_tower:0 gun_tower:1 cannon_tower:5 --compare
+    args = [arg for arg in sys.argv[1:] if arg != "--compare"]
+    level = args[0] if args else "level1"
+    towers = []
+    for arg in args[1:]:
+        tower_id, _, index = arg.partition(":")
+        towers.append((tower_id, int(index)))
+    event_result = simulate_events(level, towers)
+    print("event-driven:", event_result)
+    if "--compare" in sys.argv:
+        fixed_result = simulate(level, towers)
+        fixed_result.pop("pool_stats", None)
+        print("fixed-step:  ", fixed_result)
+        print(f"speedup: {fixed_result['wall_time'] / event_result['wall_time']:.1f}x")
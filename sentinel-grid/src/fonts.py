@@ -0,0 +1,25 @@
+# src/fonts.py
+from functools import lru_cache
+import pygame
+
+# UI font sizes (pygame's default font)
+FONT_TINY = 18
+FONT_SMALL = 24
+FONT_MEDIUM = 36
+FONT_LARGE = 72
+FONT_XL = 96
+MONO_FONT = "monospace" # Profiler overlay (system font, looked up on first use)
+
+@lru_cache(maxsize=None)
+def get_font(size, name=None):
+    """Font for (size, name), created on first use and shared afterwards.
+    name=None is pygame's bundled default font, opened directly: going through
+    SysFont would first scan the installed system fonts (fc-list), which
+    dominates startup on some machines."""
+    if name is None:
+        return pygame.font.Font(None, size)
+    return pygame.font.SysFont(name, size)
+
+def clear_fonts():
+    """Drops every cached font (call after pygame.font.quit())."""
+    get_font.cache_clear()
@@ -77,14 +77,18 @@ class GameManager:
         self.game_state = new_state
         # TODO: Pause/unpause audio streams here later if needed
 
+    def toggle_pause(self):
+        """Pauses while playing, resumes while paused; ignored in end states."""
+        if self.game_state == STATE_PLAYING:
+            self.set_state(STATE_PAUSED)
+        elif self.game_state == STATE_PAUSED:
+            self.set_state(STATE_PLAYING)
+
     def handle_input(self, event):
         """Handles global input relevant to game state (e.g., Pause)."""
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_p:
-                if self.game_state == STATE_PLAYING:
-                    self.set_state(STATE_PAUSED)
-                elif self.game_state == STATE_PAUSED:
-                    self.set_state(STATE_PLAYING)
+                self.toggle_pause()
             # Restart (R) and Next Level (N) are handled in main.py's event loop
             # based on the current state, which then calls Game methods.
 
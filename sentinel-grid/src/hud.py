@@ -0,0 +1,30 @@
+# src/hud.py
+from .config import get_palette_version
+
+class HudWidget:
+    """One retained piece of the HUD, bound to a game value.
+
+    source() is called every frame and should only read attributes (the
+    bound value, e.g. the resource count). render(value) builds the widget's
+    blits as [(surface, dest), ...]; it runs only when that value or the
+    palette changed, so an unchanged widget costs one screen.blits of
+    cached surfaces."""
+    def __init__(self, name, source, render):
+        self.name = name
+        self.source = source
+        self.render = render
+        self.blits = []  # Cached [(surface, dest), ...]
+        self._key = None # (value, palette version) the blits were built for
+        self.renders = 0 # Times render() ran (profiling/debugging)
+
+    def invalidate(self):
+        """Forces a re-render next frame (layout changed)."""
+        self._key = None
+
+    def draw(self, screen):
+        key = (self.source(), get_palette_version())
+        if key != self._key:
+            self.blits = self.render(key[0])
+            self._key = key
+            self.renders += 1
+        screen.blits(self.blits, False)
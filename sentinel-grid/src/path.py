@@ -0,0 +1,142 @@
+# src/path.py
+import math
+from .spatial_hash import SpatialHashGrid
+
+GRID_MIN_SEGMENTS = 32 # Shorter paths are scanned directly (a grid query costs about 30 segment tests)
+
+class PathTable:
+    """Arc-length table for a waypoint polyline, built once per level.
+    Positions along the path are looked up from a scalar distance travelled."""
+    def __init__(self, waypoints):
+        self.waypoints = [(float(p[0]), float(p[1])) for p in waypoints]
+        self.cumulative_lengths = [0.0] # Distance from the start to each waypoint
+        self.directions = []            # Unit direction of each segment
+        self.segment_lengths = []
+
+        for (x0, y0), (x1, y1) in zip(self.waypoints, self.waypoints[1:]):
+            length = math.hypot(x1 - x0, y1 - y0)
+            if length > 0:
+                self.directions.append(((x1 - x0) / length, (y1 - y0) / length))
+            else:
+                self.directions.append((0.0, 0.0)) # Duplicate waypoint, zero-length segment
+            self.segment_lengths.append(length)
+            self.cumulative_lengths.append(self.cumulative_lengths[-1] + length)
+
+        self.segment_count = len(self.segment_lengths)
+        self.total_length = self.cumulative_lengths[-1]
+
+        # Long paths file their segments by grid cell, so circle_intervals only measures nearby ones
+        self.segment_grid = None
+        if self.segment_count >= GRID_MIN_SEGMENTS:
+            self.segment_grid = SpatialHashGrid()
+            for segment, ((x0, y0), (x1, y1)) in enumerate(zip(self.waypoints, self.waypoints[1:])):
+                self.segment_grid.insert(segment, min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1))
+
+    @property
+    def start(self):
+        """First waypoint, or the origin for an empty path."""
+        return self.waypoints[0] if self.waypoints else (0.0, 0.0)
+
+    @property
+    def end(self):
+        """Last waypoint, or the origin for an empty path."""
+        return self.waypoints[-1] if self.waypoints else (0.0, 0.0)
+
+    def segment_at(self, distance, hint=0):
+        """Index of the segment containing distance. Enemies only move forward,
+        so passing their previous segment as hint makes this O(1) amortized."""
+        cumulative = self.cumulative_lengths
+        segment = hint
+        last = self.segment_count - 1
+        while segment < last and distance > cumulative[segment + 1]:
+            segment += 1
+        return segment
+
+    def position_at(self, distance, segment):
+        """(x, y) at distance along the path, within the given segment."""
+        if self.segment_count == 0:
+            return self.start
+        if distance >= self.total_length:
+            return self.end
+        x0, y0 = self.waypoints[segment]
+        dx, dy = self.directions[segment]
+        along = distance - self.cumulative_lengths[segment]
+        return x0 + dx * along, y0 + dy * along
+
+    def circle_intervals(self, center, radius):
+        """Sorted, merged (start, end) path-distance intervals whose points lie
+        within radius of center. Lets range checks against path-bound enemies
+        become 1D comparisons on their progress."""
+        cx, cy = center
+        r2 = radius * radius
+        intervals = []
+        grid = self.segment_grid
+        segments = grid.query_circle(center, radius) if grid else range(self.segment_count) # In path order
+        for segment in segments:
+            length = self.segment_lengths[segment]
+            x0, y0 = self.waypoints[segment]
+            fx, fy = x0 - cx, y0 - cy
+            base = self.cumulative_lengths[segment]
+            if length == 0:
+                if fx * fx + fy * fy <= r2:
+                    intervals.append((base, base))
+                continue
+            dx, dy = self.directions[segment]
+            # |f + d*s|^2 <= r^2  ->  s^2 + 2(f.d)s + |f|^2 - r^2 <= 0 (d is a unit vector)
+            b = fx * dx + fy * dy
+            c = fx * fx + fy * fy - r2
+            disc = b * b - c
+            if disc < 0:
+                continue
+            root = math.sqrt(disc)
+            s0, s1 = max(0.0, -b - root), min(length, -b + root)
+            if s0 <= s1:
+                intervals.append((base + s0, base + s1))
+        merged = []
+        for start, end in intervals:
+            if merged and start <= merged[-1][1] + 1e-9:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            else:
+                merged.append((start, end))
+        return merged
+
+    def box_intercept(self, progress, speed, origin, velocity, half_size, t_limit):
+        """Earliest time in [0, t_limit) at which a box leaving origin at a
+        constant velocity overlaps a box moving along the path from progress at
+        speed. half_size is the two boxes' summed (x, y) half extents. Returns
+        None if they do not meet before t_limit (or the end of the path)."""
+        ox, oy = origin
+        vx, vy = velocity
+        hx, hy = half_size
+        speed = max(speed, 0.0)
+        if speed > 0:
+            t_limit = min(t_limit, (self.total_length - progress) / speed)
+        cumulative = self.cumulative_lengths
+        segment = self.segment_at(progress)
+        while segment < self.segment_count:
+            c0, c1 = cumulative[segment], cumulative[segment + 1]
+            t_in = max(0.0, c0 - progress) / speed if speed > 0 else 0.0
+            if t_in >= t_limit:
+                break
+            t_out = min((c1 - progress) / speed, t_limit) if speed > 0 else t_limit
+            # Relative position (projectile - enemy) is r0 + w*t while on this segment
+            wx, wy = self.waypoints[segment]
+            dx, dy = self.directions[segment]
+            along = progress - c0
+            lo, hi = t_in, t_out
+            for r0, w, h in ((ox - wx - dx * along, vx - dx * speed, hx),
+                             (oy - wy - dy * along, vy - dy * speed, hy)):
+                if w == 0:
+                    if abs(r0) >= h:
+                        hi = lo # Never overlaps on this axis
+                else:
+                    a, b = (-h - r0) / w, (h - r0) / w
+                    if a > b:
+                        a, b = b, a
+                    lo, hi = max(lo, a), min(hi, b)
+            if lo < hi:
+                return lo
+            if speed == 0:
+                break # Standing still: later segments are never reached
+            segment += 1
+        return None
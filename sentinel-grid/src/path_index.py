@@ -0,0 +1,338 @@
+# src/path_index.py
+from bisect import bisect_left, bisect_right
+import numpy as np
+
+# Targeting strategies a tower can use ("targeting" in towers.json)
+TARGETING_STRATEGIES = ("closest", "first", "last", "strongest", "weakest")
+DEFAULT_TARGETING = "closest"
+INF = float('inf')
+RESORT_FRACTION = 32 # Re-sort outright when more than 1/32 of the enemies are out of order
+
+class PathProgressIndex:
+    """Active enemies sorted by distance travelled along the path. Enemies
+    never leave the path, so a tower's range is fully described by the
+    path-distance intervals inside its circle (PathTable.circle_intervals,
+    computed when the tower is placed); "enemies in range" is then one bisect
+    pair per interval instead of 2D distance checks, and first/last in range
+    are the ends of those slices.
+
+    The order is kept between ticks and maintained incrementally: the
+    EnemyStore reports spawns (add), releases (remove) and health changes
+    (health_changed) as they happen, and refresh() re-reads progress once per
+    tick and repairs the order with an insertion sort. Enemies only pass each
+    other when speeds differ (slows, faster types), so the order is nearly
+    sorted and that pass is near-linear; an already sorted order is a single
+    vectorized check. A crowd with many crossings is re-sorted in one stable
+    numpy sort instead (RESORT_FRACTION).
+
+    Health-based strategies use segment trees of max/min health over the
+    same order, so the strongest/weakest enemy inside an interval is an
+    O(log n) range query. Damage and reorders update them in place (O(log n)
+    per change); they are only rebuilt, vectorized, after the set of enemies
+    changed (a spawn or a removal shifts every later position)."""
+    def __init__(self):
+        self.progress = []  # Sorted progress of every active enemy
+        self.enemies = []   # Enemy views, parallel to progress
+        self.slots = []     # Their EnemyStore slots, parallel to progress
+        self._order = np.zeros(0, dtype=np.intp) # The same slots as an array, for vectorized reads
+        self.positions = [] # The store's per-slot (x, y) list for this tick
+        self.store = None
+        self._rank = np.full(0, -1) # slot -> index in slots (-1: not in the order)
+        self._added = set()   # Slots spawned since the last refresh (not yet in the order)
+        self._removed = set() # Slots released since the last refresh (still in the order)
+        self._placed = set()  # Slots put down mid-path since the last refresh
+        self.placed = []      # Their progress, as of the last refresh (TowerManager wakes towers for them)
+        self._tree_size = 0
+        self._max_tree = None # Built lazily by _health_trees(), then updated in place
+        self._min_tree = None
+
+    # --- Notifications from the EnemyStore ---
+    def add(self, slot):
+        """A slot was spawned; it joins the order on the next refresh()."""
+        self._added.add(slot)
+
+    def remove(self, slot):
+        """A slot was released (death, leak or level reset)."""
+        if slot in self._added: # Spawned and released before it was ever ordered
+            self._added.discard(slot)
+            return
+        rank = int(self._rank[slot]) if slot < len(self._rank) else -1
+        if rank >= 0:
+            self._rank[slot] = -1
+            self._removed.add(slot)
+            self._set_leaf(rank, None) # Drop out of strongest/weakest right away
+
+    def moved(self, slot):
+        """A slot was placed at an arbitrary progress (mid-path spawn or teleport)
+        instead of moving forward from where it was."""
+        self._placed.add(slot)
+
+    def health_changed(self, slot, health):
+        """Point update of the health trees for a slot in the order."""
+        rank = int(self._rank[slot]) if slot < len(self._rank) else -1
+        if rank >= 0:
+            self._set_leaf(rank, health)
+
+    # --- Per-tick maintenance ---
+    def refresh(self, store, views):
+        """Applies pending spawns/releases and re-sorts by the store's current
+        progress (ties in slot order). views maps slot -> Enemy."""
+        self.store = store
+        self.positions = store.positions
+        if self._placed:
+            self.placed = [float(store.progress[slot]) for slot in self._placed if store.active[slot]]
+            self._placed.clear()
+        elif self.placed:
+            self.placed = []
+        if len(self._rank) != len(store.active): # The store grew, or trim() dropped free slots
+            rank = np.full(len(store.active), -1)
+            rank[:len(self._rank)] = self._rank[:len(rank)]
+            self._rank = rank
+            self._order = self._order[self._order < len(rank)] # Only released slots are cut off
+        order, slots = self._order, self.slots
+        rank_all = False
+        if self._removed or self._added:
+            if self._removed:
+                order = order[self._rank[order] >= 0] # remove() already unranked them
+                self._removed.clear()
+            added = sorted(slot for slot in self._added if store.active[slot])
+            self._added.clear()
+            if added:
+                order = np.concatenate((order, added)) # Placed by the sort below
+            slots = order.tolist()
+            self._max_tree = self._min_tree = None # Positions shifted: rebuild on next use
+            rank_all = True
+        if not slots:
+            self._order = order[:0]
+            self.slots, self.progress, self.enemies = [], [], []
+            self._rank.fill(-1)
+            return
+        values = store.progress[order]
+        moved = []
+        candidates = ()
+        if len(slots) > 1:
+            # Only entries below the running max of everything before them are out of place
+            # (<= also catches equal progress, ordered by slot)
+            candidates = np.flatnonzero(values[1:] <= np.maximum.accumulate(values)[:-1]) + 1
+        if len(candidates) * RESORT_FRACTION > len(slots):
+            # Many crossings (a crowd of mixed speeds): one vectorized sort beats inserting each.
+            # A stable sort of nearly sorted keys is close to linear; exact ties fall back to lexsort
+            resort = np.argsort(values, kind="stable")
+            ordered = values[resort]
+            ties = np.flatnonzero(ordered[1:] == ordered[:-1])
+            if len(ties) and np.any(order[resort[ties]] > order[resort[ties + 1]]):
+                resort = np.lexsort((order, values))
+            order = order[resort]
+            slots, progress = order.tolist(), values[resort].tolist()
+            self._max_tree = self._min_tree = None
+            rank_all = True
+        else:
+            progress = values.tolist()
+            if len(candidates):
+                moved = self._insertion_sort(progress, slots, candidates.tolist())
+                for lo, hi in moved:
+                    order[lo:hi] = slots[lo:hi]
+        self._order, self.slots, self.progress = order, slots, progress
+        if rank_all:
+            self.enemies = [views[slot] for slot in slots]
+            self._rank[order] = np.arange(len(slots))
+        elif moved:
+            enemies, rank = self.enemies, self._rank
+            if sum(hi - lo for lo, hi in moved) * 4 > len(slots):
+                self._max_tree = self._min_tree = None # Cheaper to rebuild (vectorized) on next use
+            health = store.health
+            for lo, hi in moved:
+                span = slots[lo:hi]
+                enemies[lo:hi] = [views[slot] for slot in span]
+                rank[span] = np.arange(lo, hi)
+                if self._max_tree is not None:
+                    for index, slot in enumerate(span, lo):
+                        self._set_leaf(index, float(health[slot]))
+
+    @staticmethod
+    def _insertion_sort(progress, slots, candidates):
+        """Sorts progress (and slots with it) by (progress, slot) in place,
+        inserting only the candidate indexes (ascending; every other entry is
+        already in order behind its predecessors). Returns the changed index
+        spans as merged, ascending (lo, hi) pairs."""
+        spans = []
+        for i in candidates:
+            value, slot = progress[i], slots[i]
+            j = i
+            while j > 0 and (progress[j - 1] > value or (progress[j - 1] == value and slots[j - 1] > slot)):
+                progress[j] = progress[j - 1]
+                slots[j] = slots[j - 1]
+                j -= 1
+            if j != i:
+                progress[j] = value
+                slots[j] = slot
+                # Later candidates sit further right, so only the last span can overlap
+                while spans and spans[-1][1] >= j:
+                    j = min(j, spans.pop()[0])
+                spans.append((j, i + 1))
+        return spans
+
+    def _ranges(self, intervals):
+        """(lo, hi) index slices of the enemies inside each interval."""
+        progress = self.progress
+        for start, end in intervals:
+            lo = bisect_left(progress, start)
+            hi = bisect_right(progress, end, lo)
+            if lo < hi:
+                yield lo, hi
+
+    def in_intervals(self, intervals):
+        """All active enemies whose progress lies in one of the intervals."""
+        enemies = self.enemies
+        found = []
+        for lo, hi in self._ranges(intervals):
+            found.extend(enemies[lo:hi])
+        return found
+
+    def nearest(self, center, intervals):
+        """The enemy in the intervals closest to center, or None.
+        Equal distances resolve to the lowest spawn_id."""
+        cx, cy = center[0], center[1]
+        enemies, slots, positions = self.enemies, self.slots, self.positions
+        best = None
+        best_dist_sq = 0.0
+        for lo, hi in self._ranges(intervals):
+            for index in range(lo, hi):
+                x, y = positions[slots[index]]
+                dx = x - cx
+                dy = y - cy
+                dist_sq = dx * dx + dy * dy
+                if best is None or dist_sq < best_dist_sq or (
+                        dist_sq == best_dist_sq and enemies[index].spawn_id < best.spawn_id):
+                    best = enemies[index]
+                    best_dist_sq = dist_sq
+        return best
+
+    def first(self, intervals):
+        """The enemy furthest along the path within the intervals, or None."""
+        progress = self.progress
+        for start, end in reversed(intervals):
+            hi = bisect_right(progress, end)
+            if hi and progress[hi - 1] >= start:
+                return self.enemies[hi - 1]
+        return None
+
+    def last(self, intervals):
+        """The enemy least far along the path within the intervals, or None."""
+        progress = self.progress
+        for start, end in intervals:
+            lo = bisect_left(progress, start)
+            if lo < len(progress) and progress[lo] <= end:
+                return self.enemies[lo]
+        return None
+
+    def _health_trees(self):
+        """(size, max_tree, min_tree): implicit binary trees with leaves at
+        size + i, built bottom-up one level per numpy operation."""
+        if self._max_tree is None:
+            count = len(self.slots)
+            size = 1 << max(0, (count - 1).bit_length())
+            maxs = np.full(2 * size, -np.inf)
+            mins = np.full(2 * size, np.inf)
+            if count:
+                health = self.store.health[self._order]
+                maxs[size:size + count] = health
+                mins[size:size + count] = health
+            level = size
+            while level > 1:
+                half = level // 2
+                maxs[half:level] = np.maximum(maxs[level:2 * level:2], maxs[level + 1:2 * level:2])
+                mins[half:level] = np.minimum(mins[level:2 * level:2], mins[level + 1:2 * level:2])
+                level = half
+            self._tree_size = size
+            self._max_tree, self._min_tree = maxs.tolist(), mins.tolist()
+        return self._tree_size, self._max_tree, self._min_tree
+
+    def _set_leaf(self, index, health):
+        """Sets one leaf (None: empty) and fixes its ancestors, if the trees exist."""
+        maxs, mins = self._max_tree, self._min_tree
+        if maxs is None:
+            return
+        node = self._tree_size + index
+        maxs[node] = -INF if health is None else health
+        mins[node] = INF if health is None else health
+        node //= 2
+        while node:
+            left = 2 * node
+            maxs[node] = max(maxs[left], maxs[left + 1])
+            mins[node] = min(mins[left], mins[left + 1])
+            node //= 2
+
+    def _extreme(self, intervals, strongest):
+        """Index of the highest (strongest) or lowest health enemy in the
+        intervals; ties go to the one furthest along the path."""
+        size, max_tree, min_tree = self._health_trees()
+        tree = max_tree if strongest else min_tree
+        sign = 1.0 if strongest else -1.0 # Compare sign * health, larger is better
+        best_value, best_node = None, None
+        for lo, hi in self._ranges(intervals):
+            left, right = lo + size, hi + size
+            nodes = []
+            while left < right: # Canonical cover of [lo, hi)
+                if left & 1:
+                    nodes.append(left)
+                    left += 1
+                if right & 1:
+                    right -= 1
+                    nodes.append(right)
+                left //= 2
+                right //= 2
+            for node in nodes:
+                value = sign * tree[node]
+                if best_value is None or value > best_value or (
+                        value == best_value and self._leaf_start(node, size) > self._leaf_start(best_node, size)):
+                    best_value, best_node = value, node
+        if best_node is None:
+            return None
+        node = best_node
+        while node < size: # Descend to the leaf holding the extreme, preferring the right child
+            right_child = 2 * node + 1
+            node = right_child if tree[right_child] == tree[node] else 2 * node
+        return node - size
+
+    @staticmethod
+    def _leaf_start(node, size):
+        """Index of the first leaf under node."""
+        while node < size:
+            node *= 2
+        return node - size
+
+    def strongest(self, intervals):
+        """The enemy with the most health within the intervals, or None."""
+        index = self._extreme(intervals, True)
+        return None if index is None else self.enemies[index]
+
+    def weakest(self, intervals):
+        """The enemy with the least health within the intervals, or None."""
+        index = self._extreme(intervals, False)
+        return None if index is None else self.enemies[index]
+
+    def select(self, strategy, intervals, center):
+        """Target for a TARGETING_STRATEGIES entry, or None if nothing is in range."""
+        if strategy == "first":
+            return self.first(intervals)
+        if strategy == "last":
+            return self.last(intervals)
+        if strategy == "strongest":
+            return self.strongest(intervals)
+        if strategy == "weakest":
+            return self.weakest(intervals)
+        return self.nearest(center, intervals)
+
+    def furthest_before(self, distance):
+        """Progress of the enemy furthest along the path short of distance, or None."""
+        index = bisect_left(self.progress, distance)
+        return self.progress[index - 1] if index else None
+
+
+def in_coverage(intervals, distance):
+    """True if distance lies in one of the (start, end) intervals."""
+    for start, end in intervals:
+        if start <= distance <= end:
+            return True
+    return False
@@ -0,0 +1,82 @@
+# src/pool.py
+
+class ObjectPool:
+    """Generic object pool with one free-list per type key.
+
+    acquire/release are O(1) list pops/appends. prewarm() fills a free-list up
+    front, and trim() (called between waves) drops free objects beyond the
+    peak number in use since the previous trim. Hit/miss/allocation counters
+    are kept so pool sizes can be tuned from real sessions."""
+    def __init__(self, factory):
+        """factory(key) creates a new object for the given type key."""
+        self.factory = factory
+        self._free = {}       # key -> list of idle objects
+        self._live = {}       # key -> objects currently handed out
+        self._high_water = {} # key -> peak live count since the last trim
+        self.hits = 0         # acquire() served from a free-list
+        self.misses = 0       # acquire() had to create a new object
+        self.allocations = 0  # Objects created (misses + prewarm)
+        self.trimmed = 0      # Objects dropped by trim()
+
+    def acquire(self, key):
+        """Returns an idle object for key, creating one if the free-list is empty."""
+        free = self._free.get(key)
+        if free:
+            obj = free.pop()
+            self.hits += 1
+        else:
+            obj = self.factory(key)
+            self.misses += 1
+            self.allocations += 1
+        live = self._live.get(key, 0) + 1
+        self._live[key] = live
+        if live > self._high_water.get(key, 0):
+            self._high_water[key] = live
+        return obj
+
+    def release(self, key, obj):
+        """Puts obj back on its key's free-list. Callers must release each object once."""
+        self._free.setdefault(key, []).append(obj)
+        self._live[key] = self._live.get(key, 1) - 1
+
+    def live_count(self, key):
+        """Objects of key currently handed out."""
+        return self._live.get(key, 0)
+
+    def prewarm(self, key, capacity):
+        """Creates objects until key owns at least capacity (idle + in use).
+        The reservation counts towards the high-water mark until the next trim."""
+        free = self._free.setdefault(key, [])
+        while len(free) + self._live.get(key, 0) < capacity:
+            free.append(self.factory(key))
+            self.allocations += 1
+        if capacity > self._high_water.get(key, 0):
+            self._high_water[key] = capacity
+
+    def trim(self):
+        """Shrinks each free-list so a key owns no more objects than its peak
+        use since the last trim, then starts a new measurement window."""
+        for key, free in self._free.items():
+            live = self._live.get(key, 0)
+            keep = max(0, self._high_water.get(key, 0) - live)
+            if len(free) > keep:
+                self.trimmed += len(free) - keep
+                del free[keep:]
+            self._high_water[key] = live
+
+    def stats(self):
+        """Counters and per-key sizes as a plain dict (for telemetry/logging)."""
+        keys = set(self._free) | set(self._live)
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "allocations": self.allocations,
+            "trimmed": self.trimmed,
+            "per_key": {
+                key: {
+                    "live": self._live.get(key, 0),
+                    "free": len(self._free.get(key, ())),
+                    "high_water": self._high_water.get(key, 0),
+                } for key in sorted(keys)
+            },
+        }
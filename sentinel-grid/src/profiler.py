@@ -0,0 +1,188 @@
+# src/profiler.py
+import csv
+from collections import deque
+from time import perf_counter_ns
+
+# Phases of one Game.run frame, in the order they happen. Simulation phases
+# accumulate over every fixed step run in the frame.
+PHASES = ("events", "waves", "towers", "enemies", "projectiles", "collisions", "draw", "flip")
+COUNTERS = ("steps", "dropped_steps", "enemies", "towers", "towers_acted", "projectiles", "draw_calls")
+DEFAULT_WINDOW = 300        # Frames kept for the rolling percentiles (~5 s at 60 FPS)
+SUMMARY_INTERVAL = 30       # Frames between percentile refreshes for the overlay
+CSV_WINDOW = 18000          # Newest frames kept for the CSV export (~5 min at 60 FPS)
+DEFAULT_CSV_PATH = "profile_frames.csv"
+
+class FrameProfiler:
+    """Per-phase frame timer. Code calls lap(phase) at the end of each phase;
+    the time since the previous lap is charged to that phase. While disabled
+    every call returns immediately, so it can stay wired in permanently."""
+    def __init__(self, window=DEFAULT_WINDOW, csv_window=CSV_WINDOW):
+        self.enabled = False
+        self.window = window
+        self.rows = deque(maxlen=csv_window) # Per-frame (phase ns..., counters...) for CSV export
+        self.frames = 0 # Frames recorded in total; older rows fall out of the CSV window
+        self._history = {phase: deque(maxlen=window) for phase in PHASES + ("total",)}
+        self._dropped = deque(maxlen=window) # dropped_steps per frame, summed on the overlay
+        self._phase_ns = dict.fromkeys(PHASES, 0)
+        self._counts = dict.fromkeys(COUNTERS, 0)
+        self._frame_start = 0
+        self._last = 0
+        self._in_frame = False
+        self._summary = []
+        self._frames_since_summary = SUMMARY_INTERVAL
+
+    def set_enabled(self, enabled):
+        """Turns profiling on/off; the rolling window starts fresh when enabled."""
+        if enabled and not self.enabled:
+            for history in self._history.values():
+                history.clear()
+            self._dropped.clear()
+            self._summary = []
+            self._frames_since_summary = SUMMARY_INTERVAL
+        self.enabled = enabled
+        self._in_frame = False
+
+    def toggle(self):
+        """Flips profiling on/off (F3 in game)."""
+        self.set_enabled(not self.enabled)
+
+    def begin_frame(self):
+        """Starts timing a new frame (no-op while disabled)."""
+        if not self.enabled:
+            return
+        phase_ns = self._phase_ns
+        for phase in phase_ns:
+            phase_ns[phase] = 0
+        counts = self._counts
+        for name in counts:
+            counts[name] = 0
+        self._frame_start = self._last = perf_counter_ns()
+        self._in_frame = True
+
+    def lap(self, phase):
+        """Charges the time since the previous lap (or frame start) to phase."""
+        if not self._in_frame:
+            return
+        now = perf_counter_ns()
+        self._phase_ns[phase] += now - self._last
+        self._last = now
+
+    def count(self, name, amount=1):
+        """Adds to a per-frame counter (steps, entity counts, draw calls)."""
+        if self._in_frame:
+            self._counts[name] += amount
+
+    def end_frame(self):
+        """Closes the frame: records its row and feeds the rolling window."""
+        if not self._in_frame:
+            return
+        total = perf_counter_ns() - self._frame_start
+        self._in_frame = False
+        row = [self._phase_ns[phase] for phase in PHASES]
+        for phase, ns in zip(PHASES, row):
+            self._history[phase].append(ns)
+        self._history["total"].append(total)
+        self._dropped.append(self._counts["dropped_steps"])
+        row.append(total)
+        row.extend(self._counts[name] for name in COUNTERS)
+        self.rows.append(row)
+        self.frames += 1
+        self._frames_since_summary += 1
+
+    # --- Reporting ---
+    def percentiles(self):
+        """{phase: (p50, p95, p99)} in milliseconds over the rolling window."""
+        result = {}
+        for phase, history in self._history.items():
+            if not history:
+                continue
+            ordered = sorted(history)
+            last = len(ordered) - 1
+            result[phase] = tuple(ordered[min(last, int(p * len(ordered)))] / 1e6 for p in (0.50, 0.95, 0.99))
+        return result
+
+    def summary_lines(self):
+        """Overlay text, recomputed every SUMMARY_INTERVAL frames."""
+        if self._frames_since_summary >= SUMMARY_INTERVAL:
+            self._frames_since_summary = 0
+            lines = ["phase         p50    p95    p99 ms"]
+            for phase, (p50, p95, p99) in self.percentiles().items():
+                lines.append(f"{phase:<12}{p50:6.2f} {p95:6.2f} {p99:6.2f}")
+            if self.rows:
+                last = self.rows[-1][len(PHASES) + 1:]
+                lines.append("  ".join(f"{name}:{value}" for name, value in zip(COUNTERS, last)))
+            # Steps the fixed-step clock gave up on to catch up (hitches); the last frame alone hides them
+            lines.append(f"dropped steps (last {len(self._dropped)} frames): {sum(self._dropped)}")
+            self._summary = lines
+        return self._summary
+
+    def export_csv(self, path=DEFAULT_CSV_PATH):
+        """Writes one row per profiled frame in the CSV window (phase times in ms,
+        then counters). Frame numbers count from the first profiled frame."""
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame"] + [f"{phase}_ms" for phase in PHASES] + ["total_ms"] + list(COUNTERS))
+            timed = len(PHASES) + 1
+            for frame, row in enumerate(self.rows, self.frames - len(self.rows)):
+                writer.writerow([frame] + [f"{ns / 1e6:.4f}" for ns in row[:timed]] + row[timed:])
+        skipped = self.frames - len(self.rows)
+        print(f"Profiler: wrote {len(self.rows)} frames to {path}"
+              + (f" (the {skipped} before them fell out of the CSV window)" if skipped else ""))
+
+
+# --- Startup timing (python main.py --startup-profile) ---
+# Headline figures and their budgets in ms. "init" covers Game.__init__ (window,
+# data, simulation, first level); "first_frame" is the first full _draw.
+STARTUP_BUDGETS_MS = {"imports": 400.0, "init": 300.0, "first_frame": 50.0}
+INIT_MARKS = ("window", "content", "simulation", "level")
+
+class StartupProfile:
+    """Wall-clock marks from process start to the first presented frame.
+    Each mark(name) closes a step; its time is measured from the previous mark."""
+    def __init__(self, start_ns):
+        self.start_ns = start_ns
+        self.marks = [] # (name, perf_counter_ns)
+        self.notes = [] # Extra report lines (e.g. where the data came from)
+
+    def mark(self, name, at_ns=None):
+        """Ends step name now (or at at_ns, for times taken before the profile existed)."""
+        self.marks.append((name, perf_counter_ns() if at_ns is None else at_ns))
+
+    def note(self, text):
+        self.notes.append(text)
+
+    def steps_ms(self):
+        """[(name, ms)] for every mark, in order."""
+        steps = []
+        previous = self.start_ns
+        for name, at in self.marks:
+            steps.append((name, (at - previous) / 1e6))
+            previous = at
+        return steps
+
+    def headline_ms(self):
+        """{"imports", "init", "first_frame"} in ms (only those that were marked)."""
+        totals = {}
+        for name, ms in self.steps_ms():
+            key = "init" if name in INIT_MARKS else name
+            totals[key] = totals.get(key, 0.0) + ms
+        return totals
+
+    def report(self, budgets=STARTUP_BUDGETS_MS):
+        """Prints the step table and the headline figures against budgets.
+        Returns the headline names that went over budget."""
+        print("--- STARTUP PROFILE ---")
+        elapsed = 0.0
+        for name, ms in self.steps_ms():
+            elapsed += ms
+            print(f"  {name:<12}{ms:9.1f} ms  (t={elapsed:8.1f} ms)")
+        for text in self.notes:
+            print(f"  {text}")
+        over = []
+        for name, ms in self.headline_ms().items():
+            budget = budgets.get(name)
+            status = "" if budget is None else ("ok" if ms <= budget else "OVER BUDGET")
+            print(f"  {name:<12}{ms:9.1f} ms  budget {budget if budget is not None else '-':>6} {status}")
+            if budget is not None and ms > budget:
+                over.append(name)
+        return over
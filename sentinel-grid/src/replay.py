@@ -0,0 +1,143 @@
+# src/replay.py
+import hashlib
+import time
+
+REPLAY_FORMAT = "sentinel-replay 1" # First line of every log; bump if commands change meaning
+
+# Commands that change game state, with how many integer/string args each takes.
+# Everything the player can do goes through Game.execute under one of these names.
+COMMANDS = {
+    "select_type": 1, # tower_type_id
+    "click": 2,       # x y (left click: select a placed tower or attempt_placement)
+    "deselect": 0,
+    "upgrade": 0,     # attempt_upgrade on the selected placed tower
+    "pause": 0,       # toggle pause
+    "restart": 0,
+    "next_level": 0,
+    "end": 0,         # Session closed; replay runs up to this tick
+}
+
+class ReplayRecorder:
+    """Append-only command log. One line per command: "<tick> <command> [args]".
+    Lines are flushed as they are written so a crashed session is still replayable."""
+    def __init__(self, path, first_level):
+        self.path = path
+        self._file = open(path, "w", encoding="utf-8")
+        self._file.write(f"{REPLAY_FORMAT} {first_level}\n")
+        self._file.flush()
+        self.count = 0
+
+    def record(self, tick, command, *args):
+        """Appends one command stamped with the simulation step it applies before."""
+        fields = [str(tick), command] + [str(arg) for arg in args]
+        self._file.write(" ".join(fields) + "\n")
+        self._file.flush()
+        self.count += 1
+
+    def close(self, tick):
+        """Writes the end marker and closes the log (safe to call twice)."""
+        if self._file.closed:
+            return
+        self.record(tick, "end")
+        self._file.close()
+        print(f"Replay: recorded {self.count} commands to {self.path}")
+
+
+def load_replay(path):
+    """Reads a log written by ReplayRecorder. Returns (first_level, commands)
+    where commands is a list of (tick, command, args) in recorded order."""
+    with open(path, "r", encoding="utf-8") as f:
+        header = f.readline().split()
+        if " ".join(header[:2]) != REPLAY_FORMAT:
+            raise ValueError(f"{path}: not a replay log (header {header!r})")
+        first_level = header[2] if len(header) > 2 else None
+        commands = []
+        for line_number, line in enumerate(f, start=2):
+            fields = line.split()
+            if not fields:
+                continue
+            tick, command, args = int(fields[0]), fields[1], fields[2:]
+            if command not in COMMANDS or len(args) != COMMANDS[command]:
+                raise ValueError(f"{path}:{line_number}: bad command {line.strip()!r}")
+            if command == "click":
+                args = [int(args[0]), int(args[1])]
+            commands.append((tick, command, args))
+    return first_level, commands
+
+
+def state_hash(sim):
+    """SHA-256 over the simulation state that matters for gameplay. Two runs of
+    the same replay must produce the same hash; a change means behavioural drift."""
+    store = sim.wave_manager.enemy_store
+    enemies = sorted(
+        (enemy.spawn_id, enemy.pool_key, round(enemy.progress, 4), round(enemy.health, 4),
+         round(enemy.speed, 4), enemy.is_active)
+        for enemy in sim.enemy_group if enemy.slot is not None)
+    towers = sorted(
+        (tower.rect.center, tower.tower_id, round(tower.last_shot_time, 4))
+        for tower in sim.tower_group)
+    projectiles = [
+        (round(proj.pos.x, 3), round(proj.pos.y, 3), proj.pool_key)
+        for proj in sim.projectile_group]
+    shots = [
+        (shot.style.pool_key, round(shot.fire_time, 4), round(shot.hit_time, 4))
+        for shot in sim.tower_manager.shots.in_flight()]
+    state = (
+        sim.current_level_id, sim.game_manager.game_state,
+        sim.clock.ticks, round(sim.clock.time, 6),
+        sim.resource_manager.resources,
+        sim.core.current_health if sim.core else None,
+        sim.leaks, sim.kills, store.live_count,
+        sim.wave_manager.current_wave_index,
+        enemies, towers, projectiles,
+    )
+    if shots: # Analytic projectile mode only; keeps stepped-mode hashes unchanged
+        state += (shots,)
+    return hashlib.sha256(repr(state).encode("utf-8")).hexdigest()
+
+
+def frame_time_stats(samples):
+    """Summary (milliseconds) of per-step wall times."""
+    if not samples:
+        return {"steps": 0}
+    ordered = sorted(samples)
+    def percentile(p):
+        return ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000.0
+    return {
+        "steps": len(samples),
+        "total_s": sum(samples),
+        "mean_ms": sum(samples) / len(samples) * 1000.0,
+        "p50_ms": percentile(0.50),
+        "p95_ms": percentile(0.95),
+        "p99_ms": percentile(0.99),
+        "max_ms": ordered[-1] * 1000.0,
+    }
+
+
+def play_replay(game, commands, step_dt):
+    """Feeds commands back through game.execute at their recorded ticks and
+    steps the simulation as fast as possible with no rendering. Returns a
+    report dict with frame-time statistics and the final state hash."""
+    end_tick = max((tick for tick, _, _ in commands), default=0)
+    pending = iter(commands)
+    next_command = next(pending, None)
+    samples = []
+    perf_counter = time.perf_counter
+    wall_start = perf_counter()
+    for tick in range(end_tick + 1):
+        # Commands stamped with this tick were issued before its step ran
+        while next_command is not None and next_command[0] == tick:
+            _, command, args = next_command
+            if command != "end":
+                game.execute(command, *args)
+            next_command = next(pending, None)
+        if tick == end_tick:
+            break
+        start = perf_counter()
+        game.step(step_dt)
+        samples.append(perf_counter() - start)
+    report = frame_time_stats(samples)
+    report["wall_s"] = perf_counter() - wall_start
+    report["commands"] = len(commands)
+    report["state_hash"] = state_hash(game.sim)
+    return report
@@ -0,0 +1,281 @@
+# src/simulation.py
+import os
+import sys
+import time
+import contextlib
+import pygame
+from .config import STATE_PLAYING, STATE_GAME_OVER, STATE_VICTORY, SCREEN_SIZE
+from .content import load_content
+from .clock import GameClock, FIXED_DT
+from .game_manager import GameManager
+from .resource_manager import ResourceManager
+from .tower_platform import TowerPlatform
+from .wave_manager import WaveManager
+from .tower_manager import TowerManager
+from .core import Core
+from .path_index import PathProgressIndex
+from .collisions import CollisionSystem
+from .profiler import FrameProfiler
+
+DEFAULT_DT = FIXED_DT # Same step as the interactive game, so headless runs match it
+DEFAULT_MAX_SIM_TIME = 1800.0 # Safety cap (seconds of game time) for simulate()
+
+class Simulation:
+    """Headless game world: waves, towers, projectiles, collisions and win/loss.
+    Needs no window; main.py's Game drives one of these and renders it."""
+    def __init__(self, world_rect, clock=None, projectile_mode="stepped", content=None, target_lock=True):
+        """world_rect bounds the playfield (projectiles are culled against it).
+        clock is the GameClock that stamps game time; a new one is made if omitted.
+        projectile_mode picks stepped or analytic projectiles (see tower_manager).
+        content is the ContentRegistry (the process-wide, cached one if omitted).
+        target_lock=False makes towers re-pick their target for every shot."""
+        self.content = content if content is not None else load_content()
+        self.world_rect = pygame.Rect(world_rect)
+        self.clock = clock if clock is not None else GameClock()
+        self.current_level_id = None
+
+        # --- Sprite Groups ---
+        self.platform_group = pygame.sprite.Group()
+        self.enemy_group = pygame.sprite.Group()
+        self.tower_group = pygame.sprite.Group()
+        self.projectile_group = pygame.sprite.Group()
+        self.core_group = pygame.sprite.GroupSingle()
+        self.core = None # Created in load_level
+        self.enemy_index = PathProgressIndex() # Enemies in path order, for tower range queries
+        self.collisions = CollisionSystem() # Projectile/enemy broad phase
+        self.profiler = FrameProfiler() # Per-phase timings; disabled (free) unless Game turns it on
+
+        # --- Managers (order matters for dependencies) ---
+        self.wave_manager = WaveManager(self.enemy_group, self.clock, self.content)
+        self.wave_manager.enemy_store.index = self.enemy_index # Spawns/releases/damage update it in place
+        self.all_levels_data = self.content.level_data # Parsed once, shared by every manager
+        self.resource_manager = ResourceManager()
+        self.tower_manager = TowerManager(
+             resource_manager=self.resource_manager,
+             platform_group=self.platform_group,
+             tower_group=self.tower_group,
+             projectile_group=self.projectile_group,
+             world_rect=self.world_rect,
+             projectile_mode=projectile_mode,
+             clock=self.clock,
+             content=self.content,
+             target_lock=target_lock
+        )
+        # No UI in the simulation; Game attaches its UIManager for drawing
+        self.game_manager = GameManager(
+             resource_manager=self.resource_manager,
+             ui_manager=None,
+             wave_manager=self.wave_manager,
+             core=self.core,
+             enemy_group=self.enemy_group
+        )
+
+        # Per-level statistics (reset in load_level)
+        self.leaks = 0
+        self.kills = 0
+        self._pool_wave_index = -1 # Wave index the pools were last trimmed for
+
+    def load_level(self, level_id):
+        """Loads and sets up all components for the specified level ID.
+        Returns False if the level could not be loaded."""
+        print(f"\n--- LOADING LEVEL: {level_id} ---")
+        if level_id not in self.all_levels_data:
+             print(f"CRITICAL ERROR: Level ID '{level_id}' not found in levels.json data.")
+             self.game_manager.is_running = False
+             return False
+        self.current_level_id = level_id
+
+        try:
+            self.wave_manager.load_level_data(level_id)
+        except ValueError as e:
+             print(f"Error loading level data via WaveManager: {e}. Cannot proceed.")
+             self.game_manager.is_running = False
+             return False
+
+        level_config = self.all_levels_data[level_id]
+        new_starting_resources = level_config.get('starting_resources', 200)
+        self.resource_manager.reset(new_start_amount=new_starting_resources)
+
+        if self.core: self.core.kill()
+        self.core = Core(self.wave_manager.core_location, self.wave_manager.core_starting_health)
+        self.core_group.add(self.core)
+        self.game_manager.core = self.core # Managers depending on the core need the new one
+
+        self.tower_group.empty()
+        for projectile in self.projectile_group.sprites():
+            projectile.destroy() # Returns it to the pool
+        self.tower_manager.shots.clear()
+        # Enemies were released back to their pools by wave_manager.load_level_data
+
+        max_enemy_speed = max((enemy.speed for enemy in self.wave_manager.enemy_types.values()), default=0.0)
+        self.tower_manager.set_path(self.wave_manager.path_table, max_enemy_speed)
+        self._create_platforms(level_id)
+        self.tower_manager.deselect_tower() # Reset selections
+
+        self.clock.reset()
+        self.leaks = 0
+        self.kills = 0
+        self._pool_wave_index = -1
+        self.game_manager.set_state(STATE_PLAYING)
+        print(f"--- LEVEL {level_id} LOAD COMPLETE ---")
+        return True
+
+    def _create_platforms(self, level_id):
+        """Creates tower platforms based on the specified level ID."""
+        self.platform_group.empty() # Clear existing platforms first
+
+        level_config = self.all_levels_data.get(level_id)
+        if not level_config:
+             print(f"Warning: Cannot create platforms, level config not found for {level_id}")
+             return
+
+        platform_locations = self.content.platform_locations(level_id)
+
+        print(f"Creating {len(platform_locations)} platforms for '{level_id}'.")
+        for pos in platform_locations:
+            self.platform_group.add(TowerPlatform(pos[0], pos[1]))
+
+    def place_tower(self, tower_type_id, platform):
+        """Places a tower without any UI interaction.
+        platform is either an index into the level's platform list or an (x, y) position."""
+        if isinstance(platform, int):
+             platforms = self.platform_group.sprites()
+             if not 0 <= platform < len(platforms):
+                  print(f"Placement failed: platform index {platform} out of range.")
+                  return False
+             platform = platforms[platform].rect.center
+        self.tower_manager.select_tower_type(tower_type_id)
+        placed = self.tower_manager.attempt_placement(platform)
+        self.tower_manager.deselect_tower()
+        return placed
+
+    def _handle_collisions(self):
+        """Resolves projectile/enemy hits found by the collision stage, then
+        the analytic shots whose impact time has come."""
+        if self.projectile_group:
+            self.collisions.build(self.enemy_group)
+            for projectile, enemy in self.collisions.hits(self.projectile_group):
+                projectile.handle_hit(enemy) # Let projectile destroy itself
+                self._apply_hit(enemy, projectile.damage)
+        for shot, enemy in self.tower_manager.shots.resolve():
+            self._apply_hit(enemy, shot.damage)
+
+    def _apply_hit(self, enemy, damage):
+        """Damages enemy; counts the kill and pays its reward if it died."""
+        enemy.take_damage(damage)
+        if not enemy.is_active: # Enemy died
+            self.kills += 1
+            self.resource_manager.add_resources(enemy.reward)
+
+    def _handle_enemy_at_end(self, ended_enemies):
+        """Damages the core for each enemy that reached the end, and removes them."""
+        for enemy in ended_enemies:
+             self.leaks += 1
+             self.core.take_damage(1)
+             enemy.kill()
+
+    def update(self, dt, mouse_pos=None):
+        """Advances the world by dt seconds of game time.
+        mouse_pos only drives the tower placement preview (None when headless)."""
+        profiler = self.profiler
+        self.game_manager.update(dt) # Checks win/loss first
+        if self.game_manager.game_state == STATE_PLAYING:
+            self.clock.advance(dt)
+            self.resource_manager.update(dt)
+            self.wave_manager.update(dt)
+            if self.wave_manager.current_wave_index != self._pool_wave_index:
+                # Between waves: the enemy pools trim and prewarm themselves on wave start
+                self._pool_wave_index = self.wave_manager.current_wave_index
+                self.tower_manager.projectile_pool.trim()
+                self.tower_manager.prewarm_projectiles()
+            profiler.lap("waves")
+            self.enemy_index.refresh(self.wave_manager.enemy_store, self.wave_manager.enemy_views)
+            self.tower_manager.spawns_pending = not self.wave_manager.is_level_spawning_complete()
+            self.tower_manager.update(dt, self.enemy_index, mouse_pos)
+            profiler.count("towers_acted", self.tower_manager.towers_acted) # The rest slept through the step
+            profiler.lap("towers")
+            ended_enemies = self.wave_manager.advance_enemies(dt) # Vectorized enemy step
+            profiler.lap("enemies")
+            self.projectile_group.update(dt)
+            profiler.lap("projectiles")
+            if self.core: # Ensure core exists before updating
+                 self.core_group.update(dt) # Update core (for animations etc)
+            self._handle_enemy_at_end(ended_enemies)
+            self._handle_collisions()
+            profiler.lap("collisions")
+        # No updates needed for paused/end states, handled by state manager
+
+    def run_until_finished(self, dt=DEFAULT_DT, max_sim_time=DEFAULT_MAX_SIM_TIME):
+        """Steps the loaded level until it is won, lost or max_sim_time passes.
+        Returns the wall time spent, in seconds."""
+        start = time.perf_counter()
+        while not self.is_finished() and self.clock.time < max_sim_time:
+            self.update(dt)
+        return time.perf_counter() - start
+
+    def pool_stats(self):
+        """Hit/miss/allocation counters for the enemy and projectile pools."""
+        return {
+            "enemies": self.wave_manager.enemy_pool.stats(),
+            "projectiles": self.tower_manager.projectile_pool.pool.stats(),
+            "enemy_store_capacity": self.wave_manager.enemy_store.capacity,
+        }
+
+    def is_finished(self):
+        """True once the loaded level has been won or lost."""
+        return self.game_manager.game_state in (STATE_GAME_OVER, STATE_VICTORY)
+
+    def get_result(self):
+        """Summary of the current level's outcome as a plain dict."""
+        # Health is reported as float in both engines (Core keeps it as float)
+        core_health = float(self.core.current_health) if self.core else 0.0
+        core_max = float(self.core.max_health) if self.core else 0.0
+        return {
+            "level_id": self.current_level_id,
+            "outcome": self.game_manager.game_state,
+            "ticks": self.clock.ticks,
+            "sim_time": self.clock.time,
+            "core_health": core_health,
+            "core_damage_taken": core_max - core_health,
+            "leaks": self.leaks,
+            "kills": self.kills,
+            "resources": self.resource_manager.resources,
+            "towers": len(self.tower_group),
+        }
+
+
+def simulate(level_id, placements=(), dt=DEFAULT_DT, max_sim_time=DEFAULT_MAX_SIM_TIME,
+             world_rect=None, quiet=True, projectile_mode="stepped", target_lock=True):
+    """Runs a level headless from start to win/loss and returns the result dict.
+
+    placements is a sequence of (tower_type_id, platform) pairs applied before the
+    first tick; platform is a platform index or an (x, y) position.
+    quiet suppresses the managers' console logging, which dominates run time.
+    target_lock=False re-targets on every shot (for comparing against locked runs)."""
+    if world_rect is None:
+        world_rect = pygame.Rect((0, 0), SCREEN_SIZE)
+
+    with open(os.devnull, 'w') as devnull, \
+         (contextlib.redirect_stdout(devnull) if quiet else contextlib.nullcontext()):
+        sim = Simulation(world_rect, projectile_mode=projectile_mode, target_lock=target_lock)
+        if not sim.load_level(level_id):
+            raise ValueError(f"Level ID '{level_id}' could not be loaded.")
+        for tower_type_id, platform in placements:
+            sim.place_tower(tower_type_id, platform)
+        wall_time = sim.run_until_finished(dt, max_sim_time)
+
+    result = sim.get_result()
+    result["pool_stats"] = sim.pool_stats()
+    result["wall_time"] = wall_time
+    result["ticks_per_second"] = sim.clock.ticks / wall_time if wall_time > 0 else float('inf')
+    return result
+
+
+if __name__ == '__main__':
+    # Example: python -m src.simulation level1 gun_tower:0 cannon_tower:2
+    level = sys.argv[1] if len(sys.argv) > 1 else "level1"
+    towers = []
+    for arg in sys.argv[2:]:
+        tower_id, _, index = arg.partition(":")
+        towers.append((tower_id, int(index)))
+    print(simulate(level, towers))
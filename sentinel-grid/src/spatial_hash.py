@@ -0,0 +1,66 @@
+# src/spatial_hash.py
+
+DEFAULT_CELL_SIZE = 96 # Pixels; about half the smallest tower range
+
+class SpatialHashGrid:
+    """Uniform grid of buckets keyed by cell coordinate. Each item is filed
+    under every cell its bounding box overlaps; circle queries only visit
+    the cells overlapping the circle instead of every item.
+
+    Holds static geometry: PathTable files its path segments here once per
+    level, so the path coverage of a tower's range or a shot's flight
+    (PathTable.circle_intervals) only measures the segments near it."""
+    def __init__(self, cell_size=DEFAULT_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {} # (cell_x, cell_y) -> list of items
+        self.count = 0
+
+    def _cell_of(self, x, y):
+        """Cell coordinate containing the point (x, y)."""
+        return int(x // self.cell_size), int(y // self.cell_size)
+
+    def insert(self, item, left, top, right, bottom):
+        """Files item under every cell overlapping the box (left, top)-(right, bottom)."""
+        min_x, min_y = self._cell_of(left, top)
+        max_x, max_y = self._cell_of(right, bottom)
+        cells = self.cells
+        for gx in range(min_x, max_x + 1):
+            for gy in range(min_y, max_y + 1):
+                bucket = cells.get((gx, gy))
+                if bucket is None:
+                    bucket = cells[(gx, gy)] = []
+                bucket.append(item)
+        self.count += 1
+
+    def _cells_in_circle(self, cx, cy, radius):
+        """Yields the non-empty buckets whose cell overlaps the circle."""
+        size = self.cell_size
+        min_x, min_y = self._cell_of(cx - radius, cy - radius)
+        max_x, max_y = self._cell_of(cx + radius, cy + radius)
+        radius_sq = radius * radius
+        cells = self.cells
+        if (max_x - min_x + 1) * (max_y - min_y + 1) > len(cells):
+            # Sparse grid: cheaper to walk the existing buckets than the bounding box
+            candidates = ((gx, gy, bucket) for (gx, gy), bucket in cells.items()
+                          if bucket and min_x <= gx <= max_x and min_y <= gy <= max_y)
+        else:
+            candidates = ((gx, gy, cells.get((gx, gy)))
+                          for gx in range(min_x, max_x + 1) for gy in range(min_y, max_y + 1))
+        for gx, gy, bucket in candidates:
+            if not bucket:
+                continue
+            # Distance from the circle centre to the nearest point of this cell
+            left = gx * size
+            top = gy * size
+            dx = left - cx if cx < left else (cx - left - size if cx > left + size else 0)
+            dy = top - cy if cy < top else (cy - top - size if cy > top + size else 0)
+            if dx * dx + dy * dy <= radius_sq:
+                yield bucket
+
+    def query_circle(self, center, radius):
+        """Sorted, distinct items filed in a cell the circle overlaps. A superset
+        of the items whose box meets the circle; callers do the exact test."""
+        found = set()
+        for bucket in self._cells_in_circle(center[0], center[1], radius):
+            found.update(bucket)
+        return sorted(found)
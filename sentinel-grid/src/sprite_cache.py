@@ -0,0 +1,125 @@
+# src/sprite_cache.py
+import math
+import pygame
+from .config import get_color, get_palette_version
+
+FLASH_COLOR_IDX = 1 # Tower firing flash fill (White/Accent)
+
+def draw_shape(surface, center, shape_type, size, points, fill_color, border_color,
+               border_width, scale=1.0, inner_radius=0):
+    """Rasterizes a data-driven shape ("rect", "circle" or "polygon") centred on
+    center. Polygons with fewer than three points fall back to an unscaled rect.
+    inner_radius > 0 adds the towers' inner detail dot in the border color."""
+    center_x, center_y = center
+    if shape_type == "rect":
+        shape_rect = pygame.Rect(0, 0, size[0] * scale, size[1] * scale)
+        shape_rect.center = center
+        pygame.draw.rect(surface, fill_color, shape_rect)
+        if border_width > 0:
+            pygame.draw.rect(surface, border_color, shape_rect, border_width)
+    elif shape_type == "circle":
+        radius = int((size[0] // 2) * scale)
+        pygame.draw.circle(surface, fill_color, center, radius)
+        if border_width > 0:
+            pygame.draw.circle(surface, border_color, center, radius, border_width)
+    elif shape_type == "polygon" and len(points) > 2:
+        abs_points = [(center_x + p[0] * scale, center_y + p[1] * scale) for p in points]
+        pygame.draw.polygon(surface, fill_color, abs_points)
+        if border_width > 0:
+            pygame.draw.polygon(surface, border_color, abs_points, border_width)
+    else: # Fallback (unknown type or degenerate polygon)
+        fallback_rect = pygame.Rect(0, 0, size[0], size[1])
+        fallback_rect.center = center
+        pygame.draw.rect(surface, fill_color, fallback_rect)
+        if border_width > 0:
+            pygame.draw.rect(surface, border_color, fallback_rect, border_width)
+
+    if inner_radius > 0:
+        pygame.draw.circle(surface, border_color, center, inner_radius)
+
+
+class ShapeSpriteCache:
+    """Pre-rendered sprites for every shape/palette/animation-frame combination.
+
+    Each entry is rasterized once with draw_shape onto a small SRCALPHA
+    surface; drawing an entity is then a lookup returning a (surface, dest)
+    pair ready for Surface.blits. The whole cache is dropped on palette change."""
+    def __init__(self):
+        self._sprites = {} # key -> (surface, (anchor_x, anchor_y))
+        self._palette_version = get_palette_version()
+        self.renders = 0   # Sprites rasterized so far
+
+    def begin_frame(self):
+        """Call once per frame before lookups; flushes the cache if the palette changed."""
+        version = get_palette_version()
+        if version != self._palette_version:
+            self._sprites.clear()
+            self._palette_version = version
+
+    def _render(self, shape_type, size, points, fill_idx, border_idx, border_width,
+                scale=1.0, inner_radius=0):
+        """Rasterizes one shape centred in a new surface; returns (surface, anchor)."""
+        extent = max(size[0], size[1]) / 2 * max(scale, 1.0)
+        for p in points:
+            extent = max(extent, abs(p[0]) * scale, abs(p[1]) * scale)
+        half = int(math.ceil(extent)) + border_width + 2 # Margin for outlines
+        surface = pygame.Surface((half * 2 + 1, half * 2 + 1), pygame.SRCALPHA)
+        draw_shape(surface, (half, half), shape_type, size, points,
+                   get_color(fill_idx), get_color(border_idx), border_width,
+                   scale, inner_radius)
+        self.renders += 1
+        return surface, (half, half)
+
+    def _get(self, key, *render_args, **render_kwargs):
+        sprite = self._sprites.get(key)
+        if sprite is None:
+            sprite = self._sprites[key] = self._render(*render_args, **render_kwargs)
+        return sprite
+
+    # --- Per-entity lookups: each returns (surface, dest_topleft) ---
+    def enemy(self, enemy, pos=None):
+        """Enemy body at its bobbed position (bob is a baked per-frame offset).
+        pos overrides the simulated position (render interpolation)."""
+        archetype = enemy.archetype
+        surface, (ax, ay) = self._get(
+            ("enemy", enemy.pool_key),
+            archetype.shape_type, archetype.size, archetype.shape_points,
+            archetype.fill_color_idx, archetype.border_color_idx, archetype.border_width)
+        x, y = enemy.pos if pos is None else pos
+        return surface, (int(x) - ax, int(y) + enemy.bob_offset() - ay)
+
+    def tower(self, tower):
+        """Tower body, with the firing-flash variant and slow-tower pulse frames."""
+        frame = tower.animation_frame()
+        flashing = tower.firing_flash_timer > 0
+        scale = tower.frame_scale(frame)
+        archetype = tower.archetype
+        surface, (ax, ay) = self._get(
+            ("tower", tower.tower_id, flashing, frame),
+            archetype.shape_type, archetype.size, archetype.shape_points,
+            FLASH_COLOR_IDX if flashing else archetype.fill_color_idx,
+            archetype.border_color_idx, archetype.border_width,
+            scale=scale, inner_radius=max(1, int((archetype.size[0] // 5) * scale)))
+        cx, cy = tower.rect.center
+        return surface, (cx - ax, cy - ay)
+
+    def projectile(self, archetype, pos):
+        """Body of a projectile with the given ProjectileArchetype (circle, or
+        rect for any other type) at pos."""
+        shape_type = "circle" if archetype.shape_type == "circle" else "rect"
+        size = (archetype.radius * 2, archetype.radius * 2) if shape_type == "circle" else archetype.size
+        surface, (ax, ay) = self._get(
+            ("projectile", archetype.pool_key),
+            shape_type, size, (),
+            archetype.fill_color_idx, archetype.border_color_idx, archetype.border_width)
+        return surface, (round(pos[0]) - ax, round(pos[1]) - ay)
+
+    def core(self, core):
+        """Core at its current (integer) pulse radius."""
+        radius = core.pulse_radius()
+        surface, (ax, ay) = self._get(
+            ("core", radius),
+            core.shape_type, (radius * 2, radius * 2), (),
+            core.fill_color_idx, core.border_color_idx, core.border_width)
+        cx, cy = core.rect.center
+        return surface, (cx - ax, cy - ay)
@@ -0,0 +1,101 @@
+# src/text_renderer.py
+from collections import OrderedDict
+import pygame
+from .config import get_color, get_palette_version
+from .fonts import get_font
+
+ATLAS_CHARS = "".join(chr(code) for code in range(32, 127)) # Printable ASCII, baked up front
+ATLAS_COLUMNS = 16
+DEFAULT_STRING_CACHE_SIZE = 256 # Whole-string surfaces kept (least recently used dropped)
+
+class GlyphAtlas:
+    """Every ATLAS_CHARS glyph of one font rasterized once, in one color, into
+    a single surface. Characters outside the set are rendered the first time
+    they are asked for and kept alongside."""
+    def __init__(self, font, color):
+        self.font = font
+        self.color = color
+        self.glyphs = {} # char -> (surface, area or None, advance)
+        glyph_surfaces = [(char, font.render(char, True, color)) for char in ATLAS_CHARS]
+        cell_w = max(surface.get_width() for _, surface in glyph_surfaces)
+        # Some glyphs ('_') reach below font.get_height(); cells fit the tallest so rows don't bleed
+        self.height = max(font.get_height(), max(surface.get_height() for _, surface in glyph_surfaces))
+        rows = (len(glyph_surfaces) + ATLAS_COLUMNS - 1) // ATLAS_COLUMNS
+        self.surface = pygame.Surface((cell_w * ATLAS_COLUMNS, self.height * rows), pygame.SRCALPHA)
+        for index, (char, glyph) in enumerate(glyph_surfaces):
+            x, y = (index % ATLAS_COLUMNS) * cell_w, (index // ATLAS_COLUMNS) * self.height
+            self.surface.blit(glyph, (x, y), special_flags=pygame.BLEND_RGBA_MAX) # Exact copy onto the clear atlas
+            self.glyphs[char] = (self.surface, pygame.Rect(x, y, glyph.get_width(), glyph.get_height()),
+                                 self._advance(char, glyph))
+
+    def _advance(self, char, glyph):
+        metrics = self.font.metrics(char)
+        return metrics[0][4] if metrics and metrics[0] else glyph.get_width()
+
+    def glyph(self, char):
+        """(surface, area, advance) for char; area None means the whole surface."""
+        entry = self.glyphs.get(char)
+        if entry is None:
+            surface = self.font.render(char, True, self.color)
+            entry = self.glyphs[char] = (surface, None, self._advance(char, surface))
+        return entry
+
+
+class TextRenderer:
+    """Palette-colored text built from glyph atlases instead of font.render.
+
+    Each (size, font name, color index) gets one GlyphAtlas, baked the first
+    time it is used. A string is composed by blitting its glyphs' sub-rects
+    side by side at their advances (no kerning pairs, which the UI's default
+    font barely uses), and the finished surface is kept in a bounded LRU, so
+    a label that did not change costs one dict lookup. Everything is dropped
+    when the palette changes."""
+    def __init__(self, cache_size=DEFAULT_STRING_CACHE_SIZE):
+        self.cache_size = cache_size
+        self._atlases = {}             # (size, name, color_idx) -> GlyphAtlas
+        self._strings = OrderedDict()  # (text, size, name, color_idx) -> Surface, oldest first
+        self._palette_version = get_palette_version()
+        self.composed = 0 # Strings composed from glyphs so far (cache misses)
+
+    def _check_palette(self):
+        version = get_palette_version()
+        if version != self._palette_version:
+            self._atlases.clear()
+            self._strings.clear()
+            self._palette_version = version
+
+    def atlas(self, size, color_idx, name=None):
+        """The GlyphAtlas for a font size/name in a palette color."""
+        key = (size, name, color_idx)
+        atlas = self._atlases.get(key)
+        if atlas is None:
+            atlas = self._atlases[key] = GlyphAtlas(get_font(size, name), get_color(color_idx))
+        return atlas
+
+    def render(self, text, size, color_idx, name=None):
+        """Surface with text in palette color color_idx (like font.render with antialiasing)."""
+        self._check_palette()
+        key = (text, size, name, color_idx)
+        strings = self._strings
+        surface = strings.get(key)
+        if surface is not None:
+            strings.move_to_end(key)
+            return surface
+        surface = self._compose(text, self.atlas(size, color_idx, name))
+        strings[key] = surface
+        if len(strings) > self.cache_size:
+            strings.popitem(last=False)
+        return surface
+
+    def _compose(self, text, atlas):
+        blits = []
+        x = width = 0
+        for char in text:
+            source, area, advance = atlas.glyph(char)
+            blits.append((source, (x, 0), area, pygame.BLEND_RGBA_MAX))
+            width = max(width, x + (area.width if area is not None else source.get_width()))
+            x += advance
+        surface = pygame.Surface((max(1, width), atlas.height), pygame.SRCALPHA)
+        surface.blits(blits, False)
+        self.composed += 1
+        return surface
@@ -1,36 +1,225 @@
 # src/tower_manager.py
 import pygame
-import json
-import os
+import math
+import heapq
 # Import all tower types that need to be mapped
 from .towers import Tower, GunTower, CannonTower, SlowTower
-from .projectiles import Projectile # Needed for ProjectilePool
-
-# --- Get the absolute path to the data directory ---
-script_dir = os.path.dirname(os.path.realpath(__file__))
-project_root = os.path.dirname(script_dir)
-DATA_DIR = os.path.join(project_root, 'data')
+from .projectiles import Projectile, flight_time # Needed for ProjectilePool / AnalyticProjectiles
+from .pool import ObjectPool
+from .clock import GameClock
+from .archetypes import compile_towers
+from .content import load_content
+
+# How fired projectiles are resolved:
+#   "stepped"  - a pooled Projectile sprite moves every tick and is collided against enemies
+#   "analytic" - the impact is solved when the shot is fired and applied when its time comes
+PROJECTILE_MODES = ("stepped", "analytic")
+SHOT_QUERY_MARGIN = 48 # Pixels added to candidate queries for enemy + projectile half sizes
+WAKE_EPSILON = 1e-9    # Seconds of float slack when comparing wake times to the clock
+TIE_SLACK = 1e-9       # Seconds apart at which two hits still tie (float noise); the earlier spawn wins
+INF = float('inf')
+PREVIEW_COLOR = (128, 128, 128) # Placement preview body (translucent)
 
 class ProjectilePool:
-    """Simple object pool for projectiles."""
-    def __init__(self):
-        self.pool = [] # List to hold projectile instances
-
-    def get(self, tower_data, start_pos, target_pos):
-        """Gets an inactive projectile from the pool or creates a new one."""
-        for proj in self.pool:
-            if not proj.is_active:
-                # print("Reusing projectile from pool.") # Optional debug print
-                proj.setup(tower_data, start_pos, target_pos)
-                return proj
-        # print("Creating new projectile for pool.") # Optional debug print
-        new_proj = Projectile(tower_data, start_pos, target_pos)
-        self.pool.append(new_proj)
-        return new_proj
+    """Projectile pool with one free-list per firing tower type."""
+    def __init__(self, bounds):
+        self.bounds = bounds # World rect handed to every projectile for culling
+        self.pool = ObjectPool(lambda key: Projectile())
+
+    def launch(self, archetype, start_pos, target, projectile_group):
+        """Fires a stepped projectile (ProjectileArchetype) from start_pos towards
+        target's current position."""
+        projectile = self.get(archetype, start_pos, target.rect.center)
+        projectile_group.add(projectile)
+        return True
+
+    def get(self, archetype, start_pos, target_pos):
+        """Gets an idle projectile for the archetype's tower type (O(1)) and sets it up for firing."""
+        proj = self.pool.acquire(archetype.pool_key)
+        proj.pool = self
+        proj.pool_key = archetype.pool_key
+        proj.setup(archetype, start_pos, target_pos, self.bounds)
+        return proj
 
     def return_to_pool(self, proj):
-        """Marks a projectile as inactive."""
-        proj.is_active = False
+        """Puts a destroyed projectile back on its free-list."""
+        self.pool.release(proj.pool_key, proj)
+
+    def prewarm(self, tower_id, capacity):
+        """Pre-creates projectiles for a tower type."""
+        self.pool.prewarm(tower_id, capacity)
+
+    def trim(self):
+        """Drops idle projectiles beyond the recent high-water mark."""
+        self.pool.trim()
+
+class Shot:
+    """Lightweight record of one analytic projectile in flight. Nothing steps
+    it; its position is origin + velocity * elapsed, kept only for drawing.
+    style is the firing tower type's ProjectileArchetype."""
+    __slots__ = ("seq", "style", "origin", "velocity", "fire_time", "hit_time", "end_time",
+                 "target", "target_id", "target_speed", "is_active")
+
+    @property
+    def damage(self):
+        return self.style.damage
+
+    def position(self, t):
+        """(x, y) at game time t."""
+        elapsed = t - self.fire_time
+        return (self.origin[0] + self.velocity[0] * elapsed,
+                self.origin[1] + self.velocity[1] * elapsed)
+
+class AnalyticProjectiles:
+    """Projectile mode that solves each shot's flight when it is fired: the
+    first enemy whose box the projectile crosses (assuming enemies keep their
+    current speed) and when. The hit is queued by game time and applied on the
+    first tick at or after it, so there are no per-tick projectile moves,
+    collision tests or pooled sprites. If the predicted target has died or
+    changed speed by then, the rest of the flight is solved again from the
+    start of that tick: speeds only change at tick starts (slows are applied
+    by the towers, expiries before the move), so every enemy's position then
+    is its current one wound back at its current speed, and a hit that the
+    new speed brought inside the tick is still found.
+
+    Times are read from the shared GameClock, which the simulation has
+    already advanced when the towers update; enemy positions seen by towers
+    belong to the start of the tick (clock.time - dt)."""
+    def __init__(self, bounds, clock):
+        self.bounds = bounds
+        self.clock = clock
+        self.dt = 0.0           # Length of the current tick (set by begin_tick)
+        self.enemy_index = None # PathProgressIndex of this tick, for candidate enemies
+        self.path = None        # Level PathTable and EnemyStore, taken from the first target
+        self.store = None
+        self.shots = {}         # seq -> in-flight Shot, in fire order (draw order)
+        self.events = []        # Heap of (time, seq, shot): impact or end of flight
+        self._seq = 0
+        self._speed_bound = 0.0 # Fastest enemy speed this tick (bounds candidate queries)
+        self._speed_bound_time = None
+
+    def clear(self):
+        """Drops every shot in flight (level load)."""
+        self.dt = 0.0
+        self._speed_bound_time = None
+        self.shots.clear()
+        self.events.clear()
+
+    def begin_tick(self, dt, enemy_index):
+        """Starts a tick of length dt (the clock is already at its end); called
+        before the towers update."""
+        self.dt = dt
+        self.enemy_index = enemy_index
+
+    def _max_enemy_speed(self):
+        """Upper bound on any enemy's speed, read from the store once per tick."""
+        if self._speed_bound_time != self.clock.ticks:
+            self._speed_bound = float(self.store.speed.max()) if self.store.capacity else 0.0
+            self._speed_bound_time = self.clock.ticks
+        return self._speed_bound
+
+    def _solve(self, shot, t, target=None, stale=0.0, rewind=0.0):
+        """First (time, enemy) the shot hits after t, or (end_time, None).
+        Enemies are taken at their current progress wound back rewind seconds
+        at their current speed, as of time t. target (if any) is tried first
+        to bound the search; other candidates come from the enemy grid, whose
+        positions may be `stale` seconds old."""
+        path = self.path
+        def progress_at_t(enemy):
+            return max(0.0, enemy.progress - max(enemy.speed, 0.0) * rewind) if rewind else enemy.progress
+        origin, velocity, half = shot.position(t), shot.velocity, shot.style.half
+        best_t, best = shot.end_time, None
+        if target is not None and target.slot is not None and target.is_active:
+            rect = target.rect
+            hit = path.box_intercept(progress_at_t(target), target.speed, origin, velocity,
+                                     (half + rect.width / 2, half + rect.height / 2), best_t - t)
+            if hit is not None:
+                best_t, best = t + hit, target
+        # Only enemies that can reach the flight segment up to best_t are candidates
+        flight = best_t - t
+        reach = self._max_enemy_speed() * (flight + stale)
+        mid = (origin[0] + velocity[0] * flight / 2, origin[1] + velocity[1] * flight / 2)
+        radius = math.hypot(velocity[0], velocity[1]) * flight / 2 + reach + SHOT_QUERY_MARGIN
+        for enemy in self.enemy_index.in_intervals(path.circle_intervals(mid, radius)):
+            if enemy is target or not enemy.is_active:
+                continue
+            rect = enemy.rect
+            # Searched slightly past best_t so an equal-time hit is seen for the tie-break
+            hit = path.box_intercept(progress_at_t(enemy), enemy.speed, origin, velocity,
+                                     (half + rect.width / 2, half + rect.height / 2), best_t - t + TIE_SLACK)
+            if hit is None:
+                continue
+            # Hits within TIE_SLACK of each other are a tie (float noise), won by the earlier spawn
+            if t + hit < best_t - (TIE_SLACK if best is not None else 0.0) or (
+                    best is not None and t + hit <= best_t + TIE_SLACK and enemy.spawn_id < best.spawn_id):
+                best_t, best = t + hit, enemy
+        return best_t, best
+
+    def _schedule(self, shot, hit_time, enemy):
+        """Queues the shot's predicted impact (or end of flight if enemy is None)."""
+        shot.hit_time = hit_time
+        shot.target = enemy
+        if enemy is not None:
+            shot.target_id = enemy.spawn_id
+            shot.target_speed = enemy.speed
+        heapq.heappush(self.events, (hit_time, shot.seq, shot))
+
+    def launch(self, style, start_pos, target, projectile_group):
+        """Fires a shot (ProjectileArchetype style) from start_pos at target's
+        current position and queues its outcome. projectile_group is unused
+        (no sprite is created)."""
+        dx, dy = target.rect.centerx - start_pos[0], target.rect.centery - start_pos[1]
+        length = math.hypot(dx, dy)
+        direction = (dx / length, dy / length) if length > 0 else (0.0, -1.0)
+
+        self.path, self.store = target.path, target.store
+        self._seq += 1
+        shot = Shot()
+        shot.seq = self._seq
+        shot.style = style
+        shot.origin = (float(start_pos[0]), float(start_pos[1]))
+        shot.velocity = (direction[0] * style.speed, direction[1] * style.speed)
+        fire_time = self.clock.time - self.dt # Towers see the state at the start of the tick
+        shot.fire_time = fire_time
+        shot.end_time = fire_time + flight_time(shot.origin, shot.velocity, style.half, self.bounds)
+        shot.is_active = True
+        self._schedule(shot, *self._solve(shot, fire_time, target))
+        self.shots[shot.seq] = shot
+        return True
+
+    def resolve(self):
+        """Yields (shot, enemy) for every impact due by the current time, in
+        impact order. Call after enemies have moved for the tick."""
+        events = self.events
+        now = self.clock.time
+        while events and events[0][0] <= now:
+            _, seq, shot = heapq.heappop(events)
+            if not shot.is_active:
+                continue
+            enemy = shot.target
+            valid = enemy is not None and enemy.slot is not None and enemy.is_active \
+                and enemy.spawn_id == shot.target_id and enemy.speed == shot.target_speed
+            if enemy is not None and not valid and shot.end_time > now:
+                # Target died or changed speed since the prediction: solve the rest of the flight
+                # from the start of this tick (a hit due before now is applied straight away)
+                hit_time, enemy = self._solve(shot, now - self.dt, enemy, stale=self.dt, rewind=self.dt)
+                self._schedule(shot, max(hit_time, now), enemy)
+                continue
+            shot.is_active = False
+            del self.shots[shot.seq]
+            if valid:
+                yield shot, enemy
+            # else: flew off the field or timed out
+
+    def in_flight(self):
+        """Shots not yet resolved, in fire order."""
+        return self.shots.values()
+
+    def render_positions(self, alpha):
+        """(ProjectileArchetype, (x, y)) for each shot, blended between the last two steps."""
+        t = self.clock.time - self.dt * (1.0 - alpha)
+        return [(shot.style, shot.position(min(t, shot.hit_time))) for shot in self.shots.values()]
+
 
 class TowerManager:
     # Map tower type IDs from JSON to their corresponding Python classes
@@ -42,51 +231,164 @@ class TowerManager:
         # Add more mappings as new tower classes are created
     }
 
-    def __init__(self, resource_manager, platform_group, tower_group, projectile_group):
-        """Initializes the Tower Manager."""
+    def __init__(self, resource_manager, platform_group, tower_group, projectile_group, world_rect,
+                 projectile_mode="stepped", clock=None, content=None, target_lock=True):
+        """Initializes the Tower Manager. world_rect bounds projectile flight;
+        projectile_mode is one of PROJECTILE_MODES; clock is the shared GameClock
+        tower cooldowns and wake-ups are timed on (a new one if omitted); content
+        is the ContentRegistry tower data comes from (the process-wide one if omitted).
+        target_lock=False makes towers re-pick their target for every shot."""
+        content = content if content is not None else load_content()
         self.resource_manager = resource_manager
         self.platform_group = platform_group       # Group of TowerPlatform sprites
         self.tower_group = tower_group             # Group to add created towers to
         self.projectile_group = projectile_group   # Group for projectiles fired by towers
-        self.tower_data = self._load_json("towers.json") # Load all tower definitions
-        self.projectile_pool = ProjectilePool()    # Manages projectile instances
+        self.tower_data = content.tower_data # All tower definitions (raw towers.json)
+        self.tower_types = content.tower_types # tower_id -> TowerArchetype, compiled from tower_data
+        self.projectile_pool = ProjectilePool(pygame.Rect(world_rect)) # Manages projectile instances
+        self.clock = clock if clock is not None else GameClock() # Game time for cooldowns, wake-ups and shots
+        self.shots = AnalyticProjectiles(pygame.Rect(world_rect), self.clock) # Shots in flight in "analytic" mode
+        self.projectile_mode = None
+        self.set_projectile_mode(projectile_mode)
 
         # State variables for player interaction
         self.selected_tower_type = None     # ID of tower type selected for building (e.g., "gun_tower")
         self.selected_placed_tower = None   # Reference to a placed tower sprite selected for upgrade/info
         self.placement_preview_sprite = None # Sprite showing tower placement preview
         self.placement_valid = False         # Flag indicating if current placement preview location is valid
+        self.path_table = None               # Current level's PathTable (tower range intervals)
+
+        # Targeting scheduler: towers only run when their wake time comes up (on self.clock)
+        self.max_enemy_speed = 0.0 # Fastest enemy type; bounds how soon one can reach a range
+        self.target_lock = target_lock
+        self.spawns_pending = True # More enemies will spawn at the path start (set by Simulation)
+        self.wake_queue = []       # Heap of (wake_time, seq, wake_token, tower)
+        self._wake_seq = 0
+        self.towers_acted = 0      # Towers that ran last update (the rest cost nothing); a profiler counter
 
         if not self.tower_data:
              raise RuntimeError("Failed to load tower data JSON file (towers.json).")
 
         print("TowerManager Initialized")
 
-    def _load_json(self, filename):
-        """Loads tower definitions from JSON in the data directory."""
-        file_path = os.path.join(DATA_DIR, filename)
+    def compile_tower_types(self):
+        """(Re)builds tower_types from tower_data. Call after editing tower_data;
+        towers placed from here on use the new archetypes."""
         try:
-            with open(file_path, 'r') as f:
-                # print(f"Loading JSON from: {file_path}") # Debug print
-                return json.load(f)
-        except FileNotFoundError:
-            print(f"Error: Tower JSON file not found at {file_path}")
-            return {}
-        except json.JSONDecodeError:
-            print(f"Error: Could not decode JSON from {file_path}")
-            return {}
-
-    def select_tower_type(self, tower_type_id):
-        """Sets the tower type the player intends to build."""
+            self.tower_types = compile_towers(self.tower_data)
+        except ValueError as e:
+            raise RuntimeError(f"Invalid tower data in towers.json: {e}") from e
+
+    def set_projectile_mode(self, mode):
+        """Switches how towers' projectiles are resolved (see PROJECTILE_MODES).
+        Placed towers are re-pointed; shots already in flight are dropped."""
+        if mode not in PROJECTILE_MODES:
+            raise ValueError(f"Unknown projectile mode '{mode}' (expected one of {PROJECTILE_MODES})")
+        self.projectile_mode = mode
+        for projectile in self.projectile_group.sprites():
+            projectile.destroy()
+        self.shots.clear()
+        for tower in self.tower_group:
+            tower.projectile_pool = self._launcher()
+
+    def set_path(self, path_table, max_enemy_speed):
+        """Sets the level path that towers compute their range intervals on, and
+        the fastest enemy speed (used to decide how long idle towers may sleep).
+        Placed towers are re-placed on the new path."""
+        self.path_table = path_table
+        self.max_enemy_speed = max_enemy_speed
+        self.wake_queue.clear()
+        for tower in self.tower_group:
+            self._install_tower(tower)
+
+    def prewarm_projectiles(self):
+        """Pre-creates stepped projectiles per tower type: enough for every placed
+        tower's shots to be in flight at once (flight to the edge of its range
+        over its cooldown, plus one), so firing doesn't allocate mid-wave."""
+        if self.projectile_mode != "stepped":
+            return # Analytic shots are plain records, not pooled sprites
+        per_type = {}
+        for tower in self.tower_group:
+            archetype = tower.archetype
+            if isinstance(tower, SlowTower) or archetype.cooldown_span == INF:
+                continue
+            projectile = archetype.projectile
+            flight = archetype.range / projectile.speed if projectile.speed > 0 else 0.0
+            in_flight = math.ceil(flight / archetype.cooldown_span) + 1
+            per_type[projectile.pool_key] = per_type.get(projectile.pool_key, 0) + in_flight
+        for pool_key, count in per_type.items():
+            self.projectile_pool.prewarm(pool_key, count)
+
+    def _install_tower(self, tower):
+        """Precomputes the path-distance intervals inside the tower's range circle,
+        starts its cooldown and queues its first wake-up."""
+        intervals = []
+        if self.path_table is not None:
+            intervals = self.path_table.circle_intervals(tower.rect.center, tower.range)
+        tower.place(self.clock, intervals)
+        tower.asleep = False
+        self._schedule(tower, tower.ready_time)
+
+    def _schedule(self, tower, wake_time):
+        """Queues tower to act at wake_time (never, if infinite)."""
+        tower.wake_token += 1
+        tower.wake_time = wake_time
+        if wake_time < INF:
+            self._wake_seq += 1
+            heapq.heappush(self.wake_queue, (wake_time, self._wake_seq, tower.wake_token, tower))
+
+    def _approach_time(self, tower, enemy_index, now):
+        """Earliest game time any enemy could be inside tower's range: the
+        closest enemy (or a fresh spawn) short of each covered stretch of path,
+        moving at the fastest enemy speed. Enemies never move backwards."""
+        if not tower.path_intervals or self.max_enemy_speed <= 0:
+            return INF
+        gap = INF
+        for start, end in tower.path_intervals:
+            behind = enemy_index.furthest_before(start)
+            if behind is None and self.spawns_pending:
+                behind = 0.0 # The next spawn
+            if behind is not None:
+                gap = min(gap, start - behind)
+        # Index positions are from the end of the previous step
+        return now + gap / self.max_enemy_speed
+
+    def _wake_for_placed(self, placed, now):
+        """Enemies put down mid-path (scripted spawns, teleports) can be closer to
+        a sleeping tower's coverage than anything its wake time accounted for:
+        bring those towers' wake-ups forward."""
+        if self.max_enemy_speed <= 0:
+            return
+        for tower in self.tower_group:
+            if not tower.asleep:
+                continue
+            gap = INF
+            for progress in placed:
+                for start, end in tower.path_intervals:
+                    if progress <= end:
+                        gap = min(gap, max(0.0, start - progress))
+            if gap < INF:
+                wake = tower.wake_time_for(now + gap / self.max_enemy_speed)
+                if wake < tower.wake_time:
+                    self._schedule(tower, wake)
+
+    def _launcher(self):
+        """What towers fire through in the current projectile mode."""
+        return self.shots if self.projectile_mode == "analytic" else self.projectile_pool
+
+    def select_tower_type(self, tower_type_id, mouse_pos=None):
+        """Sets the tower type the player intends to build.
+        mouse_pos (optional) positions the placement preview immediately."""
         if self.selected_placed_tower: # Deselect placed tower if selecting a build type
              self.selected_placed_tower.is_selected = False
              self.selected_placed_tower = None
 
-        if tower_type_id in self.tower_data:
+        if tower_type_id in self.tower_types:
              self.selected_tower_type = tower_type_id
              print(f"Selected tower type for build: {tower_type_id}")
-             # Immediately create/update the placement preview sprite
-             self._update_placement_preview(pygame.mouse.get_pos())
+             # Immediately create/update the placement preview sprite (not in headless runs)
+             if mouse_pos is not None:
+                 self._update_placement_preview(mouse_pos)
         else:
             print(f"Error: Unknown tower type ID requested: {tower_type_id}")
             self.deselect_tower() # Clear selection if invalid type
@@ -134,25 +436,25 @@ class TowerManager:
         if target_platform.occupied:
              return False
 
-        tower_config = self.tower_data.get(self.selected_tower_type)
-        if not tower_config:
+        archetype = self.tower_types.get(self.selected_tower_type)
+        if not archetype:
             return False
-        cost = tower_config.get('cost', 0)
-        if not self.resource_manager.spend_resources(cost):
+        if not self.resource_manager.spend_resources(archetype.cost):
              return False
 
         # Placement Successful
         TowerClass = self.TOWER_TYPE_MAP.get(self.selected_tower_type, Tower)
         new_tower = TowerClass(
-             tower_id=self.selected_tower_type,
-             tower_data=tower_config,
+             archetype=archetype,
              pos=target_platform.rect.center,
-             projectile_pool=self.projectile_pool,
+             projectile_pool=self._launcher(),
              projectile_group=self.projectile_group
         )
+        self._install_tower(new_tower)
         self.tower_group.add(new_tower)
         target_platform.occupied = True
         target_platform.tower = new_tower
+        self.prewarm_projectiles()
         return True
 
     def attempt_upgrade(self):
@@ -162,26 +464,17 @@ class TowerManager:
             return False
 
         current_tower = self.selected_placed_tower
-        tower_id = current_tower.tower_id
-        # Use the data stored on the tower instance itself
-        current_config = current_tower.data # Get config from the tower's own data attribute
+        # Use the archetype the tower was built from
+        current_type = current_tower.archetype
 
-        if not current_config:
-            print(f"Upgrade failed: Cannot find config data on selected tower instance {tower_id}")
-            return False
-
-        # 1. Check if upgrade path exists in its data
-        upgrades_to_id = current_config.get("upgrades_to")
+        # 1. Check if upgrade path exists in its data (compile_towers checked it names a known tower)
+        upgrades_to_id = current_type.upgrades_to
         if not upgrades_to_id:
             print(f"Upgrade failed: {current_tower.name} has no 'upgrades_to' defined.")
             return False
-        # Check if the target upgrade ID exists in our loaded tower data
-        if upgrades_to_id not in self.tower_data:
-            print(f"Upgrade failed: Target upgrade ID '{upgrades_to_id}' not found in towers.json.")
-            return False
 
         # 2. Check Cost (defined in the *current* tower's config)
-        upgrade_cost = current_config.get("upgrade_cost", 0)
+        upgrade_cost = current_type.upgrade_cost
         if upgrade_cost <= 0:
              print(f"Upgrade failed: No valid 'upgrade_cost' defined for {current_tower.name}.")
              return False
@@ -193,7 +486,7 @@ class TowerManager:
 
         # --- Upgrade Successful ---
         print(f"Upgrading {current_tower.name} to {upgrades_to_id}...")
-        upgrade_config = self.tower_data[upgrades_to_id] # Get data for the NEW tower
+        upgrade_type = self.tower_types[upgrades_to_id] # Archetype of the NEW tower
         platform = None
 
         # Find the platform the current tower is on
@@ -215,17 +508,18 @@ class TowerManager:
 
         # Create the new, upgraded tower instance
         upgraded_tower = UpgradeTowerClass(
-             tower_id=upgrades_to_id,        # Use the NEW tower ID
-             tower_data=upgrade_config,      # Use the NEW tower config data
+             archetype=upgrade_type,         # Use the NEW tower type
              pos=platform.rect.center,       # Same position
-             projectile_pool=self.projectile_pool, # Pass same pool/group refs
+             projectile_pool=self._launcher(), # Pass same pool/group refs
              projectile_group=self.projectile_group
         )
 
         # --- Replace the tower ---
         current_tower.kill() # Remove old tower sprite from all groups
+        self._install_tower(upgraded_tower) # Range may have changed; cooldown starts over
         self.tower_group.add(upgraded_tower) # Add the new tower sprite to the group
         platform.tower = upgraded_tower # Update platform reference to the new tower
+        self.prewarm_projectiles()
 
         # Deselect after successful upgrade
         self.selected_placed_tower = None
@@ -242,15 +536,15 @@ class TowerManager:
              self.placement_preview_sprite = None
              return
 
-         tower_config = self.tower_data.get(self.selected_tower_type)
-         if not tower_config: # Should not happen if selection is valid
+         archetype = self.tower_types.get(self.selected_tower_type)
+         if not archetype: # Should not happen if selection is valid
               self.placement_preview_sprite = None
               return
 
-         size = tower_config.get('size', (30, 30))
-         color = tower_config.get('color', (128, 128, 128))
-         range_val = tower_config.get('range', 100)
-         cost = tower_config.get('cost', 0)
+         size = archetype.size
+         color = PREVIEW_COLOR
+         range_val = archetype.range
+         cost = archetype.cost
 
          # Create or reuse the preview sprite structure
          if self.placement_preview_sprite is None:
@@ -292,13 +586,32 @@ class TowerManager:
              self.placement_preview_sprite.rect.center = collided_platform.rect.center
 
 
-    def update(self, dt, enemies_group, mouse_pos):
-         """Updates all towers' logic and the placement preview sprite."""
-         # Update individual towers (targeting, firing, pulsing based on their update method)
-         self.tower_group.update(dt, enemies_group) # Calls update() on each sprite in the group
+    def update(self, dt, enemy_index, mouse_pos=None):
+         """Runs the towers that are due (see Tower.act) and the placement preview sprite.
+         enemy_index is the PathProgressIndex all tower range queries go through.
+         mouse_pos is None when running headless (no preview)."""
+         if self.projectile_mode == "analytic":
+             self.shots.begin_tick(dt, enemy_index)
+         # Only towers whose wake time has come run: cooling down and idle towers are skipped
+         now = self.clock.time
+         if enemy_index.placed: # Before the due check, so a tower woken for now acts this tick
+             self._wake_for_placed(enemy_index.placed, now)
+         queue = self.wake_queue
+         due = []
+         while queue and queue[0][0] <= now + WAKE_EPSILON:
+             _, _, token, tower = heapq.heappop(queue)
+             if token == tower.wake_token and tower.alive(): # Not rescheduled or removed since
+                 due.append(tower)
+         for tower in due:
+             next_wake = tower.act(now, enemy_index, self.target_lock)
+             tower.asleep = next_wake is None
+             if tower.asleep: # Nothing in range: sleep until an enemy could get there
+                 next_wake = tower.wake_time_for(self._approach_time(tower, enemy_index, now))
+             self._schedule(tower, next_wake)
+         self.towers_acted = len(due)
 
          # Update placement preview position and validity check (only if building)
-         if self.selected_tower_type:
+         if self.selected_tower_type and mouse_pos is not None:
              self._update_placement_preview(mouse_pos)
          else:
              self.placement_preview_sprite = None # Ensure preview is hidden if not building
@@ -1,13 +1,21 @@
 # src/tower_platform.py
 import pygame
 from .config import (PLATFORM_SIZE, PLATFORM_COLOR_IDX,
-                   PLATFORM_BORDER_COLOR_IDX, get_color) # Use palette
+                   PLATFORM_BORDER_COLOR_IDX, get_color, get_palette_version) # Use palette
 
 class TowerPlatform(pygame.sprite.Sprite):
     def __init__(self, x, y):
         """Initializes a tower placement platform."""
         super().__init__()
+        self.rect = pygame.Rect((0, 0), PLATFORM_SIZE)
+        self.rect.center = (x, y)
+        self._palette_version = None
+        self.render_image()
+        self.occupied = False
+        self.tower = None
 
+    def render_image(self):
+        """(Re)draws the platform image with the active palette."""
         # --- Define Shape using pygame.draw ---
         self.image = pygame.Surface(PLATFORM_SIZE, pygame.SRCALPHA) # Use SRCALPHA for potential transparency
         self.image.set_colorkey((0,0,0)) # Make black transparent if needed
@@ -18,10 +26,7 @@ class TowerPlatform(pygame.sprite.Sprite):
 
         pygame.draw.rect(self.image, fill_color, platform_rect, border_radius=3) # Fill
         pygame.draw.rect(self.image, border_color, platform_rect, 1, border_radius=3) # Border
-
-        self.rect = self.image.get_rect(center=(x, y))
-        self.occupied = False
-        self.tower = None
+        self._palette_version = get_palette_version()
 
     def update(self, *args, **kwargs):
         """Platforms generally don't need much update logic themselves."""
@@ -29,5 +34,7 @@ class TowerPlatform(pygame.sprite.Sprite):
 
     # Keep draw method for now, as platforms use self.image which is pre-rendered in __init__
     def draw(self, screen):
-        """Explicit draw method."""
-        screen.blit(self.image, self.rect)
\ No newline at end of file
+        """Explicit draw method (re-renders first if the palette changed)."""
+        if self._palette_version != get_palette_version():
+            self.render_image()
+        screen.blit(self.image, self.rect)
@@ -2,31 +2,22 @@
 import pygame
 import math
 from .config import get_color # Use palette helper
+from .path_index import in_coverage
 
 # --- Add timing constants ---
 FIRING_FLASH_DURATION = 0.1 # Seconds the firing flash lasts
 SLOW_TOWER_PULSE_SPEED = 4.0 # Radians per second for slow tower idle pulse
+SLOW_TOWER_PULSE_FRAMES = 12 # Discrete pulse scales baked into the sprite cache
 
 class Tower(pygame.sprite.Sprite):
     """Base class for all towers."""
-    def __init__(self, tower_id, tower_data, pos, projectile_pool, projectile_group):
-        """Initializes a tower instance."""
+    def __init__(self, archetype, pos, projectile_pool, projectile_group):
+        """Initializes a tower instance. archetype is the type's compiled
+        TowerArchetype; per-type fields are read from it, not copied."""
         super().__init__()
 
-        self.tower_id = tower_id
-        self.data = tower_data # Store the raw data dict from JSON
-        self.name = tower_data.get('name', 'Unknown Tower')
-        self.range = tower_data.get('range', 100)
-        self.fire_rate = tower_data.get('fire_rate', 1.0)
-        self.cost = tower_data.get('cost', 100)
-        self.size = tower_data.get('size', (30, 30)) # Keep size for rect/range draw
-
-        # Store shape info from data
-        self.shape_type = tower_data.get("shape_type", "rect")
-        self.shape_points = tower_data.get("shape_points", [])
-        self.fill_color_idx = tower_data.get("fill_color_idx", 10) # Default Grey index
-        self.border_color_idx = tower_data.get("border_color_idx", 1) # Default White index
-        self.border_width = tower_data.get("border_width", 1)
+        self.archetype = archetype
+        self.tower_id = archetype.type_id
 
         self.pos = pygame.Vector2(pos)
         self.projectile_pool = projectile_pool
@@ -43,55 +34,115 @@ class Tower(pygame.sprite.Sprite):
         #      print(f"Warning: Could not draw inner rect for tower {self.name}. Error: {e}")
         # self.rect = self.image.get_rect(center=self.pos)
         # --- Create rect based on size ---
-        self.rect = pygame.Rect(0, 0, self.size[0], self.size[1])
+        self.rect = pygame.Rect(0, 0, archetype.size[0], archetype.size[1])
         self.rect.center = self.pos
 
-        self.firing_flash_timer = 0.0 # Timer for firing flash effect
-
-        # State variables
+        # State variables. Timers are stored as game times on the TowerManager's
+        # clock, so a tower that is not being updated (asleep) still ages correctly.
+        self.clock = None       # GameClock; set by TowerManager.place_tower_sprite
+        self.placed_at = 0.0
+        self.fired_at = 0.0     # Game time of the last shot/pulse (placement until then)
+        self.ready_time = 0.0   # Game time the cooldown ends
+        self.flash_until = 0.0  # Game time the firing flash ends
+        self.wake_token = 0     # Bumped on every reschedule; stale wake-ups are ignored
+        self.wake_time = 0.0    # Game time of the queued wake-up (inf: none)
+        self.asleep = False     # Found nothing in range last time; waiting for an enemy to approach
         self.target = None
-        self.last_shot_time = 0.0
-        self.cooldown = 1.0 / self.fire_rate if self.fire_rate > 0 else float('inf')
+        self.target_id = None   # spawn_id of target (pooled enemy views get reused)
         self.is_selected = False
-
-    # find_targets_in_range, find_target remain the same
-    def find_targets_in_range(self, enemies_group):
-        """Finds all active enemies within the tower's range."""
-        targets = []
-        range_sq = self.range ** 2 # Use squared distance for efficiency
-        for enemy in enemies_group:
-            if enemy.is_active: # Only consider active enemies
-                dist_sq = (enemy.pos - self.pos).length_squared()
-                if dist_sq <= range_sq:
-                    targets.append(enemy)
-        return targets
-
-    def find_target(self, enemies_group):
-         """Finds the single 'best' target (e.g., nearest) from those in range."""
-         targets_in_range = self.find_targets_in_range(enemies_group)
-         closest_enemy = None
-         min_dist_sq = float('inf') # Initialize with infinity
-
-         for enemy in targets_in_range:
-             dist_sq = (enemy.pos - self.pos).length_squared()
-             if dist_sq < min_dist_sq:
-                 min_dist_sq = dist_sq
-                 closest_enemy = enemy
-
-         self.target = closest_enemy # Update the tower's target
-
-    def update(self, dt, enemies_group):
-        """Base update method for projectile towers."""
-        # --- Update Animation Timers ---
-        if self.firing_flash_timer > 0:
-            self.firing_flash_timer -= dt
-        self.find_target(enemies_group)
-        self.last_shot_time += dt
-        if self.last_shot_time >= self.cooldown:
-             if self.target and self.target.is_active:
-                  if self.fire():
-                       self.last_shot_time = 0.0
-                       self.firing_flash_timer = FIRING_FLASH_DURATION # Start the flash
+        self.path_intervals = [] # Path-distance intervals inside range; set by TowerManager on placement
+
+    # --- Per-type data, read from the archetype ---
+    @property
+    def data(self):
+        """The raw towers.json entry (UI and upgrade lookups)."""
+        return self.archetype.data
+
+    @property
+    def name(self):
+        return self.archetype.name
+
+    @property
+    def range(self):
+        return self.archetype.range
+
+    @property
+    def fire_rate(self):
+        return self.archetype.fire_rate
+
+    @property
+    def cost(self):
+        return self.archetype.cost
+
+    @property
+    def size(self):
+        return self.archetype.size
+
+    @property
+    def targeting(self):
+        return self.archetype.targeting
+
+    @property
+    def cooldown(self):
+        return self.archetype.cooldown
+
+    @property
+    def cooldown_span(self):
+        """Cooldown rounded up to whole simulation steps."""
+        return self.archetype.cooldown_span
+
+    def place(self, clock, path_intervals):
+        """Starts the tower on clock: the first shot comes one cooldown after placement."""
+        self.clock = clock
+        self.path_intervals = path_intervals
+        self.placed_at = self.fired_at = clock.time
+        self.ready_time = clock.time + self.cooldown_span
+
+    @property
+    def last_shot_time(self):
+        """Seconds since the last shot (or placement)."""
+        return self.clock.time - self.fired_at if self.clock else 0.0
+
+    @property
+    def firing_flash_timer(self):
+        """Seconds left on the firing flash (<= 0 when not flashing)."""
+        return self.flash_until - self.clock.time if self.clock else 0.0
+
+    def find_targets_in_range(self, enemy_index):
+        """Finds all active enemies within the tower's range.
+        enemy_index is the per-tick PathProgressIndex of enemies."""
+        return enemy_index.in_intervals(self.path_intervals)
+
+    def find_target(self, enemy_index):
+         """Picks the target among the enemies in range by the tower's targeting strategy."""
+         self.target = enemy_index.select(self.targeting, self.path_intervals, self.pos) # Update the tower's target
+         self.target_id = self.target.spawn_id if self.target else None
+
+    def target_locked(self):
+        """True while the current target is alive and still inside the range."""
+        target = self.target
+        return (target is not None and target.is_active and target.spawn_id == self.target_id
+                and in_coverage(self.path_intervals, target.progress))
+
+    def act(self, now, enemy_index, target_lock=True):
+        """Runs once the cooldown has expired (TowerManager calls it; towers are
+        not updated every tick). Keeps the locked target if it is still valid
+        (unless target_lock is off: then it re-picks for every shot), otherwise
+        picks a new one, and fires. Returns the game time the tower next needs
+        to act, or None if nothing is in range."""
+        if not (target_lock and self.target_locked()):
+            self.find_target(enemy_index)
+        if self.target is None or not self.fire():
+            return None
+        self.fired_at = now
+        self.flash_until = now + FIRING_FLASH_DURATION # Start the flash
+        self.ready_time = now + self.cooldown_span
+        return self.ready_time
+
+    def wake_time_for(self, approach_time):
+        """When to act again after finding nothing in range, given the earliest
+        time an enemy can reach the range."""
+        return max(approach_time, self.ready_time)
 
     def fire(self):
         """Default fire method: Creates and launches a projectile."""
@@ -101,56 +152,17 @@ class Tower(pygame.sprite.Sprite):
              print(f"Critical Error: {self.name} FAILED 'is None' check for pool/group!")
              return False
 
-        # Pass the tower's full data dict, which now includes projectile shape info
-        projectile = self.projectile_pool.get(self.data, self.rect.center, self.target.rect.center)
-
-        if projectile:
-            self.projectile_group.add(projectile)
-            return True
-        else:
-             # print(f"Error: {self.name} failed to get projectile from pool.") # Quieter
-             return False
-
-    def draw_shape(self, surface):
-        """Draws the tower's shape using pygame.draw, including animations."""
-        # Determine fill color based on animation state
-        if self.firing_flash_timer > 0:
-            # Use a bright flash color (e.g., palette index 1 - White/Accent)
-            fill_color = get_color(1)
-        else:
-            # Use the tower's normal fill color
-            fill_color = get_color(self.fill_color_idx)
-
-        border_color = get_color(self.border_color_idx)
-        center_x, center_y = self.rect.centerx, self.rect.centery
-
-        # --- Draw Base Shape ---
-        if self.shape_type == "rect":
-            pygame.draw.rect(surface, fill_color, self.rect)
-            if self.border_width > 0:
-                pygame.draw.rect(surface, border_color, self.rect, self.border_width)
-        elif self.shape_type == "circle":
-             radius = self.size[0] // 2
-             pygame.draw.circle(surface, fill_color, self.rect.center, radius)
-             if self.border_width > 0:
-                 pygame.draw.circle(surface, border_color, self.rect.center, radius, self.border_width)
-        elif self.shape_type == "polygon":
-            abs_points = [(center_x + p[0], center_y + p[1]) for p in self.shape_points]
-            if len(abs_points) > 2:
-                pygame.draw.polygon(surface, fill_color, abs_points)
-                if self.border_width > 0:
-                    pygame.draw.polygon(surface, border_color, abs_points, self.border_width)
-            else: # Fallback
-                pygame.draw.rect(surface, fill_color, self.rect)
-                if self.border_width > 0:
-                    pygame.draw.rect(surface, border_color, self.rect, self.border_width)
-
-        # --- Draw Inner Detail (Optional - Not animated here) ---
-        inner_radius = max(1, self.size[0] // 5) # Smaller detail
-        inner_color = border_color # Use border color for contrast
-        pygame.draw.circle(surface, inner_color, self.rect.center, inner_radius)
+        # projectile_pool is a ProjectilePool or AnalyticProjectiles, depending on the mode
+        return self.projectile_pool.launch(self.archetype.projectile, self.rect.center,
+                                           self.target, self.projectile_group)
 
+    def animation_frame(self):
+        """Cached sprite frame for idle animation (None: static tower)."""
+        return None
 
+    def frame_scale(self, frame):
+        """Draw scale for an animation frame."""
+        return 1.0
 
     def draw_range(self, surface):
         """Draws the tower's range indicator, brighter if selected."""
@@ -172,83 +184,59 @@ class CannonTower(Tower):
 
 class SlowTower(Tower):
     """Applies a slowing effect to enemies within range periodically."""
-    def __init__(self, tower_id, tower_data, pos, projectile_pool, projectile_group):
-        super().__init__(tower_id, tower_data, pos, projectile_pool, projectile_group)
-        self.slow_factor = tower_data.get('slow_factor', 0.5)
-        self.slow_duration = tower_data.get('slow_duration', 2.0)
-        self.pulse_cooldown = 1.0 / self.fire_rate if self.fire_rate > 0 else float('inf')
-        # Idle animation specific state
-        self.idle_pulse_timer = 0.0 # Timer for pulsing effect
-
-    def update(self, dt, enemies_group):
-        """Overrides base update for pulsing effect and idle animation."""
-        # --- Update Animation Timers ---
-        self.idle_pulse_timer += dt # Update idle pulse timer
-
-        # --- Apply Slow Effect Logic ---
-        self.last_shot_time += dt # Use base class timer
-        if self.last_shot_time >= self.pulse_cooldown:
-            self.last_shot_time = 0.0 # Reset pulse timer
-
-            targets_in_range = self.find_targets_in_range(enemies_group)
-            if targets_in_range:
-                 # Add visual pulse effect trigger here later (Phase 9)
-                 for enemy in targets_in_range:
-                     if enemy.is_active:
-                         enemy.apply_slow(self.slow_factor, self.slow_duration)
+    @property
+    def slow_factor(self):
+        return self.archetype.slow_factor
+
+    @property
+    def slow_duration(self):
+        return self.archetype.slow_duration
+
+    @property
+    def pulse_span(self):
+        """Seconds between pulses, in whole simulation steps."""
+        return self.archetype.cooldown_span
+
+    @property
+    def idle_pulse_timer(self):
+        """Time driving the idle pulse animation (seconds since placement)."""
+        return self.clock.time - self.placed_at if self.clock else 0.0
+
+    def place(self, clock, path_intervals):
+        super().place(clock, path_intervals)
+        self.ready_time = clock.time + self.pulse_span
+
+    def act(self, now, enemy_index, target_lock=True):
+        """Pulses on a fixed cadence, slowing every enemy in range (there is no
+        target to lock). Returns the next pulse time, or None if the pulse
+        found nobody."""
+        self.fired_at = now
+        self.ready_time = now + self.pulse_span
+        targets_in_range = self.find_targets_in_range(enemy_index)
+        if not targets_in_range:
+            return None
+        # Add visual pulse effect trigger here later (Phase 9)
+        for enemy in targets_in_range:
+            if enemy.is_active:
+                enemy.apply_slow(self.slow_factor, self.slow_duration)
+        return self.ready_time
+
+    def wake_time_for(self, approach_time):
+        """First pulse on the cadence at or after approach_time; the pulses
+        skipped while asleep could not have reached anyone."""
+        if approach_time == float('inf'):
+            return approach_time
+        pulses = max(1, math.ceil((approach_time - self.fired_at) / self.pulse_span - 1e-9))
+        return self.fired_at + pulses * self.pulse_span
 
     def fire(self):
          return False # Slow tower doesn't fire projectiles
 
-    def draw_shape(self, surface):
-        """Draws the slow tower with an idle pulse animation."""
-        # --- Calculate Idle Pulse Scale ---
-        # Use a sine wave for smooth pulsing, cycle based on idle_pulse_timer
-        # Scale ranges from e.g., 0.8 to 1.0
-        pulse_scale = 0.9 + (math.sin(self.idle_pulse_timer * SLOW_TOWER_PULSE_SPEED) * 0.1)
-
-        # --- Get Colors ---
-        fill_color = get_color(self.fill_color_idx)
-        border_color = get_color(self.border_color_idx)
-        center_x, center_y = self.rect.centerx, self.rect.centery
-
-        # --- Draw Base Shape (Scaled) ---
-        if self.shape_type == "rect":
-            # Scale the rect size and redraw centered
-            w, h = self.rect.width * pulse_scale, self.rect.height * pulse_scale
-            scaled_rect = pygame.Rect(0, 0, w, h)
-            scaled_rect.center = self.rect.center
-            pygame.draw.rect(surface, fill_color, scaled_rect)
-            if self.border_width > 0:
-                pygame.draw.rect(surface, border_color, scaled_rect, self.border_width)
-        elif self.shape_type == "circle":
-            # Scale the radius
-             radius = int((self.size[0] // 2) * pulse_scale)
-             pygame.draw.circle(surface, fill_color, self.rect.center, radius)
-             if self.border_width > 0:
-                 pygame.draw.circle(surface, border_color, self.rect.center, radius, self.border_width)
-        elif self.shape_type == "polygon":
-            # Scale the points relative to the center
-            abs_points = [(center_x + p[0] * pulse_scale, center_y + p[1] * pulse_scale) for p in self.shape_points]
-            if len(abs_points) > 2:
-                pygame.draw.polygon(surface, fill_color, abs_points)
-                if self.border_width > 0:
-                    pygame.draw.polygon(surface, border_color, abs_points, self.border_width)
-            else: # Fallback
-                 pygame.draw.rect(surface, fill_color, self.rect) # Draw unscaled fallback
-                 if self.border_width > 0:
-                     pygame.draw.rect(surface, border_color, self.rect, self.border_width)
-
-        # --- Draw Inner Detail (Optional - Also potentially scaled) ---
-        inner_radius = max(1, int((self.size[0] // 5) * pulse_scale)) # Scale inner detail too
-        inner_color = border_color
-        pygame.draw.circle(surface, inner_color, self.rect.center, inner_radius)
-        # Add a pulsing visual element later? For now, base draw is enough.
-        # Example: Draw a slightly smaller inner polygon that pulses?
-        # pulse_scale = 0.5 + (math.sin(pygame.time.get_ticks() * 0.005) + 1) * 0.2 # Slow pulse scale
-        # inner_color = get_color(4) # Use blue?
-        # center_x, center_y = self.rect.centerx, self.rect.centery
-        # if self.shape_type == "polygon":
-        #     inner_points = [(center_x + p[0] * pulse_scale, center_y + p[1] * pulse_scale) for p in self.shape_points]
-        #     if len(inner_points) > 2:
-        #         pygame.draw.polygon(surface, inner_color, inner_points)
\ No newline at end of file
+    def animation_frame(self):
+        """Idle pulse quantized to SLOW_TOWER_PULSE_FRAMES cached sprites."""
+        phase = self.idle_pulse_timer * SLOW_TOWER_PULSE_SPEED / (2 * math.pi)
+        return int(phase * SLOW_TOWER_PULSE_FRAMES) % SLOW_TOWER_PULSE_FRAMES
+
+    def frame_scale(self, frame):
+        """Pulse scale for a frame, ranging 0.8 .. 1.0."""
+        return 0.9 + math.sin(2 * math.pi * frame / SLOW_TOWER_PULSE_FRAMES) * 0.1
@@ -1,33 +1,36 @@
 # src/ui_manager.py
 import pygame
 # Import get_color instead of specific colors
-from .config import (get_color, # Import the helper function
+from .config import (get_color, get_palette_version, # Import the helper functions
                    SCREEN_WIDTH, SCREEN_HEIGHT, SCREEN_SIZE, # Keep screen stuff
                    STATE_PLAYING, STATE_PAUSED, STATE_GAME_OVER, STATE_VICTORY) # Keep states
+from .fonts import get_font, FONT_TINY, FONT_SMALL, FONT_MEDIUM, FONT_LARGE, FONT_XL, MONO_FONT
+from .text_renderer import TextRenderer
+from .hud import HudWidget
+
+MAX_CACHED_PANELS = 32
+# States drawn as a frozen game frame under a full-screen overlay (nothing moves)
+OVERLAY_STATES = (STATE_PAUSED, STATE_GAME_OVER, STATE_VICTORY)
 
 class UIManager:
-    def __init__(self, resource_manager, wave_manager, core):
+    def __init__(self, resource_manager, wave_manager, core, tower_manager=None):
         self.resource_manager = resource_manager
         self.wave_manager = wave_manager
         self.core = core
-        self._font_tiny = pygame.font.SysFont(None, 18)
-        self._font_small = pygame.font.SysFont(None, 24)
-        self._font_medium = pygame.font.SysFont(None, 36)
-        self._font_large = pygame.font.SysFont(None, 72)
-        self._font_xl = pygame.font.SysFont(None, 96)
-
-        self.selected_tower_type = None
-        self.selected_tower_data = None
-        self.selected_placed_tower_data = None
-        self.selected_placed_tower_id = None
-        self.full_tower_data = {} # Will be populated by main.py
+        self.tower_manager = tower_manager # Build/placed tower selection for the info panel
+        # Fonts are created on first use (get_font caches them by size);
+        # text is drawn from per-size/color glyph atlases with a string cache
+        self.text = TextRenderer()
 
         # --- UI Panel Settings ---
         # Use palette indices
         self.panel_color_idx = 15    # e.g., Dark Panel BG
         self.panel_border_color_idx = 1 # e.g., White/Accent border
+        self.panel_padding = 10
         self.top_panel_height = 50
         self.bottom_panel_height = 70
+        self._panels = {} # (size, fill, border, width) -> pre-composited panel surface
+        self._panel_version = get_palette_version()
 
         # Define standard text color indices
         self.text_color_idx = 1       # Default text (White/Accent)
@@ -37,243 +40,313 @@ class UIManager:
         self.neutral_color_idx = 2    # Neutral info (Grey)
         self.highlight_color_idx = 7  # Highlights (Yellow)
 
+        # --- Overlay states: cached overlays and the frozen frame they sit on ---
+        self.overlay_builders = {STATE_PAUSED: self._build_pause,
+                                 STATE_GAME_OVER: self._build_game_over,
+                                 STATE_VICTORY: self._build_victory}
+        self._overlays = {} # game_state -> premultiplied SCREEN_SIZE overlay
+        self._overlay_version = get_palette_version()
+        self._frozen_base = None  # Copy of the last game frame, taken on entering an overlay state
+        self._frozen_frame = None # _frozen_base with the overlay composited (presented as-is)
+        self._frozen_key = None   # (game_state, palette version) _frozen_frame was built for
+
+        # --- Retained HUD: each widget re-renders only when its bound value changes ---
+        self.hud_widgets = [
+            HudWidget("resources", lambda: self.resource_manager.resources, self._render_resources),
+            HudWidget("wave", self._wave_state, self._render_wave),
+            HudWidget("timer", self._timer_state, self._render_timer),
+            HudWidget("core", self._core_state, self._render_core),
+            HudWidget("info_panel", self._selection_state, self._render_info_panel),
+        ]
+
         print("UIManager Initialized")
 
-    def _render_text(self, text, font, color_idx):
-        """Renders text using a palette color index."""
-        color = get_color(color_idx)
-        return font.render(text, True, color)
+    def _render_text(self, text, size, color_idx, font_name=None):
+        """Renders text at a font size using a palette color index (cached surface, don't modify)."""
+        return self.text.render(text, size, color_idx, font_name)
+
+    def _label(self, text, size, color_idx, **anchor):
+        """[(surface, rect)] for one line of text placed by a get_rect anchor (e.g. topleft=...)."""
+        surf = self._render_text(text, size, color_idx)
+        return [(surf, surf.get_rect(**anchor))]
+
+    def _panel(self, size, fill_color_idx, border_color_idx=None, border_width=1):
+        """Semi-transparent panel surface, composited once per size and palette."""
+        version = get_palette_version()
+        if version != self._panel_version or len(self._panels) > MAX_CACHED_PANELS:
+            self._panels.clear() # Palette changed (or the profiler panel kept resizing)
+            self._panel_version = version
+        key = (size, fill_color_idx, border_color_idx, border_width)
+        panel_surface = self._panels.get(key)
+        if panel_surface is None:
+            fill_color = get_color(fill_color_idx)
+            # Make panel semi-transparent by adding alpha
+            panel_surface = pygame.Surface(size, pygame.SRCALPHA)
+            panel_surface.fill((fill_color[0], fill_color[1], fill_color[2], 200)) # Use 200 alpha
+            if border_color_idx is not None and border_width > 0:
+                border_color = get_color(border_color_idx)
+                pygame.draw.rect(panel_surface, border_color, panel_surface.get_rect(), border_width, border_radius=5)
+            self._panels[key] = panel_surface
+        return panel_surface
 
     def _draw_panel(self, surface, rect, fill_color_idx, border_color_idx=None, border_width=1):
         """Helper to draw a panel using palette indices."""
-        fill_color = get_color(fill_color_idx)
-        # Make panel semi-transparent by adding alpha
-        panel_surface = pygame.Surface(rect.size, pygame.SRCALPHA)
-        panel_surface.fill((fill_color[0], fill_color[1], fill_color[2], 200)) # Use 200 alpha
-
-        if border_color_idx is not None and border_width > 0:
-            border_color = get_color(border_color_idx)
-            pygame.draw.rect(panel_surface, border_color, panel_surface.get_rect(), border_width, border_radius=5)
-
-        surface.blit(panel_surface, rect.topleft)
+        surface.blit(self._panel(rect.size, fill_color_idx, border_color_idx, border_width), rect.topleft)
 
 
-    def draw_hud(self, screen):
-        """Draws the main Heads-Up Display with panels."""
-        panel_padding = 10
-
+    # --- HUD widget bindings: *_state reads the bound value, _render_* builds its blits ---
+    def _render_resources(self, resources):
         # --- Top Right: Resources ---
-        resource_text = f"Resources: {self.resource_manager.resources}"
-        resource_surf = self._render_text(resource_text, self._font_medium, self.resource_color_idx)
-        resource_rect = resource_surf.get_rect(topright=(SCREEN_WIDTH - panel_padding, panel_padding))
-        screen.blit(resource_surf, resource_rect)
+        return self._label(f"Resources: {resources}", FONT_MEDIUM, self.resource_color_idx,
+                           topright=(SCREEN_WIDTH - self.panel_padding, self.panel_padding))
+
+    def _wave_state(self):
+        wave_manager = self.wave_manager
+        total_waves = len(wave_manager.wave_sequence) if wave_manager.wave_sequence else 0
+        return (wave_manager.current_wave_index, total_waves, wave_manager.level_complete, wave_manager.all_waves_spawned)
 
+    def _render_wave(self, state):
         # --- Top Left: Wave Info ---
-        current_wave_num = self.wave_manager.current_wave_index + 1
-        total_waves = len(self.wave_manager.wave_sequence) if self.wave_manager.wave_sequence else 0
+        wave_index, total_waves, level_complete, all_waves_spawned = state
+        current_wave_num = wave_index + 1
         wave_text = f"Wave: {current_wave_num} / {total_waves}"
-        if self.wave_manager.level_complete: wave_text = "Level Complete!"
-        elif self.wave_manager.all_waves_spawned: wave_text = f"Wave: {total_waves} / {total_waves} (Clear remaining)"
+        if level_complete: wave_text = "Level Complete!"
+        elif all_waves_spawned: wave_text = f"Wave: {total_waves} / {total_waves} (Clear remaining)"
         # Ensure wave_sequence exists before trying to access len
-        elif not self.wave_manager.wave_sequence: wave_text = "No Waves Loaded"
+        elif not total_waves: wave_text = "No Waves Loaded"
         elif current_wave_num < 1: wave_text = f"Wave: 0 / {total_waves}"
+        return self._label(wave_text, FONT_MEDIUM, self.text_color_idx,
+                           topleft=(self.panel_padding, self.panel_padding))
 
-        wave_surf = self._render_text(wave_text, self._font_medium, self.text_color_idx)
-        wave_rect = wave_surf.get_rect(topleft=(panel_padding, panel_padding))
-        screen.blit(wave_surf, wave_rect)
-
-        # --- Top Left: Next Wave Timer ---
+    def _timer_state(self):
         time_to_next = self.wave_manager.get_time_until_next_wave()
-        if time_to_next is not None:
-            timer_text = f"Next: {int(time_to_next) + 1}s"
-            timer_surf = self._render_text(timer_text, self._font_small, self.neutral_color_idx)
-            timer_rect = timer_surf.get_rect(topleft=(wave_rect.left, wave_rect.bottom + 2))
-            screen.blit(timer_surf, timer_rect)
-
+        return None if time_to_next is None else int(time_to_next) + 1 # Whole seconds shown
+
+    def _render_timer(self, seconds):
+        # --- Top Left: Next Wave Timer (under the wave line; atlas height is fixed per font) ---
+        if seconds is None:
+            return []
+        wave_bottom = self.panel_padding + self.text.atlas(FONT_MEDIUM, self.text_color_idx).height
+        return self._label(f"Next: {seconds}s", FONT_SMALL, self.neutral_color_idx,
+                           topleft=(self.panel_padding, wave_bottom + 2))
+
+    def _core_state(self):
+        if not self.core: # Core is recreated per level (main.py swaps it in)
+            return None
+        return (max(0, int(self.core.current_health)), int(self.core.max_health), self.core.current_health > 0)
+
+    def _render_core(self, state):
         # --- Top Center: Core Health ---
-        if self.core: # Check if core exists
-             core_health_display = max(0, int(self.core.current_health))
-             core_health_str = f"{core_health_display} / {int(self.core.max_health)}"
-             core_text = f"Core: {core_health_str}"
-             core_color_idx = self.resource_color_idx if self.core.current_health > 0 else self.warning_color_idx
-             core_surf = self._render_text(core_text, self._font_medium, core_color_idx)
-             core_rect = core_surf.get_rect(midtop=(SCREEN_WIDTH // 2, panel_padding))
-             screen.blit(core_surf, core_rect)
-        else: # Draw placeholder if core doesn't exist yet
-             core_surf = self._render_text("Core: N/A", self._font_medium, self.neutral_color_idx)
-             core_rect = core_surf.get_rect(midtop=(SCREEN_WIDTH // 2, panel_padding))
-             screen.blit(core_surf, core_rect)
-
-
+        midtop = (SCREEN_WIDTH // 2, self.panel_padding)
+        if state is None: # Draw placeholder if core doesn't exist yet
+            return self._label("Core: N/A", FONT_MEDIUM, self.neutral_color_idx, midtop=midtop)
+        core_health_display, max_health, alive = state
+        core_color_idx = self.resource_color_idx if alive else self.warning_color_idx
+        return self._label(f"Core: {core_health_display} / {max_health}", FONT_MEDIUM, core_color_idx, midtop=midtop)
+
+    def _selection_state(self):
+        """(build type, placed tower, can afford its upgrade) from the TowerManager."""
+        tower_manager = self.tower_manager
+        if tower_manager is None:
+            return (None, None, False)
+        placed = tower_manager.selected_placed_tower
+        can_afford = False
+        if placed is not None:
+            config = tower_manager.tower_data.get(placed.tower_id)
+            if config:
+                can_afford = self.resource_manager.resources >= config.get("upgrade_cost", 0)
+        return (tower_manager.selected_tower_type, placed, can_afford)
+
+    def _render_info_panel(self, state):
         # --- Bottom Info Panel ---
+        selected_tower_type, placed_tower, can_afford = state
+        full_tower_data = self.tower_manager.tower_data if self.tower_manager else {}
+        selected_tower_data = full_tower_data.get(selected_tower_type) if selected_tower_type else None
         bottom_panel_rect = pygame.Rect(0, SCREEN_HEIGHT - self.bottom_panel_height, SCREEN_WIDTH, self.bottom_panel_height)
-        self._draw_panel(screen, bottom_panel_rect, self.panel_color_idx, self.panel_border_color_idx)
+        blits = [(self._panel(bottom_panel_rect.size, self.panel_color_idx, self.panel_border_color_idx),
+                  bottom_panel_rect.topleft)]
 
+        panel_padding = self.panel_padding
         info_y_pos = bottom_panel_rect.top + 5
-        line_height_small = self._font_small.get_linesize()
-        line_height_tiny = self._font_tiny.get_linesize()
 
         # Default build instructions
         info_text_line1 = "Select Tower: [1] Gun [2] Cannon [3] Slow | [ESC] Deselect | [U] Upgrade"
         info_color_idx = self.text_color_idx
-        info_font = self._font_small
         stats_text = "" # Initialize stats text
+        upgrade_cost_surf = None
 
         # If placing a new tower
-        if self.selected_tower_type and self.selected_tower_data:
-             name = self.selected_tower_data.get('name','N/A')
-             cost = self.selected_tower_data.get('cost','N/A')
+        if selected_tower_type and selected_tower_data:
+             name = selected_tower_data.get('name','N/A')
+             cost = selected_tower_data.get('cost','N/A')
              info_text_line1 = f"Placing: {name} (Cost: {cost})"
              info_color_idx = self.highlight_color_idx
              # Add basic stats for placement preview
              stats_text = "Stats: "
-             if 'damage' in self.selected_tower_data: stats_text += f"Dmg:{self.selected_tower_data['damage']} "
-             if 'effect_type' in self.selected_tower_data:
-                 factor = self.selected_tower_data.get('slow_factor', '?')
-                 duration = self.selected_tower_data.get('slow_duration', '?')
+             if 'damage' in selected_tower_data: stats_text += f"Dmg:{selected_tower_data['damage']} "
+             if 'effect_type' in selected_tower_data:
+                 factor = selected_tower_data.get('slow_factor', '?')
+                 duration = selected_tower_data.get('slow_duration', '?')
                  stats_text += f"Slow:{factor*100:.0f}%/{duration}s "
-             stats_text += f"Rng:{self.selected_tower_data.get('range', '?')} Rate:{self.selected_tower_data.get('fire_rate', '?')}/s"
+             stats_text += f"Rng:{selected_tower_data.get('range', '?')} Rate:{selected_tower_data.get('fire_rate', '?')}/s"
 
 
         # If a placed tower is selected
-        elif self.selected_placed_tower_id and self.selected_placed_tower_data:
-             # Use self.full_tower_data (loaded from TowerManager) for reliable upgrade info
-             current_config = self.full_tower_data.get(self.selected_placed_tower_id)
-             tower_name = self.selected_placed_tower_data.get('name', 'N/A')
+        elif placed_tower is not None and placed_tower.data:
+             placed_tower_data = placed_tower.data
+             # Use the TowerManager's full tower data for reliable upgrade info
+             current_config = full_tower_data.get(placed_tower.tower_id)
+             tower_name = placed_tower_data.get('name', 'N/A')
              info_color_idx = self.highlight_color_idx
 
              # Line 1: Name and Upgrade Path/Cost
              upgrade_text = " (Max Level)"
-             upgrade_cost_text = ""
-             can_upgrade = False
              if current_config:
                   upgrades_to_id = current_config.get("upgrades_to")
                   upgrade_cost = current_config.get("upgrade_cost", 0)
                   # Check if upgrade exists in the main data AND has a cost
-                  if upgrades_to_id and upgrades_to_id in self.full_tower_data and upgrade_cost > 0:
-                       upgrade_config = self.full_tower_data[upgrades_to_id]
+                  if upgrades_to_id and upgrades_to_id in full_tower_data and upgrade_cost > 0:
+                       upgrade_config = full_tower_data[upgrades_to_id]
                        upgrade_name = upgrade_config.get('name', 'Unknown Upgrade')
                        upgrade_text = f" -> {upgrade_name}"
-                       # Check affordability for UI feedback
-                       can_afford = self.resource_manager.resources >= upgrade_cost
+                       # Affordability (part of the bound state) colors the cost
                        cost_color_idx = self.text_color_idx if can_afford else self.warning_color_idx
                        # Render cost separately to color it
-                       upgrade_cost_surf = self._render_text(f"Cost: {upgrade_cost} [U]", self._font_small, cost_color_idx)
-
-                       can_upgrade = True # Mark that upgrade is possible
-                  else:
-                      # Handle case where tower is max level (upgrades_to is null or invalid)
-                      upgrade_text = " (Max Level)"
-
+                       upgrade_cost_surf = self._render_text(f"Cost: {upgrade_cost} [U]", FONT_SMALL, cost_color_idx)
 
              info_text_line1 = f"Selected: {tower_name}{upgrade_text}"
 
 
              # Line 2: Basic Stats (Damage/Effect, Range, Rate)
              stats_text = "Stats: "
-             if 'damage' in self.selected_placed_tower_data:
-                 stats_text += f"Dmg:{self.selected_placed_tower_data['damage']} | "
-             if 'effect_type' in self.selected_placed_tower_data:
-                 effect = self.selected_placed_tower_data['effect_type']
-                 factor = self.selected_placed_tower_data.get('slow_factor', '?')
-                 duration = self.selected_placed_tower_data.get('slow_duration', '?')
+             if 'damage' in placed_tower_data:
+                 stats_text += f"Dmg:{placed_tower_data['damage']} | "
+             if 'effect_type' in placed_tower_data:
+                 factor = placed_tower_data.get('slow_factor', '?')
+                 duration = placed_tower_data.get('slow_duration', '?')
                  stats_text += f"Slow:{factor*100:.0f}%/{duration}s | " # Show slow %
-             stats_text += f"Rng:{self.selected_placed_tower_data.get('range', '?')} | "
-             stats_text += f"Rate:{self.selected_placed_tower_data.get('fire_rate', '?')}/s"
+             stats_text += f"Rng:{placed_tower_data.get('range', '?')} | "
+             stats_text += f"Rate:{placed_tower_data.get('fire_rate', '?')}/s"
 
 
-        # Render and draw Line 1 (build instructions or selected tower name/upgrade)
-        info_surf_line1 = self._render_text(info_text_line1, info_font, info_color_idx)
+        # Line 1 (build instructions or selected tower name/upgrade)
+        info_surf_line1 = self._render_text(info_text_line1, FONT_SMALL, info_color_idx)
         info_rect_line1 = info_surf_line1.get_rect(topleft=(panel_padding, info_y_pos))
-        screen.blit(info_surf_line1, info_rect_line1)
-
-        # Blit upgrade cost next to it if applicable and affordable/not
-        if self.selected_placed_tower_id and can_upgrade:
-             cost_rect = upgrade_cost_surf.get_rect(midleft=(info_rect_line1.right + 10, info_rect_line1.centery))
-             screen.blit(upgrade_cost_surf, cost_rect)
+        blits.append((info_surf_line1, info_rect_line1))
 
+        # Upgrade cost next to it if applicable and affordable/not
+        if upgrade_cost_surf is not None:
+             blits.append((upgrade_cost_surf, upgrade_cost_surf.get_rect(midleft=(info_rect_line1.right + 10, info_rect_line1.centery))))
 
-        # Render and draw Stats Line (Line 2) if applicable
+        # Stats Line (Line 2) if applicable, below the first line
         if stats_text:
-             stats_surf = self._render_text(stats_text, self._font_tiny, self.text_color_idx)
-             # Position stats line below the first line
-             stats_rect = stats_surf.get_rect(topleft=(panel_padding, info_rect_line1.bottom + 2))
-             screen.blit(stats_surf, stats_rect)
+             blits.extend(self._label(stats_text, FONT_TINY, self.text_color_idx,
+                                      topleft=(panel_padding, info_rect_line1.bottom + 2)))
+        return blits
 
 
-    def draw_game_over(self, screen):
-        """Displays the Game Over screen."""
-        # Semi-transparent overlay using background color
-        overlay = pygame.Surface(SCREEN_SIZE, pygame.SRCALPHA)
-        bg_color = get_color(0) # Base background color
-        overlay.fill((bg_color[0], bg_color[1], bg_color[2], 180)) # Dimmed BG overlay
-        screen.blit(overlay, (0, 0))
+    def draw_hud(self, screen):
+        """Draws the Heads-Up Display from its retained widgets."""
+        for widget in self.hud_widgets:
+            widget.draw(screen)
 
-        # Panel for text
-        panel_width = 600
-        panel_height = 250
-        panel_rect = pygame.Rect(0, 0, panel_width, panel_height)
-        panel_rect.center = screen.get_rect().center
-        # Use panel index, but maybe a red border?
-        self._draw_panel(screen, panel_rect, self.panel_color_idx, self.warning_color_idx, border_width=2)
 
-        # Text
-        title_surf = self._render_text("GAME OVER", self._font_xl, self.warning_color_idx) # Red index
-        title_rect = title_surf.get_rect(center=(panel_rect.centerx, panel_rect.centery - 50))
-        screen.blit(title_surf, title_rect)
+    # --- Full-screen overlays (built once per state and palette, premultiplied alpha) ---
+    def _overlay_blit(self, overlay, surf, dest):
+        """Composites surf onto a premultiplied overlay (exact "over", unlike a plain SRCALPHA blit)."""
+        overlay.blit(surf.premul_alpha(), dest, special_flags=pygame.BLEND_PREMULTIPLIED)
 
-        restart_surf = self._render_text("Press R to Restart", self._font_medium, self.text_color_idx) # White index
-        restart_rect = restart_surf.get_rect(center=(panel_rect.centerx, panel_rect.centery + 50))
-        screen.blit(restart_surf, restart_rect)
+    def _overlay_tint(self, overlay, color, alpha):
+        overlay.fill((color[0] * alpha // 255, color[1] * alpha // 255, color[2] * alpha // 255, alpha))
 
+    def _build_end_overlay(self, overlay, border_color_idx, title, prompt):
+        """Game Over / Victory: dimmed background, bordered panel, title and prompt."""
+        # Semi-transparent overlay using background color
+        self._overlay_tint(overlay, get_color(0), 180) # Dimmed BG overlay
 
-    def draw_victory(self, screen):
-        """Displays the Victory screen."""
-        # Semi-transparent overlay
-        overlay = pygame.Surface(SCREEN_SIZE, pygame.SRCALPHA)
-        bg_color = get_color(0)
-        overlay.fill((bg_color[0], bg_color[1], bg_color[2], 180))
-        screen.blit(overlay, (0, 0))
-
+        # Panel for text
         panel_width = 600
         panel_height = 250
         panel_rect = pygame.Rect(0, 0, panel_width, panel_height)
-        panel_rect.center = screen.get_rect().center
-        # Green border for victory?
-        self._draw_panel(screen, panel_rect, self.panel_color_idx, self.success_color_idx, border_width=2)
+        panel_rect.center = overlay.get_rect().center
+        self._overlay_blit(overlay, self._panel(panel_rect.size, self.panel_color_idx, border_color_idx, border_width=2),
+                           panel_rect.topleft)
 
-        title_surf = self._render_text("VICTORY!", self._font_xl, self.success_color_idx) # Green index
-        title_rect = title_surf.get_rect(center=(panel_rect.centerx, panel_rect.centery - 50))
-        screen.blit(title_surf, title_rect)
+        # Text
+        title_surf = self._render_text(title, FONT_XL, border_color_idx)
+        self._overlay_blit(overlay, title_surf, title_surf.get_rect(center=(panel_rect.centerx, panel_rect.centery - 50)))
+        prompt_surf = self._render_text(prompt, FONT_MEDIUM, self.text_color_idx) # White index
+        self._overlay_blit(overlay, prompt_surf, prompt_surf.get_rect(center=(panel_rect.centerx, panel_rect.centery + 50)))
 
-        next_level_surf = self._render_text("Press N for Next Level", self._font_medium, self.text_color_idx) # White index
-        next_level_rect = next_level_surf.get_rect(center=(panel_rect.centerx, panel_rect.centery + 50))
-        screen.blit(next_level_surf, next_level_rect)
+    def _build_game_over(self, overlay):
+        """The Game Over screen (red border and title)."""
+        self._build_end_overlay(overlay, self.warning_color_idx, "GAME OVER", "Press R to Restart")
 
+    def _build_victory(self, overlay):
+        """The Victory screen (green border and title)."""
+        self._build_end_overlay(overlay, self.success_color_idx, "VICTORY!", "Press N for Next Level")
 
-    def draw_pause(self, screen):
-        """Displays the Pause overlay."""
-        overlay = pygame.Surface(SCREEN_SIZE, pygame.SRCALPHA)
+    def _build_pause(self, overlay):
+        """The Pause overlay."""
         # Use a different color tint? Maybe dark blueish? Index 5
-        pause_tint_color = get_color(5, (0, 0, 50)) # Fallback if index 5 missing
-        overlay.fill((pause_tint_color[0], pause_tint_color[1], pause_tint_color[2], 150)) # Bluish tint
-        screen.blit(overlay, (0,0))
-
-        pause_surf = self._render_text("PAUSED", self._font_large, self.text_color_idx) # White index
-        pause_rect = pause_surf.get_rect(center=screen.get_rect().center)
-        screen.blit(pause_surf, pause_rect)
+        self._overlay_tint(overlay, get_color(5, (0, 0, 50)), 150) # Bluish tint (fallback if index 5 missing)
+        pause_surf = self._render_text("PAUSED", FONT_LARGE, self.text_color_idx) # White index
+        self._overlay_blit(overlay, pause_surf, pause_surf.get_rect(center=overlay.get_rect().center))
+
+    def get_overlay(self, game_state):
+        """Cached full-screen overlay for an overlay state, premultiplied: blit
+        it with special_flags=pygame.BLEND_PREMULTIPLIED."""
+        version = get_palette_version()
+        if version != self._overlay_version:
+            self._overlays.clear()
+            self._overlay_version = version
+        overlay = self._overlays.get(game_state)
+        if overlay is None:
+            overlay = pygame.Surface(SCREEN_SIZE, pygame.SRCALPHA)
+            self.overlay_builders[game_state](overlay)
+            self._overlays[game_state] = overlay
+        return overlay
+
+    def draw_frozen(self, screen, game_state):
+        """Shows an overlay state: the last game frame (whatever screen holds on
+        entry) with the state's overlay, composited once and then reused every
+        frame until thaw()."""
+        key = (game_state, get_palette_version())
+        if self._frozen_base is None:
+            self._frozen_base = screen.copy() # Last presented game frame
+        if key != self._frozen_key:
+            self._frozen_frame = self._frozen_base.copy()
+            self._frozen_frame.blit(self.get_overlay(game_state), (0, 0), special_flags=pygame.BLEND_PREMULTIPLIED)
+            self._frozen_key = key
+        screen.blit(self._frozen_frame, (0, 0))
+
+    def is_frozen(self, game_state):
+        """True once draw_frozen has presented game_state's frame for the current palette."""
+        return self._frozen_key == (game_state, get_palette_version())
+
+    def thaw(self):
+        """Drops the frozen frame (back to live drawing)."""
+        self._frozen_base = self._frozen_frame = self._frozen_key = None
+
+
+    def draw_profiler(self, screen, lines):
+        """Draws the frame profiler's percentile table in the top-left corner."""
+        if not lines:
+            return
+        line_height = get_font(14, MONO_FONT).get_linesize()
+        line_surfs = [self._render_text(line, 14, self.text_color_idx, MONO_FONT) for line in lines]
+        width = max(surf.get_width() for surf in line_surfs) + 12
+        panel_rect = pygame.Rect(10, self.top_panel_height + 20, width, line_height * len(lines) + 10)
+        self._draw_panel(screen, panel_rect, self.panel_color_idx, self.neutral_color_idx)
+        for i, line_surf in enumerate(line_surfs):
+            screen.blit(line_surf, (panel_rect.left + 6, panel_rect.top + 5 + i * line_height))
 
 
     def draw(self, screen, game_state):
         """Main draw call for UI elements based on game state."""
-        # Always draw HUD elements in playing/paused state
-        if game_state in [STATE_PLAYING, STATE_PAUSED]:
+        if game_state in OVERLAY_STATES:
+            # Paused/end states: the frozen last frame (with its HUD) under the state's overlay
+            self.draw_frozen(screen, game_state)
+        elif game_state == STATE_PLAYING:
+            self.thaw()
             self.draw_hud(screen)
-
-        # Draw overlays based on state
-        if game_state == STATE_PAUSED:
-            self.draw_pause(screen)
-        elif game_state == STATE_GAME_OVER:
-             self.draw_game_over(screen)
-        elif game_state == STATE_VICTORY:
-             self.draw_victory(screen)
\ No newline at end of file
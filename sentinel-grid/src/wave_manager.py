@@ -1,33 +1,211 @@
 # src/wave_manager.py
 import pygame
-import json
-import os
+import numpy as np
 from .enemies import Enemy
-# Import the data lookup maps and defaults
-from .config import (LEVEL_PATHS, PATH_WAYPOINTS_L1, SCREEN_WIDTH, SCREEN_HEIGHT)
+from .path import PathTable
+from .pool import ObjectPool
+from .archetypes import compile_enemies
+from .content import load_content
+from .config import SCREEN_WIDTH, SCREEN_HEIGHT
+
+DEFAULT_ENEMY_CAPACITY = 64 # Initial EnemyStore slots; doubles when exhausted
+
+class EnemyStore:
+    """Structure-of-arrays storage for every enemy on the field. Each enemy is a
+    slot index into parallel NumPy arrays; advance() moves them all in one
+    vectorized pass. Enemy sprites are views onto a slot."""
+    def __init__(self, capacity=DEFAULT_ENEMY_CAPACITY):
+        self.capacity = 0
+        self.pos = np.zeros((0, 2))
+        self.prev_pos = np.zeros((0, 2)) # pos before the last advance(), for render interpolation
+        self.progress = np.zeros(0)
+        self.speed = np.zeros(0)
+        self.base_speed = np.zeros(0)
+        self.health = np.zeros(0)
+        self.slow_timer = np.zeros(0)
+        self.anim_timer = np.zeros(0)
+        self.active = np.zeros(0, dtype=bool)      # Alive and on the path
+        self.reached_end = np.zeros(0, dtype=bool) # Leaked this tick, awaiting removal
+        self.in_use = np.zeros(0, dtype=bool)      # Slot handed out and not yet released
+        self.free_slots = []
+        self.live_count = 0
+        self.high_water = 0 # Peak live_count since the last trim()
+        self.positions = [] # pos as Python floats, refreshed every advance() for cheap reads
+        self.generation = 0 # Bumped whenever positions change (views cache against it)
+        self.index = None   # PathProgressIndex told about spawns, releases, placements and health changes
+        self._resize(capacity)
+        self.set_path(PathTable([]))
+
+    def _resize(self, new_capacity):
+        """Resizes every array to new_capacity, keeping the slots that fit."""
+        old = self.capacity
+        kept = min(old, new_capacity)
+        def resized(array):
+            grown = np.zeros((new_capacity,) + array.shape[1:], dtype=array.dtype)
+            grown[:kept] = array[:kept]
+            return grown
+        self.pos = resized(self.pos)
+        self.prev_pos = resized(self.prev_pos)
+        self.progress = resized(self.progress)
+        self.speed = resized(self.speed)
+        self.base_speed = resized(self.base_speed)
+        self.health = resized(self.health)
+        self.slow_timer = resized(self.slow_timer)
+        self.anim_timer = resized(self.anim_timer)
+        self.active = resized(self.active)
+        self.reached_end = resized(self.reached_end)
+        self.in_use = resized(self.in_use)
+        self.positions = self.pos.tolist()
+        # Lowest free slot is handed out first
+        self.free_slots = [slot for slot in range(new_capacity - 1, -1, -1) if not self.in_use[slot]]
+        self.capacity = new_capacity
+
+    def prewarm(self, capacity):
+        """Grows the arrays up front so `capacity` live enemies never resize.
+        The reservation counts towards the high-water mark until the next trim."""
+        if capacity > self.capacity:
+            self._resize(capacity)
+        self.high_water = max(self.high_water, capacity)
+
+    def trim(self):
+        """Shrinks the arrays back towards the peak use since the last trim
+        (never below the default capacity or past a slot still in use)."""
+        in_use = np.flatnonzero(self.in_use)
+        highest_used = int(in_use[-1]) + 1 if len(in_use) else 0
+        target = max(DEFAULT_ENEMY_CAPACITY, self.high_water, highest_used)
+        if target < self.capacity:
+            self._resize(target)
+        self.high_water = self.live_count
+
+    def set_path(self, path_table):
+        """Caches the level path as arrays for np.interp lookups."""
+        self.path_table = path_table
+        self._path_lengths = np.array(path_table.cumulative_lengths)
+        self._path_x = np.array([p[0] for p in path_table.waypoints])
+        self._path_y = np.array([p[1] for p in path_table.waypoints])
+
+    def allocate(self):
+        """Hands out a free slot, growing the arrays if none are left."""
+        if not self.free_slots:
+            self._resize(max(1, self.capacity * 2))
+        slot = self.free_slots.pop()
+        self.in_use[slot] = True
+        self.live_count += 1
+        if self.live_count > self.high_water:
+            self.high_water = self.live_count
+        return slot
+
+    def release(self, slot):
+        """Returns a slot to the free list (ignored if already free)."""
+        if self.in_use[slot]:
+            self.in_use[slot] = False
+            self.active[slot] = False
+            self.reached_end[slot] = False
+            self.free_slots.append(slot)
+            self.live_count -= 1
+            if self.index is not None:
+                self.index.remove(slot)
+
+    def spawn(self, slot, start_pos, health, speed, spawn_time):
+        """Initializes a slot's simulation state at the start of the path."""
+        self.pos[slot] = start_pos
+        self.prev_pos[slot] = start_pos
+        self.positions[slot] = [float(start_pos[0]), float(start_pos[1])]
+        self.progress[slot] = 0.0
+        self.health[slot] = health
+        self.speed[slot] = speed
+        self.base_speed[slot] = speed
+        self.slow_timer[slot] = 0.0
+        self.anim_timer[slot] = spawn_time
+        self.active[slot] = True
+        self.reached_end[slot] = False
+        if self.index is not None:
+            self.index.add(slot)
+
+    def set_health(self, slot, health):
+        """Writes a slot's health (and keeps the index's health trees current)."""
+        self.health[slot] = health
+        if self.index is not None:
+            self.index.health_changed(slot, float(self.health[slot]))
+
+    def set_progress(self, slot, distance):
+        """Teleports a slot to distance along the path (clamped to the end)."""
+        distance = min(max(0.0, distance), self.path_table.total_length)
+        table = self.path_table
+        x, y = table.position_at(distance, table.segment_at(distance))
+        self.progress[slot] = distance
+        self.pos[slot] = self.prev_pos[slot] = (x, y)
+        self.positions[slot] = [x, y]
+        self.generation += 1 # Views re-read their cached position
+        if self.index is not None:
+            self.index.moved(slot)
+
+    def advance(self, dt):
+        """Moves every active enemy by dt and ticks slow timers in one pass.
+        Returns the slots that reached the end of the path this tick."""
+        active = self.active
+        self.anim_timer[active] += dt
+
+        # Slow timers count down; expired ones restore base speed
+        slowed = active & (self.slow_timer > 0)
+        self.slow_timer[slowed] -= dt
+        expired = slowed & (self.slow_timer <= 0)
+        self.speed[expired] = self.base_speed[expired]
+        self.slow_timer[expired] = 0.0
+
+        if self.path_table.segment_count == 0:
+            return []
+
+        self.prev_pos[:] = self.pos
+        total = self.path_table.total_length
+        self.progress[active] += np.maximum(self.speed[active], 0.0) * dt
+        ended = active & (self.progress >= total)
+        self.progress[ended] = total
+        self.pos[:, 0] = np.interp(self.progress, self._path_lengths, self._path_x)
+        self.pos[:, 1] = np.interp(self.progress, self._path_lengths, self._path_y)
+        self.positions = self.pos.tolist()
+        self.generation += 1
+
+        if not ended.any():
+            return []
+        self.active[ended] = False
+        self.reached_end[ended] = True
+        return np.flatnonzero(ended).tolist()
+
+    def interpolated_positions(self, alpha):
+        """Per-slot (x, y) blended between the previous and current step,
+        computed in one pass per rendered frame."""
+        if alpha >= 1.0:
+            return self.positions
+        return (self.prev_pos + (self.pos - self.prev_pos) * alpha).tolist()
 
-# --- Get the absolute path to the project's root directory ---
-script_dir = os.path.dirname(os.path.realpath(__file__))
-project_root = os.path.dirname(script_dir) # Go up one level from 'src'
-DATA_DIR = os.path.join(project_root, 'data') # Path to the data directory
 
 class WaveManager:
-    def __init__(self, enemy_group):
-        """Initializes the Wave Manager for the first level."""
-        self.enemy_data = self._load_json("enemies.json")
-        self.wave_definitions = self._load_json("waves.json")
-        self.level_data = self._load_json("levels.json") # Load ALL level configs
+    def __init__(self, enemy_group, clock, content=None):
+        """Initializes the Wave Manager for the first level. clock is the shared GameClock;
+        content is the ContentRegistry to read data from (the process-wide one if omitted)."""
+        content = content if content is not None else load_content()
+        self.content = content
+        self.enemy_data = content.enemy_data
+        self.wave_definitions = content.wave_definitions
+        self.level_data = content.level_data # ALL level configs
+        self.enemy_types = content.enemy_types # enemy_type_id -> EnemyArchetype, compiled from enemy_data
 
         if not self.level_data or not self.wave_definitions or not self.enemy_data:
              raise RuntimeError("Failed to load essential game data JSON files.")
 
-        self.enemy_pool = []
+        self.enemy_store = EnemyStore() # Simulation state for every enemy
+        self.enemy_pool = ObjectPool(lambda enemy_type_id: Enemy(self.enemy_store)) # Views, per type
+        self.enemy_views = {} # Store slot -> Enemy view currently living in it
         self.active_enemies = enemy_group # Reference to the main enemy sprite group
+        self.clock = clock # Game clock (spawn times are stamped from it)
 
         # Defer setting level-specific attributes until load_level_data
         self.current_level_id = None
         self.wave_sequence = []
         self.path = []
+        self.path_table = PathTable([]) # Arc-length table for self.path
+        self._path_tables = {} # Level ID -> PathTable, each built once
         self.core_starting_health = 10 # Default fallback
         self.core_location = (0,0) # Default fallback
 
@@ -41,6 +219,7 @@ class WaveManager:
         self.time_between_waves = 10.0
         self.all_waves_spawned = False
         self.level_complete = False
+        self.spawn_count = 0 # Enemies spawned this level (source of spawn_id)
 
         print("WaveManager Initialized (Data loaded, level not set yet).")
 
@@ -62,20 +241,31 @@ class WaveManager:
         default_core_loc = (SCREEN_WIDTH - 50, SCREEN_HEIGHT // 2)
         self.core_location = level_config.get('core_location', default_core_loc)
 
-        # Get path using the key and lookup map from config.py
-        path_key = level_config.get('path_waypoints_key', None)
-        self.path = LEVEL_PATHS.get(path_key, PATH_WAYPOINTS_L1) # Default to L1 path if key invalid
+        # Path waypoints come from the level's entry (validated by the content registry)
+        self.path = self.content.path_waypoints(level_id)
+        if level_id not in self._path_tables:
+            self._path_tables[level_id] = PathTable(self.path)
+        self.path_table = self._path_tables[level_id]
+        self.enemy_store.set_path(self.path_table)
 
         print(f"  Level Name: {level_config.get('name', 'N/A')}")
         print(f"  Wave Sequence: {self.wave_sequence}")
         print(f"  Core Health: {self.core_starting_health}")
         print(f"  Core Location: {self.core_location}")
-        print(f"  Path Key: {path_key} (Using path with {len(self.path)} waypoints)")
+        print(f"  Path: {len(self.path)} waypoints, length {self.path_table.total_length:.0f}")
 
         # Reset progress for the newly loaded level
         self.reset()
 
 
+    def compile_enemy_types(self):
+        """(Re)builds enemy_types from enemy_data. Call after editing enemy_data;
+        enemies spawned from here on use the new archetypes."""
+        try:
+            self.enemy_types = compile_enemies(self.enemy_data)
+        except ValueError as e:
+            raise RuntimeError(f"Invalid enemy data in enemies.json: {e}") from e
+
     def reset(self):
         """Resets the wave progression state for the currently loaded level."""
         # print(f"WaveManager: Resetting progress for level '{self.current_level_id}'.")
@@ -88,43 +278,65 @@ class WaveManager:
         self.time_since_last_wave = 0.0
         self.all_waves_spawned = False
         self.level_complete = False
-
-    def _load_json(self, filename):
-        """Loads data from a JSON file located in the project's data directory."""
-        file_path = os.path.join(DATA_DIR, filename)
-        try:
-            with open(file_path, 'r') as f:
-                # print(f"Loading JSON from: {file_path}") # Debug print
-                return json.load(f)
-        except FileNotFoundError:
-            print(f"Error: JSON file not found at {file_path}")
-            return {}
-        except json.JSONDecodeError:
-            print(f"Error: Could not decode JSON from {file_path}")
-            return {}
+        self.spawn_count = 0
+        # Release every live enemy (slot + view) before the level starts over
+        for enemy in self.active_enemies.sprites():
+            enemy.kill()
+        self.enemy_views.clear()
+
+    def prewarm_pools(self, wave_id):
+         """Pre-creates enemy views (per type) and store slots for one wave,
+         so spawning doesn't allocate mid-wave."""
+         per_type = {}
+         for event in self.wave_definitions.get(wave_id, []):
+              per_type[event['enemy_type']] = per_type.get(event['enemy_type'], 0) + event['count']
+         for enemy_type_id, count in per_type.items():
+              # Enemies from earlier waves may still be alive on top of this wave
+              self.enemy_pool.prewarm(enemy_type_id, self.enemy_pool.live_count(enemy_type_id) + count)
+         self.enemy_store.prewarm(self.enemy_store.live_count + sum(per_type.values()))
+
+    def trim_pools(self):
+         """Shrinks enemy views and store arrays to their recent high-water mark."""
+         self.enemy_pool.trim()
+         self.enemy_store.trim()
 
     def _get_enemy_from_pool(self, enemy_type_id):
-         """Gets an inactive enemy from the pool or creates a new one."""
-         if not enemy_type_id in self.enemy_data:
+         """Takes an idle view from the type's free-list and a free EnemyStore
+         slot (both O(1)), and initializes them as the given enemy type."""
+         archetype = self.enemy_types.get(enemy_type_id)
+         if archetype is None:
               print(f"Error: Unknown enemy type '{enemy_type_id}' requested.")
               return None
 
-         enemy_config = self.enemy_data[enemy_type_id]
-
-         for enemy in self.enemy_pool:
-              if not enemy.is_active and enemy.name == enemy_config['name']:
-                   enemy.setup(enemy_config, self.path)
-                   return enemy
-
-         # print(f"Creating new '{enemy_config['name']}' for pool.") # Debug print
-         new_enemy = Enemy(enemy_config, self.path)
-         new_enemy.is_active = True
-         self.enemy_pool.append(new_enemy)
-         return new_enemy
-
-    def _return_enemy_to_pool(self, enemy):
-         """Marks an enemy as inactive."""
-         enemy.is_active = False
+         enemy = self.enemy_pool.acquire(enemy_type_id)
+         enemy.pool = self
+         enemy.pool_key = enemy_type_id
+         slot = self.enemy_store.allocate()
+         enemy.setup(slot, archetype, self.path_table, self.clock.time)
+         self.enemy_views[slot] = enemy
+         return enemy
+
+    def spawn_enemy(self, enemy_type_id, progress=0.0):
+         """Spawns one enemy onto the field, optionally already progress pixels
+         along the path (scripted scenarios). Returns it, or None if unknown."""
+         enemy = self._get_enemy_from_pool(enemy_type_id)
+         if enemy:
+              if progress > 0:
+                   self.enemy_store.set_progress(enemy.slot, progress)
+              enemy.spawn_id = self.spawn_count
+              self.spawn_count += 1
+              self.active_enemies.add(enemy)
+         return enemy
+
+    def return_enemy_to_pool(self, enemy):
+         """Puts a killed enemy view back on its type's free-list."""
+         self.enemy_pool.release(enemy.pool_key, enemy)
+
+    def advance_enemies(self, dt):
+         """Advances every enemy in one vectorized step.
+         Returns the Enemy views that reached the end of the path this tick."""
+         ended_slots = self.enemy_store.advance(dt)
+         return [self.enemy_views[slot] for slot in ended_slots]
 
 
     def start_next_wave(self):
@@ -144,6 +356,9 @@ class WaveManager:
                 self.next_spawn_index = 0
                 self.spawning_group = None
                 self.time_since_last_wave = 0.0 # Reset time between waves timer
+                # Previous wave's peak is known: drop the excess, then size for this wave
+                self.trim_pools()
+                self.prewarm_pools(wave_id)
             else:
                 print(f"Error: Wave definition not found for ID: {wave_id}")
                 # Skip this wave? Or halt? Let's just log error and potentially stall.
@@ -180,9 +395,7 @@ class WaveManager:
             enemy_type, remaining, interval, timer = self.spawning_group
             timer -= dt
             if timer <= 0 and remaining > 0:
-                enemy = self._get_enemy_from_pool(enemy_type)
-                if enemy:
-                    self.active_enemies.add(enemy)
+                self.spawn_enemy(enemy_type)
                 remaining -= 1
                 timer = interval # Reset timer for next spawn in group
                 if remaining == 0:
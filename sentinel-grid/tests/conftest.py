@@ -0,0 +1,8 @@
+# tests/conftest.py
+import os
+import sys
+
+# Headless pygame, and `src` / `benchmarks` importable however pytest is started
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
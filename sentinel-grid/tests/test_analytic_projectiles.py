@@ -0,0 +1,73 @@
+# tests/test_analytic_projectiles.py
+"""AnalyticProjectiles: a shot's impact is solved when it is fired, applied
+on the first tick at or after it, and solved again if the target dies first."""
+import contextlib
+import io
+import math
+import pygame
+import pytest
+from src.clock import FIXED_DT
+from src.config import SCREEN_SIZE
+from src.simulation import Simulation
+
+HEALTH = 50 # grunt
+
+
+@pytest.fixture
+def sim():
+    """level1 without waves: one gun tower and two grunts stacked on the path."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        sim = Simulation(pygame.Rect((0, 0), SCREEN_SIZE), projectile_mode="analytic")
+        sim.load_level("level1")
+        sim.wave_manager.wave_sequence = []
+        sim.place_tower("gun_tower", 0)
+        for _ in range(2):
+            sim.wave_manager.spawn_enemy("grunt", progress=150)
+    return sim
+
+
+def _enemies(sim):
+    return sorted((enemy for enemy in sim.enemy_group), key=lambda enemy: enemy.spawn_id)
+
+def _first_shot(sim):
+    shots = sim.tower_manager.shots
+    with contextlib.redirect_stdout(io.StringIO()):
+        while not shots.shots:
+            sim.update(FIXED_DT)
+    return next(iter(shots.in_flight()))
+
+
+def test_impact_lands_on_the_first_tick_after_it(sim):
+    first, second = _enemies(sim)
+    shot = _first_shot(sim)
+    assert shot.target is first # Stacked enemies tie; the earlier spawn takes the hit
+    due_tick = math.ceil(shot.hit_time / FIXED_DT - 1e-9)
+    damage = shot.damage
+    while sim.clock.ticks < due_tick - 1:
+        sim.update(FIXED_DT)
+    assert first.health == HEALTH
+    sim.update(FIXED_DT)
+    assert sim.clock.ticks == due_tick
+    assert (first.health, second.health) == (HEALTH - damage, HEALTH)
+    assert not sim.tower_manager.shots.shots
+
+
+def test_shot_moves_on_when_its_target_dies(sim):
+    first, second = _enemies(sim)
+    shot = _first_shot(sim)
+    first.take_damage(HEALTH) # Killed by something else while the shot flies
+    assert not first.is_active
+    for _ in range(math.ceil((shot.hit_time - sim.clock.time) / FIXED_DT) + 1):
+        sim.update(FIXED_DT)
+    assert second.health == HEALTH - shot.damage # Solved again: the enemy under it takes the hit
+    assert shot.target is second and not shot.is_active
+
+
+def test_shot_with_nothing_left_to_hit_expires(sim):
+    shot = _first_shot(sim)
+    for enemy in _enemies(sim):
+        enemy.take_damage(HEALTH)
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(math.ceil((shot.end_time - sim.clock.time) / FIXED_DT) + 1):
+            sim.update(FIXED_DT)
+    assert not shot.is_active and shot.target is None
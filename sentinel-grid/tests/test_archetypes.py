@@ -0,0 +1,90 @@
+# tests/test_archetypes.py
+"""Archetype compilation: defaults, read-only records that survive the content
+cache's pickling, field errors, and palette-index checks that follow the
+active palette."""
+import pickle
+import pytest
+from src import config
+from src.archetypes import compile_enemy, compile_tower, compile_towers
+from src.clock import stepped_duration
+
+GRUNT = {"name": "Grunt", "size": [20, 20], "health": 50, "speed": 75, "reward": 25,
+         "fill_color_idx": 6, "border_color_idx": 1}
+
+
+@pytest.fixture
+def palette():
+    """Restores the palette a test switches away from."""
+    original = config.get_palette()
+    yield
+    config.set_active_palette(original)
+
+
+def test_color_index_checked_against_the_switched_palette(palette):
+    compile_enemy("grunt", GRUNT)
+    config.set_active_palette(config.get_palette()[:4])
+    with pytest.raises(ValueError, match=r"fill_color_idx.*0\.\.3"):
+        compile_enemy("grunt", GRUNT)
+
+
+def test_larger_palette_accepts_new_indices(palette):
+    wide = dict(GRUNT, fill_color_idx=len(config.get_palette()))
+    with pytest.raises(ValueError):
+        compile_enemy("grunt", wide)
+    config.set_active_palette(list(config.get_palette()) + [(1, 2, 3)])
+    assert compile_enemy("grunt", wide).fill_color_idx == wide["fill_color_idx"]
+
+
+def test_defaults_and_derived_fields():
+    tower = compile_tower("plain", {"fire_rate": 3})
+    assert (tower.name, tower.range, tower.targeting) == ("Unknown Tower", 100, "closest")
+    assert tower.cooldown == pytest.approx(1 / 3)
+    assert tower.cooldown_span == stepped_duration(1 / 3)
+    assert tower.projectile.pool_key == "plain" and tower.projectile.half == 3
+    assert compile_tower("idle", {"fire_rate": 0}).cooldown == float('inf')
+
+
+def test_archetypes_are_read_only():
+    entry = dict(GRUNT)
+    grunt = compile_enemy("grunt", entry)
+    with pytest.raises(AttributeError, match="read-only"):
+        grunt.health = 1
+    with pytest.raises(TypeError):
+        grunt.data["health"] = 1
+    entry["health"] = 1 # The source dict is copied, not shared
+    assert grunt.data["health"] == 50 and grunt.health == 50.0
+
+
+def test_archetypes_pickle():
+    towers = compile_towers({"gun": {"range": 150, "upgrades_to": "gun_mk2"}, "gun_mk2": {"range": 200}})
+    copy = pickle.loads(pickle.dumps(towers))
+    gun = copy["gun"]
+    assert (gun.range, gun.upgrades_to, gun.projectile.speed) == (150, "gun_mk2", 300)
+    assert dict(gun.data) == {"range": 150, "upgrades_to": "gun_mk2"}
+    with pytest.raises(TypeError):
+        gun.data["range"] = 1
+    with pytest.raises(AttributeError):
+        gun.range = 1
+
+
+@pytest.mark.parametrize("entry, message", [
+    ({"health": "lots"}, r"grunt: 'health' must be a number"),
+    ({"speed": -5}, r"grunt: 'speed' must be >= 0"),
+    ({"size": [20]}, r"grunt: 'size' must be two positive numbers"),
+    ({"shape_type": "star"}, r"grunt: 'shape_type' must be one of"),
+    ({"shape_type": "polygon", "shape_points": [1, 2]}, r"grunt: 'shape_points'"),
+])
+def test_enemy_errors_name_the_field(entry, message):
+    with pytest.raises(ValueError, match=message):
+        compile_enemy("grunt", dict(GRUNT, **entry))
+
+
+def test_tower_errors_name_the_field():
+    with pytest.raises(ValueError, match=r"gun: unknown targeting 'random'"):
+        compile_tower("gun", {"targeting": "random"})
+    with pytest.raises(ValueError, match=r"gun: 'projectile_shape' must be an object"):
+        compile_tower("gun", {"projectile_shape": 3})
+    with pytest.raises(ValueError, match=r"gun: upgrades_to 'gun_mk9' is not a tower"):
+        compile_towers({"gun": {"upgrades_to": "gun_mk9"}})
+    with pytest.raises(ValueError, match=r"Tower 'gun' must be an object"):
+        compile_towers({"gun": []})
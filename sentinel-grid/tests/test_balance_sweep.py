@@ -0,0 +1,61 @@
+# tests/test_balance_sweep.py
+"""Balance sweep: grid expansion, spec validation and a small pooled run
+whose rows do not depend on which worker ran them or in what order."""
+import csv
+import pytest
+from src.balance_sweep import expand_grid, build_jobs, validate_spec, run_sweep, RESULT_FIELDS
+
+SPEC = {
+    "levels": ["level1"],
+    "placements": {"level1": ["gun_tower:0", "slow_tower:1"]},
+    "grid": {"towers.gun_tower.damage": [40, 1, 40], "waves.wave1_l1.0.count": [2, 3]},
+}
+
+
+def test_expand_grid_is_the_cartesian_product():
+    configs = expand_grid({"b": [1, 2], "a": ["x", "y", "z"]})
+    assert len(configs) == 6
+    assert configs[0] == {"a": "x", "b": 1} and configs[-1] == {"a": "z", "b": 2}
+    assert expand_grid({}) == [{}]
+
+
+def test_build_jobs():
+    jobs = build_jobs(dict(SPEC, levels=["level1", "level2"], placements={"level1": ["gun_tower:3"]}))
+    assert len(jobs) == 12
+    assert jobs[0] == (0, "level1", {"towers.gun_tower.damage": 40, "waves.wave1_l1.0.count": 2}, [("gun_tower", 3)])
+    assert jobs[1][1:] == ("level2", jobs[0][2], [])
+
+
+@pytest.mark.parametrize("spec", [
+    {"grid": {"towers.gun_tower.dps": [1]}},
+    {"grid": {"towers.no_such_tower.damage": [1]}},
+    {"grid": {"damage": [1]}},
+    {"grid": {"waves.wave1_l1.9.count": [1]}},
+    {"levels": ["level9"]},
+])
+def test_validate_rejects_unknown_keys(spec, capsys):
+    with pytest.raises(KeyError):
+        validate_spec(spec)
+
+
+def _rows(path):
+    with open(path, newline="") as f:
+        rows = list(csv.DictReader(f))
+    for row in rows:
+        del row["wall_time"]
+    return rows
+
+
+def test_pooled_runs_are_isolated_and_deterministic(tmp_path, capsys):
+    one, two = tmp_path / "one.csv", tmp_path / "two.csv"
+    assert run_sweep(SPEC, str(one), workers=1, max_sim_time=60) == 6
+    assert run_sweep(SPEC, str(two), workers=2, max_sim_time=60) == 6
+    rows = _rows(one)
+    assert rows == _rows(two)
+    assert list(rows[0]) == [f for f in RESULT_FIELDS if f != "wall_time"] + sorted(SPEC["grid"])
+    by_config = {int(row["config_id"]): row for row in rows}
+    # Configs 0-1 and 4-5 share parameters; config 2-3 (damage 1) ran in between on the same worker
+    for first, again in ((0, 4), (1, 5)):
+        assert {k: v for k, v in by_config[first].items() if k != "config_id"} == \
+               {k: v for k, v in by_config[again].items() if k != "config_id"}
+    assert int(by_config[0]["kills"]) > int(by_config[2]["kills"])
@@ -0,0 +1,69 @@
+# tests/test_benchmarks.py
+"""Benchmark scenarios build what they describe, and the runner's baseline
+comparison flags only throughput drops beyond the threshold."""
+import contextlib
+import io
+import pytest
+from main import Game
+from benchmarks import run
+from benchmarks.run import compare, load_baselines, run_scenario, THROUGHPUT_METRICS, BASELINE_PATH
+from benchmarks.scenarios import SCENARIOS, INVINCIBLE_CORE_HEALTH
+
+
+@pytest.fixture(scope="module")
+def game():
+    with contextlib.redirect_stdout(io.StringIO()):
+        return Game(headless=True)
+
+
+def _setup(game, name):
+    with contextlib.redirect_stdout(io.StringIO()):
+        SCENARIOS[name][0](game)
+    return game.sim
+
+
+def test_level2_all_mk2(game):
+    sim = _setup(game, "level2_all_mk2")
+    assert len(sim.tower_group) == len(sim.platform_group)
+    assert {tower.tower_id for tower in sim.tower_group} == {"gun_tower_mk2"}
+
+
+def test_grunts_5000_level1(game):
+    sim = _setup(game, "grunts_5000_level1")
+    assert len(sim.enemy_group) == 5000
+    assert sim.core.current_health == INVINCIBLE_CORE_HEALTH
+    assert sim.wave_manager.wave_sequence == ["bench_empty"]
+
+
+def test_slow_towers_200_dense_wave(game):
+    sim = _setup(game, "slow_towers_200_dense_wave")
+    assert len(sim.tower_group) == 200
+    assert sum(event["count"] for event in sim.wave_manager.wave_definitions["bench_dense"]) == 600
+    assert "bench_dense" not in game.sim.content.wave_definitions # The shared registry is untouched
+
+
+def test_run_scenario_reports_every_metric(game, monkeypatch):
+    monkeypatch.setitem(SCENARIOS, "tiny", (SCENARIOS["level2_all_mk2"][0], 5, 2))
+    monkeypatch.setattr(run, "WARMUP_TICKS", 2)
+    monkeypatch.setattr(run, "MEMORY_TICKS", 2)
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = run_scenario(game, "tiny")
+    assert set(result) == {"sim_ticks_per_second", "render_fps", "peak_memory_kb", "enemies_after_run", "towers"}
+    assert result["sim_ticks_per_second"] > 0 and result["render_fps"] > 0 and result["peak_memory_kb"] > 0
+
+
+def test_compare_flags_drops_beyond_the_threshold(capsys):
+    baselines = {"scenarios": {"a": {"sim_ticks_per_second": 1000.0, "render_fps": 100.0}}}
+    assert compare({"a": {"sim_ticks_per_second": 905.0, "render_fps": 300.0}}, baselines, 10.0) == []
+    failures = compare({"a": {"sim_ticks_per_second": 880.0, "render_fps": 100.0}}, baselines, 10.0)
+    assert failures == ["a.sim_ticks_per_second dropped 12.0% (limit 10.0%)"]
+    assert compare({"unknown": {"sim_ticks_per_second": 1.0, "render_fps": 1.0}}, baselines, 10.0) == []
+    assert "no baseline stored" in capsys.readouterr().out
+
+
+def test_stored_baselines_cover_every_scenario():
+    baselines = load_baselines(BASELINE_PATH)
+    assert set(baselines["scenarios"]) == set(SCENARIOS)
+    for result in baselines["scenarios"].values():
+        assert all(result[metric] > 0 for metric in THROUGHPUT_METRICS)
+    assert load_baselines("/nonexistent/baselines.json")["scenarios"] == {}
@@ -0,0 +1,73 @@
+# tests/test_collisions.py
+"""CollisionSystem sort-and-sweep against Rect.colliderect, and its
+deterministic hit order."""
+import random
+from types import SimpleNamespace
+import pygame
+from src.collisions import CollisionSystem
+
+
+class Group:
+    """Just enough of a sprite group for hits()."""
+    def __init__(self, items):
+        self.items = items
+
+    def sprites(self):
+        return list(self.items)
+
+
+def _enemy(spawn_id, x, y, w=20, h=20):
+    rect = pygame.Rect(0, 0, w, h)
+    rect.center = (x, y)
+    return SimpleNamespace(spawn_id=spawn_id, rect=rect, is_active=True)
+
+def _projectile(x, y, size=6):
+    rect = pygame.Rect(0, 0, size, size)
+    rect.center = (x, y)
+    return SimpleNamespace(rect=rect, is_active=True)
+
+
+def test_each_projectile_hits_the_earliest_spawned_overlap():
+    enemies = [_enemy(7, 100, 100), _enemy(3, 105, 100), _enemy(5, 110, 100)]
+    shot = _projectile(106, 100)
+    system = CollisionSystem()
+    system.build(enemies)
+    assert [(p, e.spawn_id) for p, e in system.hits(Group([shot]))] == [(shot, 3)]
+
+
+def test_matches_colliderect_brute_force():
+    rng = random.Random(5)
+    enemies = [_enemy(i, rng.uniform(0, 400), rng.uniform(0, 300), rng.choice([14, 20, 30]), rng.choice([18, 24]))
+               for i in range(60)]
+    rng.shuffle(enemies)
+    shots = [_projectile(rng.uniform(0, 400), rng.uniform(0, 300)) for _ in range(200)]
+    system = CollisionSystem()
+    system.build(enemies)
+    found = {id(p): e for p, e in system.hits(Group(shots))}
+    for shot in shots:
+        overlapping = [e for e in enemies if shot.rect.colliderect(e.rect)]
+        expected = min(overlapping, key=lambda e: e.spawn_id) if overlapping else None
+        assert found.get(id(shot)) is expected
+    assert system.pair_tests < len(shots) * len(enemies) / 4 # The sweep prunes most pairs
+
+
+def test_enemy_killed_by_an_earlier_pair_is_not_offered_again():
+    first, second = _enemy(0, 100, 100), _enemy(1, 104, 100)
+    shots = [_projectile(102, 100), _projectile(102, 100)]
+    system = CollisionSystem()
+    system.build([first, second])
+    hits = []
+    for shot, enemy in system.hits(Group(shots)):
+        hits.append(enemy.spawn_id)
+        enemy.is_active = False # Killed
+    assert hits == [0, 1]
+
+
+def test_inactive_and_zero_size_are_skipped():
+    dead = _enemy(0, 100, 100)
+    dead.is_active = False
+    system = CollisionSystem()
+    system.build([dead, _enemy(1, 300, 300)])
+    spent = _projectile(300, 300)
+    spent.is_active = False
+    assert list(system.hits(Group([_projectile(100, 100), spent, _projectile(300, 300, size=0)]))) == []
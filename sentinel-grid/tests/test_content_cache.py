@@ -0,0 +1,105 @@
+# tests/test_content_cache.py
+"""ContentRegistry binary cache: hits while the data files are unchanged,
+and is invalidated by their size, content hash or the cache format."""
+import os
+import pickle
+import shutil
+import pytest
+from src import content
+from src.content import load_content, DATA_DIR
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """A private copy of data/ (and a fresh process-wide registry table)."""
+    monkeypatch.setattr(content, "_loaded", {})
+    copy = tmp_path / "data"
+    shutil.copytree(DATA_DIR, copy)
+    return str(copy)
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return str(tmp_path / "cache" / "content.pickle")
+
+
+def _load(data_dir, cache_path):
+    return load_content(data_dir, cache_path, reload=True)
+
+def _manifest(cache_path):
+    with open(cache_path, 'rb') as f:
+        return pickle.load(f)["manifest"]
+
+def _edit_towers(data_dir, old, new):
+    path = os.path.join(data_dir, "towers.json")
+    with open(path) as f:
+        text = f.read()
+    assert old in text
+    with open(path, 'w') as f:
+        f.write(text.replace(old, new, 1))
+    return path
+
+
+def test_second_load_hits(data_dir, cache_path):
+    first = _load(data_dir, cache_path)
+    assert not first.from_cache and os.path.exists(cache_path)
+    second = _load(data_dir, cache_path)
+    assert second.from_cache
+    assert second.tower_types.keys() == first.tower_types.keys()
+    assert second.tower_types["gun_tower"].cooldown_span == first.tower_types["gun_tower"].cooldown_span
+    assert dict(second.tower_types["gun_tower"].data) == first.tower_data["gun_tower"]
+
+
+def test_touched_file_still_hits_and_refreshes_mtime(data_dir, cache_path):
+    _load(data_dir, cache_path)
+    path = os.path.join(data_dir, "enemies.json")
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000_000))
+    assert _load(data_dir, cache_path).from_cache # Same bytes: the hash matches
+    assert _manifest(cache_path)["data/enemies.json"][0] == stat.st_mtime_ns + 5_000_000_000
+
+
+def test_edit_same_size_misses(data_dir, cache_path):
+    _load(data_dir, cache_path)
+    _edit_towers(data_dir, '"fire_rate": 1.25', '"fire_rate": 1.35')
+    reloaded = _load(data_dir, cache_path)
+    assert not reloaded.from_cache
+    assert reloaded.tower_types["gun_tower"].fire_rate == 1.35
+    assert _load(data_dir, cache_path).from_cache # Rewritten for the new content
+
+
+def test_matching_mtime_and_size_are_trusted(data_dir, cache_path):
+    """The fast path: a file whose mtime and size match the manifest is not read."""
+    _load(data_dir, cache_path)
+    path = os.path.join(data_dir, "towers.json")
+    stat = os.stat(path)
+    _edit_towers(data_dir, '"fire_rate": 1.25', '"fire_rate": 1.35')
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    stale = _load(data_dir, cache_path)
+    assert stale.from_cache and stale.tower_types["gun_tower"].fire_rate == 1.25
+
+
+def test_size_change_misses(data_dir, cache_path):
+    _load(data_dir, cache_path)
+    path = _edit_towers(data_dir, '"cost": 100,', '"cost": 1000,')
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, _manifest(cache_path)["data/towers.json"][0])) # Same mtime
+    reloaded = _load(data_dir, cache_path)
+    assert not reloaded.from_cache
+    assert reloaded.tower_types["gun_tower"].cost == 1000
+
+
+def test_format_bump_misses(data_dir, cache_path, monkeypatch):
+    _load(data_dir, cache_path)
+    monkeypatch.setattr(content, "CACHE_FORMAT", content.CACHE_FORMAT + 1)
+    assert not _load(data_dir, cache_path).from_cache
+    assert _load(data_dir, cache_path).from_cache
+
+
+def test_corrupt_cache_is_rebuilt(data_dir, cache_path, capsys):
+    _load(data_dir, cache_path)
+    with open(cache_path, 'wb') as f:
+        f.write(b"not a pickle")
+    assert not _load(data_dir, cache_path).from_cache
+    assert "rebuilding" in capsys.readouterr().out
+    assert _load(data_dir, cache_path).from_cache
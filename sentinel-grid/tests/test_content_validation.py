@@ -0,0 +1,23 @@
+# tests/test_content_validation.py
+"""Level validation in ContentRegistry: map_background_idx follows the active palette."""
+import pytest
+from src import config
+from src.content import _validate_levels
+
+LEVEL = {"path_waypoints": [[0, 0], [100, 0]], "wave_sequence": ["w1"]}
+WAVES = {"w1": {}}
+
+
+@pytest.fixture
+def palette():
+    original = config.get_palette()
+    yield
+    config.set_active_palette(original)
+
+
+def test_background_checked_against_the_switched_palette(palette):
+    level = dict(LEVEL, map_background_idx=5)
+    _validate_levels({"level1": level}, WAVES)
+    config.set_active_palette(config.get_palette()[:4])
+    with pytest.raises(ValueError, match="map_background_idx"):
+        _validate_levels({"level1": level}, WAVES)
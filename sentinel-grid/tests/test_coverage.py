@@ -0,0 +1,78 @@
+# tests/test_coverage.py
+"""Path-interval range coverage: the intervals PathTable.circle_intervals
+gives a tower, and the "enemies in range" query built on them, agree with a
+plain distance test."""
+import contextlib
+import io
+import math
+import random
+import pygame
+import pytest
+from src.config import SCREEN_SIZE
+from src.path import PathTable
+from src.path_index import in_coverage
+from src.simulation import Simulation
+
+ZIGZAG = [(0, 360), (320, 360), (320, 540), (960, 540), (960, 180), (1280, 180), (1000, 100)]
+
+
+def test_intervals_match_sampled_distances():
+    rng = random.Random(11)
+    table = PathTable(ZIGZAG)
+    for _ in range(100):
+        center, radius = (rng.uniform(0, 1280), rng.uniform(0, 720)), rng.uniform(20, 400)
+        intervals = table.circle_intervals(center, radius)
+        assert intervals == sorted(intervals)
+        assert all(start < end for start, end in intervals)
+        for step in range(0, int(table.total_length), 7):
+            x, y = table.position_at(step, table.segment_at(step))
+            distance = math.hypot(x - center[0], y - center[1])
+            if abs(distance - radius) > 1e-6: # Skip points on the circle itself
+                assert in_coverage(intervals, step) == (distance < radius), (center, radius, step)
+
+
+@pytest.fixture
+def sim():
+    with contextlib.redirect_stdout(io.StringIO()):
+        sim = Simulation(pygame.Rect((0, 0), SCREEN_SIZE))
+        sim.load_level("level2")
+        sim.resource_manager.add_resources(10 ** 6)
+    return sim
+
+
+def test_placement_and_upgrade_set_the_intervals(sim):
+    table = sim.wave_manager.path_table
+    with contextlib.redirect_stdout(io.StringIO()):
+        sim.place_tower("gun_tower", 0)
+        tower = sim.tower_group.sprites()[0]
+        assert tower.path_intervals == table.circle_intervals(tower.rect.center, tower.range)
+        sim.tower_manager.select_placed_tower(tower)
+        assert sim.tower_manager.attempt_upgrade()
+    upgraded = sim.tower_group.sprites()[0]
+    assert upgraded.range > tower.range
+    assert upgraded.path_intervals == table.circle_intervals(upgraded.rect.center, upgraded.range)
+    assert sum(end - start for start, end in upgraded.path_intervals) > \
+           sum(end - start for start, end in tower.path_intervals)
+
+
+def test_enemies_in_range_match_a_distance_scan(sim):
+    rng = random.Random(3)
+    wave_manager = sim.wave_manager
+    total = wave_manager.path_table.total_length
+    with contextlib.redirect_stdout(io.StringIO()):
+        for platform in range(len(sim.platform_group)):
+            sim.place_tower(rng.choice(["gun_tower", "cannon_tower", "slow_tower"]), platform)
+        for _ in range(300):
+            wave_manager.spawn_enemy(rng.choice(["grunt", "runner", "tank"]), progress=rng.uniform(0, total * 0.99))
+    sim.enemy_index.refresh(wave_manager.enemy_store, wave_manager.enemy_views)
+    hits = 0
+    for tower in sim.tower_group:
+        cx, cy = tower.rect.center
+        found = {enemy.spawn_id for enemy in tower.find_targets_in_range(sim.enemy_index)}
+        hits += len(found)
+        for enemy in sim.enemy_group:
+            x, y = wave_manager.enemy_store.positions[enemy.slot]
+            distance = math.hypot(x - cx, y - cy)
+            if abs(distance - tower.range) > 1e-6:
+                assert (enemy.spawn_id in found) == (distance < tower.range)
+    assert hits > 50
@@ -0,0 +1,63 @@
+# tests/test_enemy_store.py
+"""EnemyStore: one vectorized advance() moves every enemy, runs the slow
+timers and flags the ones that reach the end of the path."""
+import numpy as np
+import pytest
+from src.path import PathTable
+from src.wave_manager import EnemyStore
+
+DT = 1 / 60
+
+
+@pytest.fixture
+def store():
+    store = EnemyStore(capacity=2)
+    store.set_path(PathTable([(0, 0), (100, 0), (100, 100)]))
+    return store
+
+
+def _spawn(store, speed, progress=0.0):
+    slot = store.allocate()
+    store.spawn(slot, (0.0, 0.0), health=10, speed=speed, spawn_time=0.0)
+    if progress:
+        store.set_progress(slot, progress)
+    return slot
+
+
+def test_advance_moves_along_the_path(store):
+    slot = _spawn(store, speed=60, progress=95)
+    assert store.advance(DT * 10) == []
+    assert store.progress[slot] == pytest.approx(105)
+    assert store.positions[slot] == pytest.approx([100, 5])
+    assert store.prev_pos[slot] == pytest.approx([95, 0])
+
+
+def test_slow_expiry_restores_base_speed_before_the_move(store):
+    slot = _spawn(store, speed=60)
+    store.speed[slot] = 30
+    store.slow_timer[slot] = DT * 2.5
+    store.advance(DT)
+    store.advance(DT)
+    assert store.speed[slot] == 30
+    assert store.progress[slot] == pytest.approx(1.0)
+    store.advance(DT) # Timer runs out: this step already moves at base speed
+    assert (store.speed[slot], store.slow_timer[slot]) == (60, 0.0)
+    assert store.progress[slot] == pytest.approx(2.0)
+
+
+def test_reaching_the_end_flags_the_slot(store):
+    near = _spawn(store, speed=60, progress=199.5)
+    far = _spawn(store, speed=60)
+    assert store.advance(DT) == [near]
+    assert store.progress[near] == 200 and store.reached_end[near] and not store.active[near]
+    assert store.active[far] and not store.reached_end[far]
+    assert store.advance(DT) == [] # Inactive slots stay put
+
+
+def test_growing_keeps_live_slots(store):
+    slots = [_spawn(store, speed=10 * (i + 1), progress=i) for i in range(5)] # Capacity 2 -> 8
+    assert store.capacity == 8 and store.live_count == 5
+    store.advance(DT * 6)
+    assert np.allclose(store.progress[slots], [i + (i + 1) for i in range(5)])
+    store.release(slots[0])
+    assert store.allocate() == slots[0] # Lowest free slot first
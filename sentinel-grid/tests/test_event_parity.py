@@ -0,0 +1,81 @@
+# tests/test_event_parity.py
+"""Event-driven engine vs fixed-step engine on a few fixed tower layouts.
+
+Against analytic projectiles every layout matches, slow towers included: the
+event engine acts on the same step grid, and both engines re-solve a shot
+whose target changed speed from the moment the speed changed (for the fixed
+engine, the start of that tick) and break equal-time hits by spawn order.
+The one known analytic difference is a range circle that only touches the
+path (a single-point coverage interval, e.g. level1 platform 1): the fixed
+engine sees an enemy there only if its float progress lands exactly on the
+point, the event engine always does.
+
+Stepped projectiles only test overlap at step ends, so a shot that grazes an
+enemy's box between two steps flies on and may hit the enemy behind it. That
+can turn a kill into a leak (or back), so stepped comparisons only require the
+same outcome and kill/leak counts within a few enemies."""
+import pytest
+from src.simulation import simulate
+from src.event_sim import simulate_events
+
+KILL_TOLERANCE = 4  # Enemies that may be killed in one engine and leak in the other (stepped)
+TICK_TOLERANCE = 1 # Steps of rounding between the event time and the fixed step count
+
+EXACT_LAYOUTS = [
+    ("level1", [("gun_tower", 0), ("cannon_tower", 1)]),
+    ("level1", [("cannon_tower", 1)]),
+    ("level2", [("gun_tower", 0), ("gun_tower", 1), ("gun_tower", 2), ("gun_tower", 3)]),
+    ("level2", [("cannon_tower", 2), ("gun_tower", 4)]),
+]
+SLOW_LAYOUTS = [
+    ("level1", [("slow_tower", 2)]),
+    ("level1", [("gun_tower", 0), ("slow_tower", 1)]),
+    ("level2", [("gun_tower", 0), ("slow_tower", 1)]),
+    ("level2", [("gun_tower", 1), ("slow_tower", 2), ("gun_tower", 3)]),
+]
+
+
+@pytest.fixture(scope="module")
+def event_results():
+    return {}
+
+
+def _event(cache, level_id, placements):
+    key = (level_id, tuple(placements))
+    if key not in cache:
+        cache[key] = simulate_events(level_id, placements)
+    return cache[key]
+
+
+@pytest.mark.parametrize("level_id, placements", EXACT_LAYOUTS + SLOW_LAYOUTS)
+def test_matches_analytic_projectiles_exactly(event_results, level_id, placements):
+    event = _event(event_results, level_id, placements)
+    fixed = simulate(level_id, placements, projectile_mode="analytic")
+    assert fixed["towers"] == len(placements)
+    for key in ("outcome", "leaks", "kills", "resources", "core_damage_taken"):
+        assert event[key] == fixed[key], key
+    assert abs(event["ticks"] - fixed["ticks"]) <= TICK_TOLERANCE
+
+
+@pytest.mark.parametrize("level_id, placements", EXACT_LAYOUTS + SLOW_LAYOUTS)
+def test_matches_stepped_projectiles_within_tolerance(event_results, level_id, placements):
+    event = _event(event_results, level_id, placements)
+    fixed = simulate(level_id, placements, projectile_mode="stepped")
+    assert fixed["towers"] == len(placements)
+    assert event["outcome"] == fixed["outcome"]
+    assert abs(event["kills"] - fixed["kills"]) <= KILL_TOLERANCE
+    assert abs(event["leaks"] - fixed["leaks"]) <= KILL_TOLERANCE
+
+
+def test_stepped_graze_drift(event_results):
+    """Known drift: in level1 with a gun and a slow tower, a shot at a slowed
+    grunt first crosses the box corner of the unslowed grunt catching up with
+    it, for less than a step. The continuous engines count that hit; the
+    stepped shot misses it and finishes off the slowed grunt instead, so the
+    stepped game has one more kill (both lose on the fifth leak)."""
+    placements = [("gun_tower", 0), ("slow_tower", 1)]
+    event = _event(event_results, "level1", placements)
+    analytic = simulate("level1", placements, projectile_mode="analytic")
+    stepped = simulate("level1", placements, projectile_mode="stepped")
+    assert (event["kills"], event["leaks"]) == (analytic["kills"], analytic["leaks"]) == (1, 5)
+    assert (stepped["kills"], stepped["leaks"]) == (2, 5)
@@ -0,0 +1,104 @@
+# tests/test_hud.py
+"""Retained HUD: a widget re-renders only when its bound value or the palette
+changes (or it is invalidated), and the retained HUD draws the same pixels
+as one built from scratch."""
+import contextlib
+import io
+import pygame
+import pytest
+from src import config
+from src.clock import FIXED_DT
+from src.config import SCREEN_SIZE
+from src.hud import HudWidget
+from src.simulation import Simulation
+from src.ui_manager import UIManager
+
+
+@pytest.fixture
+def palette():
+    """Restores the palette a test switches away from."""
+    original = config.get_palette()
+    yield
+    config.set_active_palette(original)
+
+
+class Counter:
+    """A bound value and a render function that records its calls."""
+    def __init__(self):
+        self.value = 0
+        self.rendered = []
+        self.surface = pygame.Surface((4, 4))
+
+    def render(self, value):
+        self.rendered.append(value)
+        return [(self.surface, (value, 0))]
+
+
+def test_widget_renders_only_on_change(palette):
+    counter = Counter()
+    widget = HudWidget("counter", lambda: counter.value, counter.render)
+    screen = pygame.Surface((64, 64))
+    for _ in range(5):
+        widget.draw(screen)
+    assert counter.rendered == [0] and widget.blits == [(counter.surface, (0, 0))]
+    counter.value = 3
+    widget.draw(screen)
+    widget.draw(screen)
+    assert counter.rendered == [0, 3]
+    widget.invalidate()
+    widget.draw(screen)
+    assert counter.rendered == [0, 3, 3]
+    config.set_active_palette(list(config.get_palette()))
+    widget.draw(screen)
+    assert counter.rendered == [0, 3, 3, 3] and widget.renders == 4
+
+
+@pytest.fixture
+def game():
+    """A level2 simulation and the UIManager drawing its HUD."""
+    pygame.font.init()
+    with contextlib.redirect_stdout(io.StringIO()):
+        sim = Simulation(pygame.Rect((0, 0), SCREEN_SIZE))
+        sim.load_level("level2")
+        ui = UIManager(sim.resource_manager, sim.wave_manager, sim.core, sim.tower_manager)
+    return sim, ui
+
+
+def _renders(ui):
+    return {widget.name: widget.renders for widget in ui.hud_widgets}
+
+
+def test_only_the_changed_widget_rerenders(game):
+    sim, ui = game
+    screen = pygame.Surface(SCREEN_SIZE)
+    ui.draw_hud(screen)
+    first = _renders(ui)
+    assert set(first.values()) == {1}
+    ui.draw_hud(screen)
+    assert _renders(ui) == first
+    sim.resource_manager.add_resources(50)
+    ui.draw_hud(screen)
+    assert _renders(ui) == dict(first, resources=2)
+    with contextlib.redirect_stdout(io.StringIO()):
+        sim.tower_manager.select_tower_type("gun_tower")
+    ui.draw_hud(screen)
+    assert _renders(ui) == dict(first, resources=2, info_panel=2)
+
+
+def test_retained_hud_matches_a_fresh_one(game):
+    sim, ui = game
+    retained = pygame.Surface(SCREEN_SIZE)
+    with contextlib.redirect_stdout(io.StringIO()):
+        sim.place_tower("gun_tower", 0)
+        for tick in range(1200):
+            sim.update(FIXED_DT)
+            if tick % 60 == 0:
+                retained.fill((0, 0, 0))
+                ui.draw_hud(retained)
+        fresh_ui = UIManager(sim.resource_manager, sim.wave_manager, sim.core, sim.tower_manager)
+    retained.fill((0, 0, 0))
+    ui.draw_hud(retained)
+    fresh = pygame.Surface(SCREEN_SIZE)
+    fresh_ui.draw_hud(fresh)
+    assert sum(_renders(ui).values()) > len(ui.hud_widgets) # Some values did change on the way
+    assert pygame.image.tobytes(retained, "RGB") == pygame.image.tobytes(fresh, "RGB")
@@ -0,0 +1,75 @@
+# tests/test_idle.py
+"""Idle mode: the game stops simulating and drawing while the window is
+unfocused or minimized, or once a pause/end overlay is on screen, and any
+event brings it back."""
+import contextlib
+import io
+import pygame
+import pytest
+import main
+from main import Game
+from src.config import STATE_PLAYING, STATE_PAUSED
+
+
+@pytest.fixture
+def game():
+    with contextlib.redirect_stdout(io.StringIO()):
+        game = Game(headless=True)
+    pygame.event.clear()
+    return game
+
+
+def _deliver(game, *event_types):
+    for event_type in event_types:
+        pygame.event.post(pygame.event.Event(event_type))
+    with contextlib.redirect_stdout(io.StringIO()):
+        game._handle_events()
+
+
+def test_window_state_drives_idle(game):
+    assert not game._is_idle()
+    _deliver(game, pygame.WINDOWFOCUSLOST)
+    assert game._is_idle()
+    _deliver(game, pygame.WINDOWFOCUSGAINED)
+    assert not game._is_idle()
+    _deliver(game, pygame.WINDOWMINIMIZED)
+    assert game._is_idle()
+    _deliver(game, pygame.WINDOWRESTORED)
+    assert not game._is_idle()
+
+
+def test_pause_idles_once_the_overlay_is_on_screen(game):
+    game.execute("pause")
+    assert game.game_manager.game_state == STATE_PAUSED
+    assert not game._is_idle() # The paused frame still has to be drawn once
+    game._draw()
+    assert game._is_idle()
+    game.execute("pause")
+    assert game.game_manager.game_state == STATE_PLAYING and not game._is_idle()
+    game._draw()
+    assert not game._is_idle() # Playing never idles while focused
+
+
+def test_idle_wait_times_out_without_simulating(game, monkeypatch):
+    monkeypatch.setattr(main, "IDLE_WAIT_MS", 5)
+    _deliver(game, pygame.WINDOWFOCUSLOST)
+    steps, sim_time = game.sim_steps, game.sim.clock.time
+    for _ in range(3):
+        game._idle_wait()
+    assert (game.sim_steps, game.sim.clock.time) == (steps, sim_time)
+    assert game._is_idle()
+
+
+def test_idle_wait_handles_the_event_that_woke_it(game, monkeypatch):
+    flips = []
+    monkeypatch.setattr(pygame.display, "flip", lambda: flips.append(1))
+    _deliver(game, pygame.WINDOWFOCUSLOST)
+    pygame.event.post(pygame.event.Event(pygame.WINDOWEXPOSED))
+    game._idle_wait()
+    assert flips == [1] and game._is_idle() # Uncovered: the last frame is presented again
+    pygame.event.post(pygame.event.Event(pygame.WINDOWFOCUSGAINED))
+    game._idle_wait()
+    assert not game._is_idle()
+    pygame.event.post(pygame.event.Event(pygame.QUIT))
+    game._idle_wait()
+    assert not game.game_manager.is_running
@@ -0,0 +1,87 @@
+# tests/test_overlays.py
+"""Pause/game-over/victory overlays: built once per state and palette, and
+composited once over the frozen last game frame."""
+import contextlib
+import io
+import pygame
+import pytest
+from src import config
+from src.config import SCREEN_SIZE, STATE_PAUSED, STATE_GAME_OVER, STATE_VICTORY
+from src.ui_manager import UIManager
+
+BASE = (40, 120, 200)
+
+
+@pytest.fixture
+def palette():
+    """Restores the palette a test switches away from."""
+    original = config.get_palette()
+    yield
+    config.set_active_palette(original)
+
+
+@pytest.fixture
+def ui():
+    pygame.font.init()
+    with contextlib.redirect_stdout(io.StringIO()):
+        return UIManager(resource_manager=None, wave_manager=None, core=None)
+
+
+def test_overlays_are_cached_per_state_and_palette(ui, palette):
+    pause = ui.get_overlay(STATE_PAUSED)
+    assert ui.get_overlay(STATE_PAUSED) is pause
+    assert ui.get_overlay(STATE_GAME_OVER) is not pause
+    assert ui.get_overlay(STATE_VICTORY) is not ui.get_overlay(STATE_GAME_OVER)
+    config.set_active_palette(list(config.get_palette()))
+    assert ui.get_overlay(STATE_PAUSED) is not pause
+
+
+def test_pause_tint_composites_like_an_alpha_blit(ui):
+    frame = pygame.Surface(SCREEN_SIZE)
+    frame.fill(BASE)
+    frame.blit(ui.get_overlay(STATE_PAUSED), (0, 0), special_flags=pygame.BLEND_PREMULTIPLIED)
+    tint = config.get_color(5, (0, 0, 50))
+    expected = [base + (color - base) * 150 / 255 for base, color in zip(BASE, tint)]
+    corner = frame.get_at((2, 2))
+    assert all(abs(channel - want) <= 1 for channel, want in zip(corner[:3], expected))
+
+
+def test_frozen_frame_ignores_later_screen_changes(ui):
+    screen = pygame.Surface(SCREEN_SIZE)
+    screen.fill(BASE)
+    ui.draw(screen, STATE_PAUSED)
+    assert ui.is_frozen(STATE_PAUSED) and not ui.is_frozen(STATE_GAME_OVER)
+    paused = pygame.image.tobytes(screen, "RGB")
+    frozen = ui._frozen_frame
+    screen.fill((255, 0, 0)) # Whatever ends up on screen, the frozen frame is presented as-is
+    ui.draw(screen, STATE_PAUSED)
+    assert ui._frozen_frame is frozen
+    assert pygame.image.tobytes(screen, "RGB") == paused
+
+    ui.draw(screen, STATE_GAME_OVER) # Same base frame, new overlay
+    assert ui.is_frozen(STATE_GAME_OVER)
+    expected = pygame.Surface(SCREEN_SIZE)
+    expected.fill(BASE)
+    expected.blit(ui.get_overlay(STATE_GAME_OVER), (0, 0), special_flags=pygame.BLEND_PREMULTIPLIED)
+    assert pygame.image.tobytes(screen, "RGB") == pygame.image.tobytes(expected, "RGB")
+
+
+def test_palette_change_recomposites_the_frozen_frame(ui, palette):
+    screen = pygame.Surface(SCREEN_SIZE)
+    screen.fill(BASE)
+    ui.draw(screen, STATE_PAUSED)
+    frozen = ui._frozen_frame
+    config.set_active_palette(list(config.get_palette()))
+    assert not ui.is_frozen(STATE_PAUSED)
+    ui.draw(screen, STATE_PAUSED)
+    assert ui._frozen_frame is not frozen and ui.is_frozen(STATE_PAUSED)
+
+
+def test_thaw_drops_the_frozen_frame(ui):
+    screen = pygame.Surface(SCREEN_SIZE)
+    ui.draw(screen, STATE_VICTORY)
+    ui.thaw()
+    assert not ui.is_frozen(STATE_VICTORY) and ui._frozen_base is None
+    screen.fill(BASE) # The next overlay state freezes the new frame
+    ui.draw(screen, STATE_PAUSED)
+    assert ui._frozen_base.get_at((0, 0))[:3] == BASE
@@ -0,0 +1,90 @@
+# tests/test_path.py
+"""PathTable lookups: positions along the polyline, and the closed-form
+box intercept analytic projectiles use, checked against brute force."""
+import math
+import pytest
+from src.path import PathTable
+
+# An L with a duplicate waypoint (zero-length segment) in the middle
+WAYPOINTS = [(0, 0), (100, 0), (100, 0), (100, 50), (40, 50)]
+
+
+@pytest.fixture
+def path():
+    return PathTable(WAYPOINTS)
+
+
+def test_lengths(path):
+    assert path.segment_count == 4
+    assert path.total_length == pytest.approx(210.0)
+    assert path.cumulative_lengths == pytest.approx([0, 100, 100, 150, 210])
+
+
+@pytest.mark.parametrize("distance, expected", [
+    (0.0, (0, 0)),
+    (30.0, (30, 0)),
+    (100.0, (100, 0)),
+    (125.0, (100, 25)),
+    (150.0, (100, 50)),
+    (180.0, (70, 50)),
+    (210.0, (40, 50)),
+    (999.0, (40, 50)), # Past the end clamps to it
+])
+def test_position_at(path, distance, expected):
+    assert path.position_at(distance, path.segment_at(distance)) == pytest.approx(expected)
+
+
+def test_segment_hint_only_moves_forward(path):
+    segment = 0
+    for distance in range(0, 211, 5):
+        segment = path.segment_at(distance, segment)
+        assert path.cumulative_lengths[segment] <= distance <= path.cumulative_lengths[segment + 1]
+
+
+def test_empty_path():
+    empty = PathTable([])
+    assert empty.total_length == 0
+    assert empty.position_at(10.0, 0) == (0.0, 0.0)
+
+
+def _brute_intercept(path, progress, speed, origin, velocity, half_size, t_limit, dt=1e-4):
+    """First sampled time the two boxes overlap (within dt of the exact time)."""
+    t = 0.0
+    while t < t_limit:
+        distance = progress + speed * t
+        if distance > path.total_length:
+            return None
+        ex, ey = path.position_at(distance, path.segment_at(distance))
+        px, py = origin[0] + velocity[0] * t, origin[1] + velocity[1] * t
+        if abs(px - ex) < half_size[0] and abs(py - ey) < half_size[1]:
+            return t
+        t += dt
+    return None
+
+
+@pytest.mark.parametrize("progress, speed, origin, velocity", [
+    (0.0, 50.0, (20, 40), (0.0, -300.0)),     # Straight down onto the first leg
+    (90.0, 40.0, (160, 10), (-200.0, 0.0)),   # Meets it at the corner
+    (120.0, 60.0, (20, 50), (250.0, 0.0)),    # Head-on along the last leg
+    (10.0, 0.0, (10, -80), (0.0, 150.0)),     # Standing enemy
+    (0.0, 50.0, (60, 40), (300.0, 0.0)),      # Flies away: never meets
+    (200.0, 80.0, (40, 0), (0.0, 100.0)),     # Enemy leaks first
+])
+def test_box_intercept_matches_brute_force(path, progress, speed, origin, velocity):
+    half_size = (12.0, 12.0)
+    t_limit = 2.0
+    exact = path.box_intercept(progress, speed, origin, velocity, half_size, t_limit)
+    sampled = _brute_intercept(path, progress, speed, origin, velocity, half_size, t_limit)
+    if sampled is None:
+        assert exact is None
+    else:
+        assert exact is not None
+        assert exact <= sampled + 1e-9
+        assert sampled - exact < 1e-3
+
+
+def test_box_intercept_respects_time_limit(path):
+    hit = path.box_intercept(0.0, 50.0, (20, 40), (0.0, -300.0), (12.0, 12.0), 2.0)
+    assert hit is not None
+    assert path.box_intercept(0.0, 50.0, (20, 40), (0.0, -300.0), (12.0, 12.0), hit * 0.5) is None
+    assert math.isfinite(hit)
@@ -0,0 +1,99 @@
+# tests/test_path_index.py
+"""PathProgressIndex against a brute-force reference. A level2 game with slow
+towers (enemies overtake each other), mid-path spawns and random damage is
+stepped, and after every tick each targeting strategy must pick exactly the
+enemy a linear scan over the live enemies picks, for random intervals."""
+import contextlib
+import io
+import random
+import pygame
+import pytest
+from src import path_index
+from src.config import SCREEN_SIZE
+from src.path_index import TARGETING_STRATEGIES
+from src.simulation import Simulation
+
+TICKS = 900
+QUERIES_PER_TICK = 4
+CENTER = (600, 300)
+
+
+def _in(intervals, progress):
+    return any(start <= progress <= end for start, end in intervals)
+
+
+def reference(enemies, strategy, intervals, center):
+    """Linear-scan target choice with the index's documented tie-breaks."""
+    candidates = [enemy for enemy in enemies if _in(intervals, enemy.progress)]
+    if not candidates:
+        return None
+    along = lambda enemy: (enemy.progress, enemy.slot) # Path order (ties in slot order)
+    if strategy == "first":
+        return max(candidates, key=along)
+    if strategy == "last":
+        return min(candidates, key=along)
+    if strategy == "strongest":
+        return max(candidates, key=lambda enemy: (enemy.health, along(enemy)))
+    if strategy == "weakest":
+        return max(candidates, key=lambda enemy: (-enemy.health, along(enemy)))
+    def distance_sq(enemy):
+        x, y = enemy.store.positions[enemy.slot]
+        return (x - center[0]) ** 2 + (y - center[1]) ** 2
+    return min(candidates, key=lambda enemy: (distance_sq(enemy), enemy.spawn_id))
+
+
+@pytest.fixture
+def sim():
+    with contextlib.redirect_stdout(io.StringIO()):
+        sim = Simulation(pygame.Rect((0, 0), SCREEN_SIZE))
+        sim.load_level("level2")
+        sim.resource_manager.add_resources(10 ** 6)
+        for platform, tower in enumerate(["slow_tower", "gun_tower", "slow_tower", "cannon_tower"]):
+            sim.place_tower(tower, platform)
+    return sim
+
+
+# 0: never re-sort (insertion repair only); huge: re-sort on any crossing
+@pytest.mark.parametrize("resort_fraction", [0, path_index.RESORT_FRACTION, 10 ** 9])
+def test_matches_brute_force(sim, monkeypatch, resort_fraction):
+    monkeypatch.setattr(path_index, "RESORT_FRACTION", resort_fraction)
+    rng = random.Random(7)
+    wave_manager = sim.wave_manager
+    total = wave_manager.path_table.total_length
+    index = sim.enemy_index
+    checked = 0
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(TICKS):
+            if sim.is_finished():
+                break
+            if rng.random() < 0.1:
+                enemy_type = rng.choice(sorted(wave_manager.enemy_types))
+                wave_manager.spawn_enemy(enemy_type, progress=rng.uniform(0, total * 0.9))
+            sim.update(1 / 60)
+            index.refresh(wave_manager.enemy_store, wave_manager.enemy_views)
+            live = [enemy for enemy in sim.enemy_group if enemy.is_active]
+            assert sorted((enemy.progress, enemy.slot) for enemy in live) == list(zip(index.progress, index.slots))
+            for _ in range(QUERIES_PER_TICK):
+                start = rng.uniform(0, total)
+                intervals = [(start, start + rng.uniform(0, 300))]
+                if rng.random() < 0.5: # Two stretches, like a range over a bend
+                    later = intervals[0][1] + rng.uniform(10, 200)
+                    intervals.append((later, later + rng.uniform(0, 200)))
+                for strategy in TARGETING_STRATEGIES:
+                    assert index.select(strategy, intervals, CENTER) is reference(live, strategy, intervals, CENTER), strategy
+                    checked += 1
+            for enemy in rng.sample(live, min(3, len(live))):
+                enemy.take_damage(rng.uniform(0, 4))
+    assert checked > 1000
+
+
+def test_furthest_before(sim):
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(300):
+            sim.update(1 / 60)
+    index = sim.enemy_index
+    index.refresh(sim.wave_manager.enemy_store, sim.wave_manager.enemy_views)
+    assert index.progress
+    for distance in [0.0, index.progress[0], index.progress[-1], index.progress[-1] + 1.0]:
+        below = [progress for progress in index.progress if progress < distance]
+        assert index.furthest_before(distance) == (max(below) if below else None)
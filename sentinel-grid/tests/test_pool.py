@@ -0,0 +1,89 @@
+# tests/test_pool.py
+"""ObjectPool free-lists and the counters pool sizes are tuned from."""
+import contextlib
+import io
+import pytest
+from src.pool import ObjectPool
+from src.simulation import simulate
+
+
+class Thing:
+    def __init__(self, key):
+        self.key = key
+
+
+@pytest.fixture
+def pool():
+    return ObjectPool(Thing)
+
+
+def _per_key(pool, key):
+    return pool.stats()["per_key"][key]
+
+
+def test_acquire_reuses_released_objects(pool):
+    first = pool.acquire("a")
+    pool.release("a", first)
+    assert pool.acquire("a") is first
+    assert (pool.hits, pool.misses, pool.allocations) == (1, 1, 1)
+
+
+def test_free_lists_are_per_key(pool):
+    pool.release("a", pool.acquire("a"))
+    b = pool.acquire("b")
+    assert b.key == "b"
+    assert pool.misses == 2
+    assert _per_key(pool, "a") == {"live": 0, "free": 1, "high_water": 1}
+    assert _per_key(pool, "b") == {"live": 1, "free": 0, "high_water": 1}
+
+
+def test_prewarm_allocates_up_to_capacity(pool):
+    held = pool.acquire("a")
+    pool.prewarm("a", 5)
+    assert pool.allocations == 5 # One acquired + four prewarmed
+    assert _per_key(pool, "a") == {"live": 1, "free": 4, "high_water": 5}
+    pool.prewarm("a", 3) # Already owns enough
+    assert pool.allocations == 5
+    objects = [pool.acquire("a") for _ in range(4)]
+    assert pool.misses == 1 and pool.hits == 4
+    assert held not in objects
+
+
+def test_high_water_tracks_peak_live(pool):
+    objects = [pool.acquire("a") for _ in range(6)]
+    for obj in objects[:4]:
+        pool.release("a", obj)
+    assert pool.live_count("a") == 2
+    assert _per_key(pool, "a")["high_water"] == 6
+
+
+def test_trim_keeps_the_peak_and_restarts_the_window(pool):
+    objects = [pool.acquire("a") for _ in range(6)]
+    for obj in objects:
+        pool.release("a", obj)
+    pool.trim() # Peak was 6: all six idle objects stay
+    assert pool.trimmed == 0
+    assert _per_key(pool, "a") == {"live": 0, "free": 6, "high_water": 0}
+
+    objects = [pool.acquire("a") for _ in range(2)]
+    pool.release("a", objects.pop())
+    pool.trim() # Peak 2 with 1 still live: keep one idle, drop four
+    assert pool.trimmed == 4
+    assert _per_key(pool, "a") == {"live": 1, "free": 1, "high_water": 1}
+
+
+def test_trim_counts_a_prewarm_as_use(pool):
+    pool.prewarm("a", 8)
+    pool.trim()
+    assert _per_key(pool, "a")["free"] == 8 # Reserved for the coming wave
+    pool.trim()
+    assert _per_key(pool, "a")["free"] == 0 # Never used: dropped next time
+    assert pool.trimmed == 8
+
+
+def test_projectile_pools_are_prewarmed_for_placed_towers():
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = simulate("level2", [("gun_tower", i) for i in range(4)])
+    projectiles = result["pool_stats"]["projectiles"]
+    assert projectiles["hits"] > 0
+    assert projectiles["misses"] == 0 # Every shot came from a prewarmed free-list
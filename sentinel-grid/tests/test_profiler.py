@@ -0,0 +1,132 @@
+# tests/test_profiler.py
+"""FrameProfiler counters, overlay and CSV export."""
+import contextlib
+import csv
+import io
+import pygame
+from src.clock import FixedStepClock, FIXED_DT
+from src.config import SCREEN_SIZE
+from src.simulation import Simulation
+from src import profiler as profiler_module
+from src.profiler import FrameProfiler, COUNTERS, PHASES, SUMMARY_INTERVAL
+
+
+def _frame(profiler, **counts):
+    profiler.begin_frame()
+    for name, amount in counts.items():
+        profiler.count(name, amount)
+    profiler.lap("draw")
+    profiler.end_frame()
+
+
+def test_clock_drops_steps_beyond_the_cap():
+    clock = FixedStepClock(max_steps=5)
+    assert clock.accumulate(FIXED_DT * 3.5) == 3
+    assert clock.dropped_time == 0.0
+    assert clock.accumulate(FIXED_DT * 9) == 5 # 9.5 steps owed: 4 dropped, the half step kept
+    assert round(clock.dropped_time / FIXED_DT) == 4
+    assert 0.4 < clock.alpha < 0.6
+
+
+def test_dropped_steps_reach_the_overlay_and_csv(tmp_path):
+    profiler = FrameProfiler(window=10)
+    profiler.set_enabled(True)
+    _frame(profiler, steps=5, dropped_steps=4)
+    for _ in range(3):
+        _frame(profiler, steps=1)
+    assert "dropped steps (last 4 frames): 4" in profiler.summary_lines()
+
+    path = tmp_path / "frames.csv"
+    profiler.export_csv(str(path))
+    with open(path, newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 4
+    assert [row["dropped_steps"] for row in rows] == ["4", "0", "0", "0"]
+    assert set(COUNTERS) <= set(rows[0])
+
+
+def test_disabled_profiler_records_nothing():
+    profiler = FrameProfiler()
+    _frame(profiler, steps=1, dropped_steps=2)
+    assert not profiler.rows
+    assert profiler.percentiles() == {}
+
+
+def test_towers_acted_counts_only_woken_towers():
+    with contextlib.redirect_stdout(io.StringIO()):
+        sim = Simulation(pygame.Rect((0, 0), SCREEN_SIZE))
+        sim.load_level("level2")
+        for platform in range(4):
+            sim.place_tower("gun_tower", platform)
+        profiler = sim.profiler
+        profiler.set_enabled(True)
+        for _ in range(600):
+            profiler.begin_frame()
+            sim.update(FIXED_DT)
+            profiler.end_frame()
+    column = len(PHASES) + 1 + COUNTERS.index("towers_acted") # Phase times, total, then counters
+    acted = [row[column] for row in profiler.rows]
+    assert len(acted) == 600 and max(acted) <= 4
+    assert 0 < sum(acted) < 600 # Idle and cooling-down towers are not run every step
+
+
+def test_csv_keeps_only_the_newest_frames(tmp_path):
+    profiler = FrameProfiler(window=10, csv_window=50)
+    profiler.set_enabled(True)
+    for step in range(120):
+        _frame(profiler, steps=step)
+    assert len(profiler.rows) == 50 and profiler.frames == 120
+
+    path = tmp_path / "frames.csv"
+    with contextlib.redirect_stdout(io.StringIO()):
+        profiler.export_csv(str(path))
+    with open(path, newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert [int(row["frame"]) for row in rows] == list(range(70, 120))
+    assert [int(row["steps"]) for row in rows] == list(range(70, 120))
+
+
+class FakeClock:
+    """perf_counter_ns stand-in advanced by hand (ns)."""
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+def test_laps_charge_the_time_since_the_previous_lap(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(profiler_module, "perf_counter_ns", clock)
+    profiler = FrameProfiler()
+    profiler.set_enabled(True)
+    for frame in range(100):
+        profiler.begin_frame()
+        clock.now += 1_000_000 # 1 ms of events
+        profiler.lap("events")
+        for _ in range(2): # Two fixed steps: tower time accumulates
+            clock.now += (frame + 1) * 10_000
+            profiler.lap("towers")
+        clock.now += 3_000_000
+        profiler.lap("draw")
+        profiler.end_frame()
+    row = profiler.rows[-1]
+    assert row[PHASES.index("events")] == 1_000_000
+    assert row[PHASES.index("towers")] == 2_000_000
+    assert row[PHASES.index("draw")] == 3_000_000
+    assert row[len(PHASES)] == 6_000_000 # Frame total
+    p50, p95, p99 = profiler.percentiles()["towers"]
+    assert (p50, p95, p99) == (1.02, 1.92, 2.0) # ms; frame k spent 0.02 * k
+
+
+def test_overlay_refreshes_every_summary_interval():
+    profiler = FrameProfiler()
+    profiler.set_enabled(True)
+    _frame(profiler, steps=1)
+    first = profiler.summary_lines()
+    assert first[0].startswith("phase") and "steps:1" in first[-2]
+    for _ in range(SUMMARY_INTERVAL - 1):
+        _frame(profiler, steps=2)
+    assert profiler.summary_lines() is first # Not yet due
+    _frame(profiler, steps=2)
+    assert "steps:2" in profiler.summary_lines()[-2]
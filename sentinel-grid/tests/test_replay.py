@@ -0,0 +1,100 @@
+# tests/test_replay.py
+"""Replays are deterministic: the same command log played twice (in fresh
+Games, in either projectile mode) ends in the same state hash."""
+import pygame
+import pytest
+from main import Game
+from src.clock import FIXED_DT
+from src.replay import ReplayRecorder, load_replay, play_replay, state_hash
+
+# Placement, upgrade, pause and restart on level1, then a second placement
+SESSION = [
+    (10, "select_type", "gun_tower"),
+    (10, "click", 150, 280),
+    (200, "select_type", "slow_tower"),
+    (200, "click", 880, 620),
+    (400, "click", 150, 280),
+    (400, "upgrade"),
+    (600, "pause"),
+    (700, "pause"),
+    (1500, "restart"),
+    (1600, "select_type", "gun_tower"),
+    (1600, "click", 400, 360),
+]
+END_TICK = 2400
+
+
+@pytest.fixture
+def replay_path(tmp_path):
+    path = tmp_path / "session.replay"
+    recorder = ReplayRecorder(str(path), "level1")
+    for tick, command, *args in SESSION:
+        recorder.record(tick, command, *args)
+    recorder.close(END_TICK)
+    return str(path)
+
+
+def _play(path, projectile_mode="stepped"):
+    game = Game(headless=True, projectile_mode=projectile_mode)
+    _, commands = load_replay(path)
+    return game, play_replay(game, commands, FIXED_DT)
+
+
+def test_log_round_trip(replay_path):
+    first_level, commands = load_replay(replay_path)
+    assert first_level == "level1"
+    assert commands[:2] == [(10, "select_type", ["gun_tower"]), (10, "click", [150, 280])]
+    assert commands[-1] == (END_TICK, "end", [])
+
+
+@pytest.mark.parametrize("projectile_mode", ["stepped", "analytic"])
+def test_replay_is_deterministic(replay_path, projectile_mode):
+    game, first = _play(replay_path, projectile_mode)
+    assert game.sim_steps == END_TICK
+    assert len(game.sim.tower_group) == 1 # The restart cleared the first two towers
+    _, second = _play(replay_path, projectile_mode)
+    assert first["state_hash"] == second["state_hash"]
+
+
+def test_hash_tracks_the_commands(replay_path, tmp_path):
+    _, report = _play(replay_path)
+    other = tmp_path / "other.replay"
+    recorder = ReplayRecorder(str(other), "level1")
+    for tick, command, *args in SESSION[:-1]: # Same session without the last placement
+        recorder.record(tick, command, *args)
+    recorder.close(END_TICK)
+    game, changed = _play(str(other))
+    assert changed["state_hash"] != report["state_hash"]
+    assert changed["state_hash"] == state_hash(game.sim)
+
+
+def test_bad_command_is_rejected(tmp_path):
+    path = tmp_path / "bad.replay"
+    path.write_text("sentinel-replay 1 level1\n10 click 150\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        load_replay(str(path))
+
+
+def test_recorded_live_session_replays_to_the_same_state(tmp_path):
+    """Keys go through _handle_events and the recorder like live play; the
+    log it writes must replay to the state the live session ended in."""
+    path = str(tmp_path / "live.replay")
+    game = Game(headless=True, record_path=path)
+    for tick in range(900):
+        if tick == 30:
+            pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_1))
+            game._handle_events()
+            game._command("click", 150, 280) # The mouse cannot be moved under the dummy driver
+        elif tick in (300, 360):
+            pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_p))
+            game._handle_events()
+        game.step(FIXED_DT)
+    game.recorder.close(game.sim_steps)
+    live_hash = state_hash(game.sim)
+    assert len(game.sim.tower_group) == 1
+
+    _, commands = load_replay(path)
+    assert [command for _, command, _ in commands] == ["select_type", "click", "pause", "pause", "end"]
+    assert [tick for tick, _, _ in commands] == [30, 30, 300, 360, 900]
+    _, report = _play(path)
+    assert report["state_hash"] == live_hash
@@ -0,0 +1,62 @@
+# tests/test_spatial_hash.py
+"""SpatialHashGrid circle queries, and the long-path segment index
+PathTable.circle_intervals uses it for."""
+import math
+import random
+import pytest
+from src import path as path_module
+from src.path import PathTable, GRID_MIN_SEGMENTS
+from src.spatial_hash import SpatialHashGrid
+
+
+def _box_meets_circle(box, center, radius):
+    left, top, right, bottom = box
+    dx = max(left - center[0], 0, center[0] - right)
+    dy = max(top - center[1], 0, center[1] - bottom)
+    return dx * dx + dy * dy <= radius * radius
+
+
+def test_query_is_a_sorted_superset():
+    rng = random.Random(2)
+    grid = SpatialHashGrid(cell_size=50)
+    boxes = []
+    for item in range(200):
+        x, y = rng.uniform(-100, 1300), rng.uniform(-100, 800)
+        box = (x, y, x + rng.uniform(0, 150), y + rng.uniform(0, 150))
+        boxes.append(box)
+        grid.insert(item, *box)
+    assert grid.count == 200
+    for _ in range(300):
+        center, radius = (rng.uniform(0, 1280), rng.uniform(0, 720)), rng.uniform(0, 400)
+        found = grid.query_circle(center, radius)
+        assert found == sorted(set(found))
+        expected = {item for item, box in enumerate(boxes) if _box_meets_circle(box, center, radius)}
+        assert expected <= set(found)
+
+
+def test_far_query_is_empty():
+    grid = SpatialHashGrid()
+    grid.insert("a", 0, 0, 10, 10)
+    assert grid.query_circle((5000, 5000), 100) == []
+    assert grid.query_circle((5, 5), 0) == ["a"]
+
+
+def test_short_paths_skip_the_grid():
+    assert PathTable([(0, 0), (100, 0), (100, 100)]).segment_grid is None
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_circle_intervals_match_a_full_scan(seed, monkeypatch):
+    rng = random.Random(seed)
+    count = GRID_MIN_SEGMENTS * 4
+    waypoints = [(40 + 1200 * i / count, 360 + 300 * math.sin(i * rng.uniform(0.05, 0.5)))
+                 for i in range(count + 1)]
+    waypoints[10] = waypoints[9] # A zero-length segment
+    gridded = PathTable(waypoints)
+    assert gridded.segment_grid is not None
+    monkeypatch.setattr(path_module, "GRID_MIN_SEGMENTS", 10 ** 9)
+    scanned = PathTable(waypoints)
+    assert scanned.segment_grid is None
+    for _ in range(200):
+        center, radius = (rng.uniform(0, 1280), rng.uniform(0, 720)), rng.uniform(0, 400)
+        assert gridded.circle_intervals(center, radius) == scanned.circle_intervals(center, radius)
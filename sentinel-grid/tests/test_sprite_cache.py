@@ -0,0 +1,57 @@
+# tests/test_sprite_cache.py
+"""ShapeSpriteCache: each shape is rasterized once, matches drawing it
+directly, and is rebuilt after a palette switch."""
+import pygame
+import pytest
+from src import config
+from src.content import load_content
+from src.sprite_cache import ShapeSpriteCache, draw_shape
+
+
+@pytest.fixture
+def palette():
+    original = config.get_palette()
+    yield
+    config.set_active_palette(original)
+
+
+@pytest.fixture
+def bullet():
+    return load_content().tower_types["gun_tower"].projectile
+
+
+def test_lookups_render_once(bullet):
+    cache = ShapeSpriteCache()
+    cache.begin_frame()
+    first, dest = cache.projectile(bullet, (100.4, 50.6))
+    second, _ = cache.projectile(bullet, (300, 300))
+    assert first is second and cache.renders == 1
+    w, h = first.get_size()
+    assert dest == (100 - w // 2, 51 - h // 2)
+
+
+def test_sprite_matches_direct_drawing(bullet):
+    cache = ShapeSpriteCache()
+    cache.begin_frame()
+    sprite, (x, y) = cache.projectile(bullet, (40, 40))
+    cached = pygame.Surface((80, 80), pygame.SRCALPHA)
+    cached.blit(sprite, (x, y))
+    direct = pygame.Surface((80, 80), pygame.SRCALPHA)
+    size = (bullet.radius * 2, bullet.radius * 2)
+    draw_shape(direct, (40, 40), "circle", size, (), config.get_color(bullet.fill_color_idx),
+               config.get_color(bullet.border_color_idx), bullet.border_width)
+    assert pygame.image.tobytes(cached, "RGBA") == pygame.image.tobytes(direct, "RGBA")
+
+
+def test_palette_switch_rebuilds(bullet, palette):
+    cache = ShapeSpriteCache()
+    cache.begin_frame()
+    old, (ax, ay) = cache.projectile(bullet, (0, 0))
+    recolored = list(config.get_palette())
+    recolored[bullet.fill_color_idx] = (1, 2, 3)
+    config.set_active_palette(recolored)
+    cache.begin_frame()
+    new, (bx, by) = cache.projectile(bullet, (0, 0))
+    assert new is not old and cache.renders == 2
+    assert new.get_at((-bx, -by))[:3] == (1, 2, 3) # The centre pixel is fill
+    assert old.get_at((-ax, -ay))[:3] != (1, 2, 3)
@@ -0,0 +1,82 @@
+# tests/test_startup.py
+"""Startup pieces: lazily created fonts shared by size, the concurrent and
+background content loads, and the --startup-profile report."""
+import json
+import os
+import shutil
+import pygame
+import pytest
+from src import content
+from src.content import ContentRegistry, load_content, load_content_async, DATA_DIR, DATA_FILES
+from src.fonts import get_font, clear_fonts, FONT_SMALL, FONT_LARGE
+from src.profiler import StartupProfile
+
+
+@pytest.fixture
+def fonts():
+    pygame.font.init()
+    clear_fonts()
+    yield
+    clear_fonts()
+
+
+def test_fonts_are_created_once_per_size(fonts):
+    assert get_font.cache_info().currsize == 0 # Nothing opened up front
+    small = get_font(FONT_SMALL)
+    assert get_font(FONT_SMALL) is small
+    assert get_font(FONT_LARGE) is not small
+    assert get_font(FONT_LARGE).get_height() > small.get_height()
+    assert get_font.cache_info().currsize == 2
+    clear_fonts()
+    assert get_font(FONT_SMALL) is not small
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """A private copy of data/ (and a fresh process-wide registry table)."""
+    monkeypatch.setattr(content, "_loaded", {})
+    copy = tmp_path / "data"
+    shutil.copytree(DATA_DIR, copy)
+    return str(copy)
+
+
+def test_concurrent_parse_matches_the_files(data_dir):
+    registry = ContentRegistry.build(data_dir)
+    tables = [registry.tower_data, registry.enemy_data, registry.wave_definitions, registry.level_data]
+    for name, table in zip(DATA_FILES, tables):
+        with open(os.path.join(data_dir, name)) as f:
+            assert table == json.load(f)
+    assert registry.level_ids == tuple(registry.level_data)
+
+
+def test_background_load_is_the_shared_registry(data_dir, tmp_path):
+    cache_path = str(tmp_path / "content.pickle")
+    futures = [load_content_async(data_dir, cache_path) for _ in range(4)]
+    direct = load_content(data_dir, cache_path)
+    assert all(future.result() is direct for future in futures) # Built once, under the lock
+    assert not direct.from_cache
+
+
+def test_background_load_reraises_data_errors(data_dir, tmp_path):
+    with open(os.path.join(data_dir, "waves.json"), 'w') as f:
+        f.write("{ not json")
+    future = load_content_async(data_dir, str(tmp_path / "content.pickle"))
+    with pytest.raises(RuntimeError, match="waves.json"):
+        future.result()
+
+
+def test_startup_profile_steps_and_budgets(capsys):
+    ms = 1_000_000
+    profile = StartupProfile(0)
+    profile.mark("imports", 300 * ms)
+    for name, at in [("window", 350), ("content", 380), ("simulation", 500), ("level", 700)]:
+        profile.mark(name, at * ms)
+    profile.mark("first_frame", 710 * ms)
+    profile.note("data: binary cache")
+    assert profile.steps_ms() == [("imports", 300.0), ("window", 50.0), ("content", 30.0),
+                                  ("simulation", 120.0), ("level", 200.0), ("first_frame", 10.0)]
+    assert profile.headline_ms() == {"imports": 300.0, "init": 400.0, "first_frame": 10.0}
+    assert profile.report() == ["init"] # 400 ms against a 300 ms budget
+    out = capsys.readouterr().out
+    assert "OVER BUDGET" in out and "data: binary cache" in out
+    assert profile.report({"imports": 400.0, "init": 500.0, "first_frame": 50.0}) == []
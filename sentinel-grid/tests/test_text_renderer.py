@@ -0,0 +1,89 @@
+# tests/test_text_renderer.py
+"""TextRenderer: strings composed from glyph atlases look like font.render,
+are cached in a bounded LRU, and are rebuilt when the palette changes."""
+import pygame
+import pytest
+from src import config
+from src.fonts import get_font, FONT_SMALL
+from src.text_renderer import TextRenderer
+
+WHITE = 1
+
+
+@pytest.fixture(autouse=True)
+def fonts():
+    pygame.font.init()
+
+
+@pytest.fixture
+def palette():
+    """Restores the palette a test switches away from."""
+    original = config.get_palette()
+    yield
+    config.set_active_palette(original)
+
+
+def _alpha(surface):
+    return [[surface.get_at((x, y)).a for x in range(surface.get_width())] for y in range(surface.get_height())]
+
+
+def test_single_glyph_matches_font_render():
+    renderer = TextRenderer()
+    font = get_font(FONT_SMALL)
+    for char in "A_g$":
+        composed = renderer.render(char, FONT_SMALL, WHITE)
+        reference = font.render(char, True, config.get_color(WHITE))
+        assert composed.get_width() == reference.get_width()
+        assert _alpha(composed)[:reference.get_height()] == _alpha(reference)
+
+
+def test_strings_are_laid_out_at_the_advances():
+    renderer = TextRenderer()
+    reference = get_font(FONT_SMALL).render("Wave 3/10", True, config.get_color(WHITE))
+    composed = renderer.render("Wave 3/10", FONT_SMALL, WHITE)
+    assert abs(composed.get_width() - reference.get_width()) <= 2 # No kerning pairs
+    assert composed.get_height() >= reference.get_height()
+    assert renderer.render("", FONT_SMALL, WHITE).get_width() == 1
+
+
+def test_characters_outside_the_atlas_render_on_demand():
+    renderer = TextRenderer()
+    atlas = renderer.atlas(FONT_SMALL, WHITE)
+    assert "é" not in atlas.glyphs
+    assert renderer.render("café", FONT_SMALL, WHITE).get_width() > renderer.render("caf", FONT_SMALL, WHITE).get_width()
+    assert atlas.glyphs["é"][1] is None # Kept as its own surface
+
+
+def test_repeated_strings_hit_the_cache():
+    renderer = TextRenderer()
+    first = renderer.render("Gold: 100", FONT_SMALL, WHITE)
+    assert renderer.render("Gold: 100", FONT_SMALL, WHITE) is first
+    assert renderer.composed == 1
+    renderer.render("Gold: 100", FONT_SMALL, WHITE + 1) # Color is part of the key
+    assert renderer.composed == 2
+
+
+def test_least_recently_used_string_is_evicted():
+    renderer = TextRenderer(cache_size=3)
+    surfaces = {text: renderer.render(text, FONT_SMALL, WHITE) for text in "abc"}
+    renderer.render("a", FONT_SMALL, WHITE) # "b" is now the oldest
+    renderer.render("d", FONT_SMALL, WHITE)
+    assert len(renderer._strings) == 3 and renderer.composed == 4
+    assert renderer.render("a", FONT_SMALL, WHITE) is surfaces["a"]
+    assert renderer.render("c", FONT_SMALL, WHITE) is surfaces["c"]
+    assert renderer.composed == 4
+    assert renderer.render("b", FONT_SMALL, WHITE) is not surfaces["b"] # Composed again
+    assert renderer.composed == 5
+
+
+def test_palette_change_rebuilds_atlases_and_strings(palette):
+    renderer = TextRenderer()
+    before = renderer.render("Core", FONT_SMALL, WHITE)
+    recolored = list(config.get_palette())
+    recolored[WHITE] = (255, 0, 0)
+    config.set_active_palette(recolored)
+    after = renderer.render("Core", FONT_SMALL, WHITE)
+    assert after is not before and renderer.composed == 2
+    opaque = [after.get_at((x, y)) for x in range(after.get_width()) for y in range(after.get_height())
+              if after.get_at((x, y)).a == 255]
+    assert opaque and all(color[:3] == (255, 0, 0) for color in opaque)
@@ -0,0 +1,82 @@
+# tests/test_tower_scheduling.py
+"""Tower targeting scheduler: the target lock, and idle towers sleeping until
+an enemy could reach their range without changing what happens in the game."""
+import contextlib
+import io
+import random
+import pygame
+import pytest
+from src.clock import FIXED_DT
+from src.config import SCREEN_SIZE
+from src.replay import state_hash
+from src.simulation import Simulation
+from src.tower_manager import TowerManager
+
+
+def _sim(level, target_lock=True):
+    with contextlib.redirect_stdout(io.StringIO()):
+        sim = Simulation(pygame.Rect((0, 0), SCREEN_SIZE), target_lock=target_lock)
+        sim.load_level(level)
+        sim.resource_manager.add_resources(10 ** 6)
+    return sim
+
+
+def test_locked_target_is_kept_until_it_dies_or_leaves():
+    sim = _sim("level1")
+    with contextlib.redirect_stdout(io.StringIO()):
+        sim.place_tower("gun_tower", 0) # (150, 280), closest-first
+    tower = sim.tower_group.sprites()[0]
+    wave_manager, index = sim.wave_manager, sim.enemy_index
+
+    def act():
+        index.refresh(wave_manager.enemy_store, wave_manager.enemy_views)
+        assert tower.act(tower.ready_time, index, sim.tower_manager.target_lock) is not None
+        return tower.target
+
+    far = wave_manager.spawn_enemy("tank", progress=30)
+    assert act() is far
+    near = wave_manager.spawn_enemy("tank", progress=150) # Closer to the tower
+    assert act() is far # Locked
+    sim.tower_manager.target_lock = False
+    assert act() is near # Re-picked for the shot
+    sim.tower_manager.target_lock = True
+    wave_manager.enemy_store.set_progress(near.slot, 500) # Out of range
+    assert act() is far
+    far.take_damage(10 ** 6)
+    assert not far.is_active
+    index.refresh(wave_manager.enemy_store, wave_manager.enemy_views)
+    assert tower.act(tower.ready_time, index) is None and tower.target is None
+
+
+def _run(level, towers, ticks, seed):
+    """Plays level with towers on its platforms and random mid-path spawns;
+    returns the final state hash and the towers run per step."""
+    sim = _sim(level)
+    rng = random.Random(seed)
+    total = sim.wave_manager.path_table.total_length
+    acted = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for platform, tower in enumerate(towers):
+            sim.place_tower(tower, platform)
+        for _ in range(ticks):
+            if sim.is_finished():
+                break
+            if rng.random() < 0.02:
+                sim.wave_manager.spawn_enemy(rng.choice(["grunt", "runner", "tank"]),
+                                             progress=rng.uniform(0, total * 0.9))
+            sim.update(FIXED_DT)
+            acted.append(sim.tower_manager.towers_acted)
+    return state_hash(sim), acted
+
+
+@pytest.mark.parametrize("level, towers", [
+    ("level1", ["gun_tower", "slow_tower", "cannon_tower", "gun_tower", "slow_tower"]),
+    ("level2", ["slow_tower", "gun_tower", "slow_tower", "cannon_tower"]),
+])
+def test_sleeping_towers_match_always_awake_towers(level, towers, monkeypatch):
+    asleep_hash, asleep_acted = _run(level, towers, 1800, seed=5)
+    # Reference: a tower that found nothing checks again every step (once ready)
+    monkeypatch.setattr(TowerManager, "_approach_time", lambda self, tower, enemy_index, now: now)
+    awake_hash, awake_acted = _run(level, towers, 1800, seed=5)
+    assert asleep_hash == awake_hash
+    assert sum(asleep_acted) < sum(awake_acted)